@@ -0,0 +1,139 @@
+"""add_post_search_index
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import html
+import json
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, Sequence[str], None] = 'f6a7b8c9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+# The index schema and the body text extraction are copied from
+# app.services.search and app.services.editorjs as of this revision, so
+# later changes to the app never alter what this migration creates.
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS post_search USING fts5("
+    "post_id UNINDEXED, title, body, author, tokenize='porter unicode61')",
+)
+
+POSTGRES_DDL = (
+    "CREATE TABLE IF NOT EXISTS post_search ("
+    " post_id uuid PRIMARY KEY REFERENCES posts(id) ON DELETE CASCADE,"
+    " title text NOT NULL DEFAULT '',"
+    " body text NOT NULL DEFAULT '',"
+    " author text NOT NULL DEFAULT '',"
+    " document tsvector GENERATED ALWAYS AS ("
+    "  setweight(to_tsvector('english', title), 'A') ||"
+    "  setweight(to_tsvector('english', author), 'B') ||"
+    "  setweight(to_tsvector('english', body), 'C')"
+    " ) STORED)",
+    "CREATE INDEX IF NOT EXISTS ix_post_search_document ON post_search USING GIN (document)",
+)
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _parse_blocks(content):
+    try:
+        doc = json.loads(content or '')
+    except ValueError:
+        return []
+    blocks = doc.get('blocks') if isinstance(doc, dict) else None
+    return [b for b in blocks or [] if isinstance(b, dict)]
+
+
+def _strip_tags(text):
+    return html.unescape(_TAG_RE.sub('', text or ''))
+
+
+def _list_item_texts(items):
+    out = []
+    for item in items or []:
+        if isinstance(item, str):
+            out.append(item)
+        elif isinstance(item, dict):
+            out.append(item.get('content') or '')
+            out.extend(_list_item_texts(item.get('items')))
+    return out
+
+
+def _block_text(block):
+    data = block.get('data') or {}
+    kind = block.get('type')
+    if kind in ('paragraph', 'header'):
+        parts = [data.get('text')]
+    elif kind == 'list':
+        parts = _list_item_texts(data.get('items'))
+    elif kind == 'checklist':
+        parts = [i.get('text') for i in data.get('items') or [] if isinstance(i, dict)]
+    elif kind == 'quote':
+        parts = [data.get('text'), data.get('caption')]
+    elif kind == 'warning':
+        parts = [data.get('title'), data.get('message')]
+    elif kind == 'alert':
+        parts = [data.get('message')]
+    elif kind == 'table':
+        parts = [cell for row in data.get('content') or [] for cell in row or []]
+    else:
+        return ''
+    return ' '.join(_strip_tags(p).strip() for p in parts if p)
+
+
+def _plain_text(content):
+    return '\n'.join(t for t in (_block_text(b) for b in _parse_blocks(content)) if t)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    ddl = POSTGRES_DDL if bind.dialect.name == 'postgresql' else SQLITE_DDL
+    for stmt in ddl:
+        op.execute(stmt)
+
+    # Populate from existing posts; `python -m app.cli reindex-search` does the
+    # same against a live database.
+    posts = sa.table('posts', sa.column('id'), sa.column('owner_id'), sa.column('title'), sa.column('content'))
+    users = sa.table('users', sa.column('id'), sa.column('email'), sa.column('first_name'), sa.column('last_name'))
+    post_search = sa.table('post_search', sa.column('post_id'), sa.column('title'), sa.column('body'), sa.column('author'))
+    last_id = None
+    while True:
+        q = (
+            sa.select(posts.c.id, posts.c.title, posts.c.content, users.c.email, users.c.first_name, users.c.last_name)
+            .select_from(posts.outerjoin(users, posts.c.owner_id == users.c.id))
+            .order_by(posts.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            q = q.where(posts.c.id > last_id)
+        rows = bind.execute(q).all()
+        if not rows:
+            break
+        bind.execute(
+            post_search.insert(),
+            [
+                {
+                    'post_id': row_id,
+                    'title': title or '',
+                    'body': _plain_text(content),
+                    'author': ' '.join(p for p in (first, last) if p) or email or '',
+                }
+                for row_id, title, content, email, first, last in rows
+            ],
+        )
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.execute('DROP TABLE IF EXISTS post_search')
@@ -0,0 +1,43 @@
+"""add_hot_path_indexes
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b8c9d0e1f2a3'
+down_revision: Union[str, Sequence[str], None] = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_posts_published_created_date', 'posts', ['published', 'created_date', 'id']),
+    ('ix_posts_owner_id_created_date', 'posts', ['owner_id', 'created_date', 'id']),
+    ('ix_posts_created_date', 'posts', ['created_date', 'id']),
+    ('ix_comments_post_id_created_at', 'comments', ['post_id', 'created_at', 'id']),
+    ('ix_comments_author_id', 'comments', ['author_id']),
+    ('ix_likes_user_id', 'likes', ['user_id']),
+    ('ix_experiences_user_id', 'experiences', ['user_id']),
+    ('ix_qualifications_user_id', 'qualifications', ['user_id']),
+    ('ix_school_education_user_id', 'school_education', ['user_id']),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so on
+    # Postgres the builds happen in autocommit mode without locking writes.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,66 @@
+"""published_boolean
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c9d0e1f2a3b4'
+down_revision: Union[str, Sequence[str], None] = 'b8c9d0e1f2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    op.drop_index('ix_posts_published_created_date', table_name='posts', if_exists=True)
+
+    # Anything that wasn't exactly "true" was never shown in the public feed.
+    if is_postgres:
+        op.execute("UPDATE posts SET published = 'false' WHERE published IS DISTINCT FROM 'true'")
+    else:
+        # SQLite's batch copy would CAST 'true' to 0; store 1/0 before the type change.
+        op.execute("UPDATE posts SET published = CASE WHEN published = 'true' THEN 1 ELSE 0 END")
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.alter_column(
+            'published',
+            existing_type=sa.String(),
+            type_=sa.Boolean(),
+            nullable=False,
+            server_default=sa.true(),
+            postgresql_using="published = 'true'",
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_posts_published_feed',
+            'posts',
+            [sa.text('created_date DESC'), sa.text('id DESC')],
+            if_not_exists=True,
+            postgresql_where=sa.text('published'),
+            sqlite_where=sa.text('published = 1'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_published_feed', table_name='posts', if_exists=True)
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.alter_column(
+            'published',
+            existing_type=sa.Boolean(),
+            type_=sa.String(),
+            nullable=True,
+            server_default=None,
+            postgresql_using="CASE WHEN published THEN 'true' ELSE 'false' END",
+        )
+    if not is_postgres:
+        op.execute("UPDATE posts SET published = CASE WHEN published = 1 THEN 'true' ELSE 'false' END")
+    op.create_index('ix_posts_published_created_date', 'posts', ['published', 'created_date', 'id'])
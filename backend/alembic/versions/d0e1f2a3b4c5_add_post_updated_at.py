@@ -0,0 +1,50 @@
+"""add_post_updated_at
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd0e1f2a3b4c5'
+down_revision: Union[str, Sequence[str], None] = 'c9d0e1f2a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Existing posts were last written when they were created.
+    op.execute("UPDATE posts SET updated_at = coalesce(created_date, CURRENT_TIMESTAMP)")
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.alter_column(
+            'updated_at',
+            existing_type=sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        )
+
+    # Covers the conditional-GET check (see ix_posts_version in db.py). Built
+    # concurrently on Postgres so posts stay writable during the build.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_posts_version',
+            'posts',
+            ['id', 'updated_at', 'like_count', 'comment_count'],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_posts_version', table_name='posts', if_exists=True, postgresql_concurrently=True)
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,60 @@
+"""add_post_changes_feed
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from fastapi_users_db_sqlalchemy.generics import GUID
+
+
+revision: str = 'e1f2a3b4c5d6'
+down_revision: Union[str, Sequence[str], None] = 'd0e1f2a3b4c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Insertion time was never recorded; the publish date is the best guess.
+    op.execute("UPDATE posts SET created_at = coalesce(created_date, updated_at)")
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.alter_column(
+            'created_at',
+            existing_type=sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        )
+
+    # Built concurrently on Postgres so posts stay writable during the build.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_posts_updated_at',
+            'posts',
+            ['updated_at', 'id'],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+    op.create_table(
+        'post_tombstones',
+        sa.Column('post_id', GUID(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('post_id'),
+    )
+    op.create_index('ix_post_tombstones_deleted_at', 'post_tombstones', ['deleted_at', 'post_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_tombstones_deleted_at', table_name='post_tombstones')
+    op.drop_table('post_tombstones')
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_posts_updated_at', table_name='posts', if_exists=True, postgresql_concurrently=True)
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('created_at')
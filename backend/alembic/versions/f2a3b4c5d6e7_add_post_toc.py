@@ -0,0 +1,127 @@
+"""add_post_toc
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import html
+import json
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f2a3b4c5d6e7'
+down_revision: Union[str, Sequence[str], None] = 'e1f2a3b4c5d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+# Frozen copy of editorjs.table_of_contents() as of this revision, so
+# replaying the migration backfills the same outline whatever the app code
+# does later.
+_TAG_RE = re.compile(r'<[^>]+>')
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+
+def _parse_blocks(content):
+    try:
+        doc = json.loads(content or '')
+    except ValueError:
+        return []
+    blocks = doc.get('blocks') if isinstance(doc, dict) else None
+    return [b for b in blocks or [] if isinstance(b, dict)]
+
+
+def _strip_tags(text):
+    return html.unescape(_TAG_RE.sub('', text or ''))
+
+
+def _list_item_texts(items):
+    out = []
+    for item in items or []:
+        if isinstance(item, str):
+            out.append(item)
+        elif isinstance(item, dict):
+            out.append(item.get('content') or '')
+            out.extend(_list_item_texts(item.get('items')))
+    return out
+
+
+def _block_text(block):
+    data = block.get('data') or {}
+    kind = block.get('type')
+    if kind in ('paragraph', 'header'):
+        parts = [data.get('text')]
+    elif kind == 'list':
+        parts = _list_item_texts(data.get('items'))
+    elif kind == 'checklist':
+        parts = [i.get('text') for i in data.get('items') or [] if isinstance(i, dict)]
+    elif kind == 'quote':
+        parts = [data.get('text'), data.get('caption')]
+    elif kind == 'warning':
+        parts = [data.get('title'), data.get('message')]
+    elif kind == 'alert':
+        parts = [data.get('message')]
+    elif kind == 'table':
+        parts = [cell for row in data.get('content') or [] for cell in row or []]
+    else:
+        return ''
+    return ' '.join(_strip_tags(p).strip() for p in parts if p)
+
+
+def _heading_id(text, index):
+    slug = _SLUG_RE.sub('-', _TAG_RE.sub('', text or '').lower()).strip('-')
+    return f'h-{slug}-{index}'
+
+
+def _table_of_contents(content):
+    return [
+        {
+            'level': (b.get('data') or {}).get('level'),
+            'text': _block_text(b).strip(),
+            'id': _heading_id((b.get('data') or {}).get('text'), i),
+        }
+        for i, b in enumerate(_parse_blocks(content))
+        if b.get('type') == 'header'
+    ]
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('toc', sa.JSON(), nullable=False, server_default='[]'))
+
+    # Backfill in id-ordered batches so large tables never load every body at once.
+    bind = op.get_bind()
+    posts = sa.table(
+        'posts',
+        sa.column('id'),
+        sa.column('content', sa.String()),
+        sa.column('toc', sa.JSON()),
+    )
+    last_id = None
+    while True:
+        q = sa.select(posts.c.id, posts.c.content).order_by(posts.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            q = q.where(posts.c.id > last_id)
+        rows = bind.execute(q).all()
+        if not rows:
+            break
+        # One executemany per batch; posts without headers keep the '[]' default.
+        updates = [
+            {'post_id': row_id, 'toc': toc}
+            for row_id, content in rows
+            if (toc := _table_of_contents(content))
+        ]
+        if updates:
+            bind.execute(posts.update().where(posts.c.id == sa.bindparam('post_id')), updates)
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('toc')
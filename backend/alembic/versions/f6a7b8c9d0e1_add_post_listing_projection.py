@@ -0,0 +1,137 @@
+"""add_post_listing_projection
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import html
+import json
+import math
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, Sequence[str], None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+# Frozen copy of editorjs.summarize() as of this revision, so replaying the
+# migration backfills the same values whatever the app code does later.
+EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _parse_blocks(content):
+    try:
+        doc = json.loads(content or '')
+    except ValueError:
+        return []
+    blocks = doc.get('blocks') if isinstance(doc, dict) else None
+    return [b for b in blocks or [] if isinstance(b, dict)]
+
+
+def _strip_tags(text):
+    return html.unescape(_TAG_RE.sub('', text or ''))
+
+
+def _list_item_texts(items):
+    out = []
+    for item in items or []:
+        if isinstance(item, str):
+            out.append(item)
+        elif isinstance(item, dict):
+            out.append(item.get('content') or '')
+            out.extend(_list_item_texts(item.get('items')))
+    return out
+
+
+def _block_text(block):
+    data = block.get('data') or {}
+    kind = block.get('type')
+    if kind in ('paragraph', 'header'):
+        parts = [data.get('text')]
+    elif kind == 'list':
+        parts = _list_item_texts(data.get('items'))
+    elif kind == 'checklist':
+        parts = [i.get('text') for i in data.get('items') or [] if isinstance(i, dict)]
+    elif kind == 'quote':
+        parts = [data.get('text'), data.get('caption')]
+    elif kind == 'warning':
+        parts = [data.get('title'), data.get('message')]
+    elif kind == 'alert':
+        parts = [data.get('message')]
+    elif kind == 'table':
+        parts = [cell for row in data.get('content') or [] for cell in row or []]
+    else:
+        return ''
+    return ' '.join(_strip_tags(p).strip() for p in parts if p)
+
+
+def _summarize(content):
+    blocks = _parse_blocks(content)
+    first_para = next((b for b in blocks if b.get('type') == 'paragraph'), None)
+    excerpt = _block_text(first_para).strip() if first_para else ''
+    if len(excerpt) > EXCERPT_LENGTH:
+        excerpt = excerpt[:EXCERPT_LENGTH].rsplit(' ', 1)[0] + '…'
+    cover = next((b for b in blocks if b.get('type') == 'simpleImage'), None)
+    word_count = sum(
+        len(_block_text(b).split())
+        for b in blocks
+        if b.get('type') in ('paragraph', 'header', 'list')
+    )
+    return {
+        'excerpt': excerpt,
+        'cover_image': (cover.get('data') or {}).get('url') if cover else None,
+        'word_count': word_count,
+        'reading_time': max(1, math.ceil(word_count / WORDS_PER_MINUTE)),
+    }
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('excerpt', sa.String(), nullable=False, server_default=''))
+        batch_op.add_column(sa.Column('cover_image', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('word_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('reading_time', sa.Integer(), nullable=False, server_default='1'))
+
+    # Backfill in id-ordered batches so large tables never load every body at once.
+    bind = op.get_bind()
+    posts = sa.table(
+        'posts',
+        sa.column('id'),
+        sa.column('content', sa.String()),
+        sa.column('excerpt', sa.String()),
+        sa.column('cover_image', sa.String()),
+        sa.column('word_count', sa.Integer()),
+        sa.column('reading_time', sa.Integer()),
+    )
+    last_id = None
+    while True:
+        q = sa.select(posts.c.id, posts.c.content).order_by(posts.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            q = q.where(posts.c.id > last_id)
+        rows = bind.execute(q).all()
+        if not rows:
+            break
+        # One executemany per batch rather than a round trip per post.
+        bind.execute(
+            posts.update().where(posts.c.id == sa.bindparam('post_id')),
+            [{'post_id': row_id, **_summarize(content)} for row_id, content in rows],
+        )
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('reading_time')
+        batch_op.drop_column('word_count')
+        batch_op.drop_column('cover_image')
+        batch_op.drop_column('excerpt')
@@ -8,11 +8,21 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.db import get_async_session, Post, User
 from app.core.users import fastapi_users
+from app.core.query_budget import query_budget
 from app.models.theme import ThemeBase, ThemeRead
 from app.models.users import UserRoleUpdate
-from app.services.admin import list_users, set_user_active, set_user_role, list_all_comments
-from app.services.articles import list_all_articles
-from app.services.site_settings import get_site_config, update_site_config
+from app.services.admin import (
+    delete_user_and_content,
+    list_all_comments,
+    list_users,
+    set_user_active,
+    set_user_role,
+)
+from app.services import rendered
+from app.services.articles import article_reads, list_all_articles
+from app.services.counting import total_fields
+from app.services.response_cache import response_cache
+from app.services.site_settings import get_site_config, public_settings_dict, update_site_config
 from app.services.theme import (
     list_themes,
     create_theme,
@@ -32,10 +42,15 @@ async def get_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     q: str = Query(""),
+    include_total: bool = Query(True),
+    estimate_total: bool = Query(False),
     session: AsyncSession = Depends(get_async_session),
     _=Depends(current_superuser),
 ):
-    users, total = await list_users(session, skip=skip, limit=limit, search=q)
+    users, total = await list_users(
+        session, skip=skip, limit=limit, search=q,
+        include_total=include_total, estimate_total=estimate_total,
+    )
     return {
         "users": [
             {
@@ -47,11 +62,11 @@ async def get_users(
             }
             for u in users
         ],
-        "total": total,
+        **total_fields(total),
     }
 
 
-@router.patch("/users/{user_id}/activate")
+@router.patch("/users/{user_id}/activate", dependencies=[query_budget(2)])
 async def activate_user(
     user_id: str,
     session: AsyncSession = Depends(get_async_session),
@@ -61,7 +76,7 @@ async def activate_user(
     return {"id": str(user.id), "email": user.email, "is_active": user.is_active}
 
 
-@router.patch("/users/{user_id}/deactivate")
+@router.patch("/users/{user_id}/deactivate", dependencies=[query_budget(2)])
 async def deactivate_user(
     user_id: str,
     session: AsyncSession = Depends(get_async_session),
@@ -71,7 +86,7 @@ async def deactivate_user(
     return {"id": str(user.id), "email": user.email, "is_active": user.is_active}
 
 
-@router.patch("/users/{user_id}/role")
+@router.patch("/users/{user_id}/role", dependencies=[query_budget(2)])
 async def change_user_role(
     user_id: str,
     body: UserRoleUpdate,
@@ -91,6 +106,16 @@ async def change_user_role(
     }
 
 
+@router.delete("/users/{user_id}", dependencies=[query_budget(16)])
+async def remove_user(
+    user_id: str,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(current_superuser),
+):
+    deleted = await delete_user_and_content(session, user_id, acting_user=current_user)
+    return {"success": True, "deleted": deleted}
+
+
 # ── Theme management ───────────────────────────────────────────────────────────
 
 @router.get("/themes")
@@ -102,7 +127,7 @@ async def get_themes(
     return {"themes": [ThemeRead.model_validate(t) for t in themes]}
 
 
-@router.post("/themes", status_code=201)
+@router.post("/themes", status_code=201, dependencies=[query_budget(2)])
 async def add_theme(
     data: ThemeBase,
     session: AsyncSession = Depends(get_async_session),
@@ -112,7 +137,7 @@ async def add_theme(
     return ThemeRead.model_validate(theme)
 
 
-@router.put("/themes/{theme_id}/activate")
+@router.put("/themes/{theme_id}/activate", dependencies=[query_budget(2)])
 async def activate_theme(
     theme_id: int,
     session: AsyncSession = Depends(get_async_session),
@@ -140,7 +165,7 @@ async def get_stats(
 ):
     total_articles = (await session.execute(select(func.count(Post.id)))).scalar() or 0
     published_articles = (
-        await session.execute(select(func.count(Post.id)).where(Post.published == "true"))
+        await session.execute(select(func.count(Post.id)).where(Post.published == True))
     ).scalar() or 0
     total_users = (await session.execute(select(func.count(User.id)))).scalar() or 0
     active_users = (
@@ -160,6 +185,16 @@ async def get_stats(
     }
 
 
+@router.get("/cache")
+async def get_cache_stats(_=Depends(current_superuser)):
+    """This worker's read caches: anonymous responses, shared article reads, rendered HTML."""
+    return {
+        "responses": response_cache.stats(),
+        "article_reads": article_reads.stats(),
+        "rendered": rendered.stats,
+    }
+
+
 # ── Site settings ──────────────────────────────────────────────────────────────
 
 class SiteConfigUpdate(BaseModel):
@@ -174,16 +209,7 @@ class SiteConfigUpdate(BaseModel):
 
 
 def _config_response(config):
-    return {
-        "site_name": config.site_name,
-        "site_description": config.site_description,
-        "site_url": config.site_url,
-        "logo_url": config.logo_url,
-        "allow_registration": config.allow_registration,
-        "og_title": config.og_title,
-        "og_description": config.og_description,
-        "og_image_url": config.og_image_url,
-    }
+    return public_settings_dict(config)
 
 
 @router.get("/settings")
@@ -195,7 +221,7 @@ async def get_settings(
     return _config_response(config)
 
 
-@router.put("/settings")
+@router.put("/settings", dependencies=[query_budget(2)])
 async def put_settings(
     data: SiteConfigUpdate,
     session: AsyncSession = Depends(get_async_session),
@@ -220,11 +246,16 @@ async def admin_all_articles(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     q: str = Query(""),
+    cursor: str | None = Query(None),
+    include_total: bool = Query(True),
+    estimate_total: bool = Query(False),
     _=Depends(current_superuser),
     session: AsyncSession = Depends(get_async_session),
 ):
-    articles, total = await list_all_articles(session, skip, limit, q)
-    return {"articles": articles, "total": total}
+    articles, total, next_cursor = await list_all_articles(
+        session, skip, limit, q, cursor, include_total, estimate_total
+    )
+    return {"articles": articles, **total_fields(total), "next_cursor": next_cursor}
 
 
 @router.get("/comments")
@@ -232,11 +263,13 @@ async def admin_all_comments(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
     q: str = Query(""),
+    include_total: bool = Query(True),
+    estimate_total: bool = Query(False),
     _=Depends(current_superuser),
     session: AsyncSession = Depends(get_async_session),
 ):
-    comments, total = await list_all_comments(session, skip, limit, q)
-    return {"comments": comments, "total": total}
+    comments, total = await list_all_comments(session, skip, limit, q, include_total, estimate_total)
+    return {"comments": comments, **total_fields(total)}
 
 
 @router.post("/upload-logo")
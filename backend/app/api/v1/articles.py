@@ -1,23 +1,39 @@
-from typing import Optional
+import uuid
+from typing import Literal, Optional
 
-from fastapi import APIRouter, Depends, Query, Response
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.articles import ArticleBase, CommentCreate
+from app.database.compressed import decompress, is_gzip
 from app.database.db import get_async_session, User
 from app.core.users import current_active_user, current_author_or_admin, current_optional_user
+from app.core.http_cache import REVALIDATE, accepts_gzip, etag_matches, weak_etag
+from app.core.query_budget import query_budget
+from app.services.counting import total_fields
+from app.services.response_cache import FEED, article_tags, comments_tag, post_tag, response_cache
 from app.services.articles import (
     create_article as svc_create_article,
     list_articles as svc_list_articles,
     search_articles as svc_search_articles,
     get_article_by_id as svc_get_article_by_id,
+    get_article_html as svc_get_article_html,
+    get_article_etag as svc_get_article_etag,
+    get_article_toc as svc_get_article_toc,
+    get_article_content as svc_get_article_content,
+    article_etag as svc_article_etag,
+    listing_etag as svc_listing_etag,
     delete_article as svc_delete_article,
     update_article as svc_update_article,
     toggle_like as svc_toggle_like,
     get_like_status as svc_get_like_status,
+    get_like_statuses as svc_get_like_statuses,
     list_comments as svc_list_comments,
+    open_article_stream as svc_open_article_stream,
     add_comment as svc_add_comment,
     delete_comment as svc_delete_comment,
+    list_changes as svc_list_changes,
     list_sitemap_entries as svc_list_sitemap_entries,
     get_sitemap_meta as svc_get_sitemap_meta,
 )
@@ -25,7 +41,15 @@ from app.services.articles import (
 router = APIRouter()
 
 
-@router.post("/create-article")
+def _canonical_id(id: str) -> str:
+    """Cache-key form of a post id; invalid ids are left for the service to reject."""
+    try:
+        return str(uuid.UUID(id))
+    except ValueError:
+        return id
+
+
+@router.post("/create-article", dependencies=[query_budget(3)])
 async def create_article(
     post: ArticleBase,
     user: User = Depends(current_author_or_admin),
@@ -35,33 +59,101 @@ async def create_article(
     return {"blog": new_post}
 
 
-@router.get("/get-articles")
+# A feed page is count + page + authors; with `q` it goes through full-text
+# search instead (count, ranked ids, posts, authors, and on Postgres a guard
+# for queries left with no lexemes).
+@router.get("/get-articles", dependencies=[query_budget(5)])
 async def get_articles(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     q: str = Query(""),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(True),
+    estimate_total: bool = Query(False),
     session: AsyncSession = Depends(get_async_session),
 ):
-    articles, total = await svc_list_articles(session, skip, limit, q)
-    return {"articles": articles, "total": total}
+    async def load():
+        articles, total, next_cursor = await svc_list_articles(
+            session, skip, limit, q, cursor, include_total, estimate_total
+        )
+        payload = {"articles": articles, **total_fields(total), "next_cursor": next_cursor}
+        return payload, {FEED, *article_tags(articles)}
+
+    key = ("get-articles", skip, limit, q, cursor, include_total, estimate_total)
+    return await response_cache.serve(request, key, load, etag=svc_listing_etag)
 
 
 @router.get("/search-articles")
 async def search_articles(
     title: str = Query(..., min_length=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(True),
     session: AsyncSession = Depends(get_async_session),
 ):
-    articles = await svc_search_articles(session, title)
-    return {"articles": articles}
-
-
-@router.get("/get-article/{id}")
-async def get_article(id: str, session: AsyncSession = Depends(get_async_session)):
-    article = await svc_get_article_by_id(session, id)
-    return {"article": article}
+    articles, total, next_cursor = await svc_search_articles(
+        session, title, skip, limit, cursor, include_total
+    )
+    return {"articles": articles, **total_fields(total), "next_cursor": next_cursor}
 
 
-@router.put("/update-article/{id}")
+@router.get("/get-article/{id}", dependencies=[query_budget(3)])
+async def get_article(
+    id: str,
+    request: Request,
+    format: Literal["json", "html"] = Query("json", description="html: body pre-rendered as `html`"),
+    session: AsyncSession = Depends(get_async_session),
+):
+    # Revalidation is answered from the version index without loading the post.
+    if request.headers.get("if-none-match"):
+        etag = await svc_get_article_etag(session, id, format)
+        if etag and etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": REVALIDATE})
+
+    async def load():
+        if format == "html":
+            article = await svc_get_article_html(id)
+        else:
+            article = await svc_get_article_by_id(id)
+        return {"article": article}, article_tags(article)
+
+    def etag(payload: dict) -> str:
+        return svc_article_etag(payload["article"][0], format)
+
+    key = ("get-article", _canonical_id(id), format)
+    return await response_cache.serve(request, key, load, etag=etag)
+
+
+@router.get("/articles/{id}/toc", dependencies=[query_budget(1)])
+async def article_toc(id: str, request: Request, session: AsyncSession = Depends(get_async_session)):
+    """Heading outline of an article (level, text, anchor id), without its content."""
+    async def load():
+        toc = await svc_get_article_toc(session, id)
+        return toc, {post_tag(toc["id"])}
+
+    def etag(payload: dict) -> str:
+        return weak_etag(payload["id"], payload["updated_at"], "toc")
+
+    return await response_cache.serve(request, ("toc", _canonical_id(id)), load, etag=etag)
+
+
+@router.get("/articles/{id}/content", dependencies=[query_budget(1)])
+async def article_content(id: str, request: Request, session: AsyncSession = Depends(get_async_session)):
+    """The Editor.js document alone. Gzip clients get the stored bytes as-is."""
+    row = await svc_get_article_content(session, id)
+    etag = weak_etag(row["id"], row["updated_at"], "content")
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE, "Vary": "Accept-Encoding"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    stored = row["stored"]
+    if is_gzip(stored) and accepts_gzip(request):
+        return Response(stored, media_type="application/json", headers={**headers, "Content-Encoding": "gzip"})
+    return Response(decompress(stored), media_type="application/json", headers=headers)
+
+
+@router.put("/update-article/{id}", dependencies=[query_budget(3)])
 async def update_article(
     id: str,
     post: ArticleBase,
@@ -72,7 +164,7 @@ async def update_article(
     return {"article": updated_post}
 
 
-@router.delete("/delete-article/{id}")
+@router.delete("/delete-article/{id}", dependencies=[query_budget(7)])
 async def delete_article(
     id: str,
     user: User = Depends(current_active_user),
@@ -82,9 +174,19 @@ async def delete_article(
     return result
 
 
+@router.get("/articles/changes", dependencies=[query_budget(2)])
+async def article_changes(
+    since: Optional[str] = Query(None, description="Sync token from the previous call; omit to start"),
+    limit: int = Query(500, ge=1, le=1000),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """Ids of public articles created, updated or removed since `since`, plus the next token."""
+    return await svc_list_changes(session, since, limit)
+
+
 # ── Likes ──────────────────────────────────────────────────────────────────────
 
-@router.post("/articles/{id}/like")
+@router.post("/articles/{id}/like", dependencies=[query_budget(4)])
 async def like_article(
     id: str,
     user: User = Depends(current_active_user),
@@ -93,7 +195,17 @@ async def like_article(
     return await svc_toggle_like(session, id, user.id)
 
 
-@router.get("/articles/{id}/likes")
+@router.get("/articles/likes", dependencies=[query_budget(3)])
+async def article_likes_batch(
+    ids: list[uuid.UUID] = Query(..., description="Article ids, e.g. ?ids=a&ids=b"),
+    session: AsyncSession = Depends(get_async_session),
+    user: Optional[User] = Depends(current_optional_user),
+):
+    user_id = getattr(user, "id", None)
+    return {"likes": await svc_get_like_statuses(session, ids, user_id)}
+
+
+@router.get("/articles/{id}/likes", dependencies=[query_budget(3)])
 async def article_likes(
     id: str,
     session: AsyncSession = Depends(get_async_session),
@@ -103,27 +215,50 @@ async def article_likes(
     return await svc_get_like_status(session, id, user_id)
 
 
+# ── Live updates ───────────────────────────────────────────────────────────────
+
+@router.get("/articles/{id}/events")
+async def article_events(id: str):
+    """Server-Sent Events: like/comment counts and comment changes for one article."""
+    stream = await svc_open_article_stream(id)
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        # X-Accel-Buffering: stop nginx from buffering the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ── Comments ───────────────────────────────────────────────────────────────────
 
-@router.get("/articles/{id}/comments")
+@router.get("/articles/{id}/comments", dependencies=[query_budget(2)])
 async def article_comments(
     id: str,
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None),
+    before: str | None = Query(None),
     session: AsyncSession = Depends(get_async_session),
 ):
-    return await svc_list_comments(session, id)
+    async def load():
+        page = await svc_list_comments(session, id, limit, cursor, before)
+        return page, {comments_tag(post_id)}
+
+    post_id = _canonical_id(id)
+    return await response_cache.serve(request, ("comments", post_id, limit, cursor, before), load)
 
 
-@router.post("/articles/{id}/comments", status_code=201)
+@router.post("/articles/{id}/comments", status_code=201, dependencies=[query_budget(3)])
 async def post_comment(
     id: str,
     data: CommentCreate,
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_async_session),
 ):
-    return await svc_add_comment(session, id, user.id, data.body)
+    return await svc_add_comment(session, id, user, data.body)
 
 
-@router.delete("/articles/{id}/comments/{comment_id}")
+@router.delete("/articles/{id}/comments/{comment_id}", dependencies=[query_budget(4)])
 async def remove_comment(
     id: str,
     comment_id: str,
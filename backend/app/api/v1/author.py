@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.users import current_author_or_admin
 from app.database.db import User, Post, get_async_session
 from app.services.articles import list_author_articles, list_comments_for_author
+from app.services.counting import total_fields
 
 router = APIRouter(prefix="/author")
 
@@ -18,7 +19,7 @@ async def author_stats(
         select(func.count()).select_from(Post).where(Post.owner_id == user.id)
     )).scalar() or 0
     published = (await session.execute(
-        select(func.count()).select_from(Post).where(Post.owner_id == user.id, Post.published == "true")
+        select(func.count()).select_from(Post).where(Post.owner_id == user.id, Post.published == True)
     )).scalar() or 0
     return {"total": total, "published": published, "draft": total - published}
 
@@ -28,19 +29,28 @@ async def author_articles(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     q: str = Query(""),
+    cursor: str | None = Query(None),
+    include_total: bool = Query(True),
+    estimate_total: bool = Query(False),
     user: User = Depends(current_author_or_admin),
     session: AsyncSession = Depends(get_async_session),
 ):
-    articles, total = await list_author_articles(session, user.id, skip, limit, q)
-    return {"articles": articles, "total": total}
+    articles, total, next_cursor = await list_author_articles(
+        session, user.id, skip, limit, q, cursor, include_total, estimate_total
+    )
+    return {"articles": articles, **total_fields(total), "next_cursor": next_cursor}
 
 
 @router.get("/comments")
 async def author_comments(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    include_total: bool = Query(True),
+    estimate_total: bool = Query(False),
     user: User = Depends(current_author_or_admin),
     session: AsyncSession = Depends(get_async_session),
 ):
-    comments, total = await list_comments_for_author(session, user.id, skip, limit)
-    return {"comments": comments, "total": total}
+    comments, total = await list_comments_for_author(
+        session, user.id, skip, limit, include_total, estimate_total
+    )
+    return {"comments": comments, **total_fields(total)}
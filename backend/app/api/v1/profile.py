@@ -5,6 +5,7 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.users import current_active_user
+from app.core.query_budget import query_budget
 from app.database.db import User, get_async_session
 from app.services.profile import (
     get_full_profile,
@@ -66,17 +67,17 @@ async def get_my_profile(
     return await get_full_profile(session, user)
 
 
-@router.put("/profile/me")
+@router.put("/profile/me", dependencies=[query_budget(9)])
 async def update_my_profile(
     data: BasicInfoUpdate,
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_async_session),
 ):
-    await update_basic_info(session, user, data.model_dump(exclude_none=False))
-    return await get_full_profile(session, user)
+    profile = await update_basic_info(session, user, data.model_dump(exclude_none=False))
+    return await get_full_profile(session, user, profile)
 
 
-@router.post("/profile/experience")
+@router.post("/profile/experience", dependencies=[query_budget(2)])
 async def create_experience(
     data: ExperienceCreate,
     user: User = Depends(current_active_user),
@@ -87,7 +88,7 @@ async def create_experience(
             "years": exp.years, "months": exp.months}
 
 
-@router.put("/profile/experience/{exp_id}")
+@router.put("/profile/experience/{exp_id}", dependencies=[query_budget(2)])
 async def edit_experience(
     exp_id: int,
     data: ExperienceCreate,
@@ -111,7 +112,7 @@ async def remove_experience(
     return {"detail": "deleted"}
 
 
-@router.post("/profile/qualification")
+@router.post("/profile/qualification", dependencies=[query_budget(2)])
 async def create_qualification(
     data: QualificationCreate,
     user: User = Depends(current_active_user),
@@ -122,7 +123,7 @@ async def create_qualification(
             "field_of_study": qual.field_of_study, "year": qual.year}
 
 
-@router.put("/profile/qualification/{qual_id}")
+@router.put("/profile/qualification/{qual_id}", dependencies=[query_budget(2)])
 async def edit_qualification(
     qual_id: int,
     data: QualificationCreate,
@@ -146,7 +147,7 @@ async def remove_qualification(
     return {"detail": "deleted"}
 
 
-@router.post("/profile/school")
+@router.post("/profile/school", dependencies=[query_budget(3)])
 async def create_or_update_school(
     data: SchoolCreate,
     user: User = Depends(current_active_user),
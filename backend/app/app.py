@@ -1,11 +1,11 @@
+import asyncio
 import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy import update
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.users import UserRead, UserUpdate
 from app.models.theme import ThemeActiveResponse
@@ -15,10 +15,14 @@ from app.api.v1.profile import router as profile_router
 from app.api.v1.author import router as author_router
 from app.api.v1.register import router as register_router
 from app.api.v1.login import router as login_router
-from app.database.db import create_db_and_tables, get_async_session, async_session_maker, User
-from app.core.users import fastapi_users, auth_backend
-from app.services.theme import get_active_theme
-from app.services.site_settings import get_site_config
+from app.database.db import create_db_and_tables, async_session_maker, engine, User
+from app.core.users import fastapi_users, auth_backend, bearer_transport, read_user_from_token
+from app.core.http_cache import REVALIDATE, conditional_json
+from app.services.theme import get_public_active_theme
+from app.services.site_settings import get_public_settings
+from app.services.search import ensure_search_schema
+from app.services.like_buffer import like_buffer
+from app.services.event_bus import bus
 
 
 async def _promote_first_admin() -> None:
@@ -37,8 +41,14 @@ async def _promote_first_admin() -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await create_db_and_tables()
+    async with engine.begin() as conn:
+        await ensure_search_schema(conn)
     await _promote_first_admin()
+    await bus.start()
+    like_buffer.start()
     yield
+    await like_buffer.stop()
+    await bus.stop()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -88,22 +98,35 @@ app.include_router(profile_router, prefix="/api/v1", tags=["profile"])
 app.include_router(author_router, prefix="/api/v1", tags=["author"])
 
 
+# Served from the in-process public config cache; no DB session on a hit.
 @app.get("/api/v1/theme/active", response_model=ThemeActiveResponse, tags=["theme"])
-async def active_theme(session: AsyncSession = Depends(get_async_session)):
-    theme = await get_active_theme(session)
-    return ThemeActiveResponse(url=theme.url if theme else None)
+async def active_theme(request: Request):
+    theme = await get_public_active_theme()
+    return conditional_json(request, theme.value, etag=theme.etag)
 
 
 @app.get("/api/v1/settings", tags=["settings"])
-async def public_settings(session: AsyncSession = Depends(get_async_session)):
-    config = await get_site_config(session)
-    return {
-        "site_name": config.site_name,
-        "site_description": config.site_description,
-        "site_url": config.site_url,
-        "logo_url": config.logo_url,
-        "allow_registration": config.allow_registration,
-        "og_title": config.og_title,
-        "og_description": config.og_description,
-        "og_image_url": config.og_image_url,
+async def public_settings(request: Request):
+    settings = await get_public_settings()
+    return conditional_json(request, settings.value, etag=settings.etag)
+
+
+@app.get("/api/v1/bootstrap", tags=["settings"])
+async def bootstrap(request: Request, token: str | None = Depends(bearer_transport.scheme)):
+    """Everything a layout needs in one round trip: settings, active theme and current user."""
+    settings, theme, user = await asyncio.gather(
+        get_public_settings(),
+        get_public_active_theme(),
+        read_user_from_token(token),
+    )
+    payload = {
+        "settings": settings.value,
+        "theme": theme.value,
+        "user": UserRead.model_validate(user) if user else None,
     }
+    return conditional_json(
+        request,
+        payload,
+        cache_control="private, no-cache" if user else REVALIDATE,
+        headers={"Vary": "Authorization"},
+    )
@@ -0,0 +1,162 @@
+"""Maintenance commands for the blog backend.
+
+Run from backend/ so the default DATABASE_URL resolves the same way the app does:
+
+    uv run python -m app.cli reconcile-counters
+"""
+import argparse
+import asyncio
+import sys
+
+from app.database.benchmark import (
+    check_plans, check_query_budgets, compression_report, hammer_likes, seed_dataset,
+)
+from app.database.db import async_session_maker
+from app.services.articles import prune_tombstones, reconcile_counters
+from app.services.search import rebuild_index
+
+
+async def _reconcile_counters(_args) -> None:
+    async with async_session_maker() as session:
+        fixed = await reconcile_counters(session)
+    print(f"reconcile-counters: corrected {fixed} post(s)")
+
+
+async def _reindex_search(_args) -> None:
+    async with async_session_maker() as session:
+        indexed = await rebuild_index(session)
+    print(f"reindex-search: indexed {indexed} post(s)")
+
+
+async def _prune_tombstones(_args) -> None:
+    async with async_session_maker() as session:
+        pruned = await prune_tombstones(session)
+    print(f"prune-tombstones: removed {pruned} tombstone(s)")
+
+
+async def _seed_benchmark(args) -> None:
+    async with async_session_maker() as session:
+        counts = await seed_dataset(session, users=args.users, posts=args.posts)
+    print("seed-benchmark: inserted " + ", ".join(f"{n} {k}" for k, n in counts.items()))
+
+
+async def _check_plans(_args) -> None:
+    async with async_session_maker() as session:
+        failures = await check_plans(session)
+    for failure in failures:
+        print(f"check-plans: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+    print("check-plans: no sequential scans on hot queries")
+
+
+async def _check_query_budgets(_args) -> None:
+    failures = await check_query_budgets(async_session_maker)
+    for failure in failures:
+        print(f"check-query-budgets: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+    print("check-query-budgets: every budgeted route stayed within its budget")
+
+
+async def _hammer_likes(args) -> None:
+    result = await hammer_likes(async_session_maker, tasks=args.tasks, toggles=args.toggles)
+    print(
+        f"hammer-likes: {result['toggles']} toggles in {result['seconds']}s, "
+        f"like_count={result['like_count']} actual={result['actual']}"
+    )
+    if result["like_count"] != result["actual"]:
+        print("hammer-likes: like_count drifted from the likes table (lost update)", file=sys.stderr)
+        sys.exit(1)
+
+
+async def _compression_report(args) -> None:
+    async with async_session_maker() as session:
+        report = await compression_report(session, limit=args.limit)
+    if not report["posts"]:
+        print("compression-report: no posts found", file=sys.stderr)
+        sys.exit(1)
+    print(
+        f"compression-report: {report['posts']} post(s), {report['raw_bytes']} bytes raw, "
+        f"{report['stored_bytes']} bytes stored (level {report['configured_level']})"
+    )
+    print(f"{'level':>5} {'bytes':>12} {'ratio':>6} {'compress MB/s':>14} {'decompress MB/s':>16}")
+    for row in report["levels"]:
+        print(
+            f"{row['level']:>5} {row['bytes']:>12} {row['ratio']:>6} "
+            f"{row['compress_mb_s']!s:>14} {row['decompress_mb_s']!s:>16}"
+        )
+
+
+def _seed_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--posts", type=int, default=20000)
+
+
+def _hammer_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--toggles", type=int, default=20)
+
+
+def _compression_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--limit", type=int, default=None, help="Only the first N posts by id.")
+
+
+_COMMANDS = {
+    "reconcile-counters": (
+        _reconcile_counters,
+        "Backfill / repair posts.like_count and posts.comment_count from the likes and comments tables.",
+        None,
+    ),
+    "reindex-search": (
+        _reindex_search,
+        "Rebuild the post_search full-text index from posts.",
+        None,
+    ),
+    "prune-tombstones": (
+        _prune_tombstones,
+        "Delete post tombstones older than TOMBSTONE_RETENTION_DAYS (the changes feed resets older tokens).",
+        None,
+    ),
+    "seed-benchmark": (
+        _seed_benchmark,
+        "Insert a synthetic users/posts/likes/comments dataset for plan and load checks.",
+        _seed_args,
+    ),
+    "check-plans": (
+        _check_plans,
+        "EXPLAIN the hot service queries and fail if any plans a sequential scan.",
+        None,
+    ),
+    "check-query-budgets": (
+        _check_query_budgets,
+        "Call every route with a query budget against the seeded data and fail on any overrun.",
+        None,
+    ),
+    "hammer-likes": (
+        _hammer_likes,
+        "Race concurrent like toggles on one post and fail if like_count drifts from the likes table.",
+        _hammer_args,
+    ),
+    "compression-report": (
+        _compression_report,
+        "Report stored vs raw size of article bodies and zlib size/CPU trade-offs per level.",
+        _compression_args,
+    ),
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text, configure) in _COMMANDS.items():
+        command_parser = sub.add_parser(name, help=help_text)
+        if configure:
+            configure(command_parser)
+    args = parser.parse_args(argv)
+    handler, _, _ = _COMMANDS[args.command]
+    asyncio.run(handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Conditional-GET helpers: ETags, Cache-Control and 304 Not Modified."""
+import hashlib
+import json
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+# Shared caches may keep a copy, but must revalidate before every reuse; with
+# a matching ETag that revalidation is an empty 304.
+REVALIDATE = "public, max-age=0, must-revalidate"
+
+
+def compute_etag(payload) -> str:
+    """Strong ETag over the canonical JSON encoding of `payload`."""
+    body = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return '"' + hashlib.sha1(body.encode()).hexdigest()[:20] + '"'
+
+
+def weak_etag(*parts) -> str:
+    """Weak ETag over version fields (ids, timestamps, counters) instead of the body."""
+    raw = "|".join(str(part) for part in parts)
+    return 'W/"' + hashlib.sha1(raw.encode()).hexdigest()[:20] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match covers `etag` (weak comparison, RFC 9110 §13.1.2)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def accepts_gzip(request: Request) -> bool:
+    """True when Accept-Encoding allows gzip (explicitly or via `*`) with a non-zero q."""
+    allowed = {}
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.strip().lower().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            allowed[coding.strip()] = q
+    return allowed.get("gzip", allowed.get("*", 0.0)) > 0
+
+
+def conditional_json(
+    request: Request,
+    payload,
+    *,
+    etag: str | None = None,
+    cache_control: str = REVALIDATE,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """JSON response carrying ETag/Cache-Control, or a bodiless 304 if the client's copy is current."""
+    etag = etag or compute_etag(payload)
+    headers = {"ETag": etag, "Cache-Control": cache_control, **(headers or {})}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(jsonable_encoder(payload), headers=headers)
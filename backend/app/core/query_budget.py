@@ -0,0 +1,72 @@
+"""Per-endpoint SQL statement budgets.
+
+A route declares how many statements one request may issue, auth lookup
+included:
+
+    @router.post("/things", dependencies=[query_budget(3)])
+
+Statements are counted from the engine's before_cursor_execute event, so
+BEGIN/COMMIT are free and every refresh(), lazy load or N+1 is not. Going
+over budget logs a warning; with QUERY_BUDGET_STRICT=1 (dev and CI) the
+request fails with a 500 instead, so a regression is caught the first time
+the endpoint runs.
+
+`python -m app.cli check-query-budgets` calls every budgeted route once
+against the seeded benchmark database in strict mode, and fails on any
+overrun or on a budgeted route it has no request for.
+"""
+import logging
+import os
+from contextvars import ContextVar
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import event
+
+from app.database.db import engine
+
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "").lower() in ("1", "true", "yes")
+
+logger = logging.getLogger(__name__)
+
+_statements: ContextVar[list[int] | None] = ContextVar("query_budget_statements", default=None)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def budget_of(route) -> int | None:
+    """The budget a route declared through query_budget(), if any."""
+    for dependency in getattr(route, "dependencies", ()):
+        limit = getattr(dependency.dependency, "budget", None)
+        if limit is not None:
+            return limit
+    return None
+
+
+def query_budget(limit: int):
+    """Route dependency failing (strict) or warning when a request runs more than `limit` statements."""
+
+    async def check(request: Request):
+        counter = [0]
+        token = _statements.set(counter)
+        try:
+            yield
+        finally:
+            _statements.reset(token)
+        if counter[0] > limit:
+            message = (
+                f"{request.method} {request.url.path} ran {counter[0]} SQL statements "
+                f"(budget {limit})"
+            )
+            if QUERY_BUDGET_STRICT:
+                raise HTTPException(status_code=500, detail=message)
+            logger.warning(message)
+
+    check.budget = limit
+    # Function scope: checked as soon as the endpoint returns, while an
+    # error can still become the response.
+    return Depends(check, scope="function")
@@ -9,7 +9,7 @@ from fastapi_users.authentication import (
         JWTStrategy
     )
 from fastapi_users.db import SQLAlchemyUserDatabase
-from app.database.db import User, get_user_db
+from app.database.db import User, async_session_maker, get_user_db
 
 SECRET = os.getenv("SECRET", "dev-secret-change-me")
 
@@ -50,4 +50,18 @@ async def current_author_or_admin(user: User = Depends(current_active_user)) ->
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only authors and admins can perform this action.",
         )
-    return user
\ No newline at end of file
+    return user
+
+async def read_user_from_token(token: str | None) -> User | None:
+    """Resolve a bearer token on its own session, outside the dependency graph.
+
+    Lets a handler look the user up concurrently with other work. Returns None
+    for a missing, invalid or expired token and for inactive users, like
+    current_optional_user.
+    """
+    if not token:
+        return None
+    async with async_session_maker() as session:
+        manager = UserManager(SQLAlchemyUserDatabase(session, User))
+        user = await get_jwt_strategy().read_token(token, manager)
+    return user if user and user.is_active else None
@@ -0,0 +1,450 @@
+"""Synthetic benchmark dataset and query-plan guard.
+
+`seed_dataset` fills the database with enough rows that the planner prefers
+indexes where it should; `check_plans` EXPLAINs the hot service query shapes
+and reports every sequential scan over a large table; `hammer_likes` races
+many like toggles against one post and checks the counter survived;
+`check_query_budgets` calls every route with a query_budget and fails on
+an overrun; `compression_report` measures what compressing the stored
+article bodies costs and saves. All are driven from `python -m app.cli`
+(seed-benchmark, check-plans, hammer-likes, check-query-budgets,
+compression-report); CI runs the two checks on every backend change.
+"""
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import LargeBinary, delete, func, insert, select, text, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database.compressed import CONTENT_COMPRESSION_LEVEL, compress, decompress
+from app.database.db import (
+    Comment, Experience, Like, Post, PostTombstone, Qualification, SchoolEducation, User,
+)
+
+BATCH_SIZE = 1000
+COMPRESSION_LEVELS = (1, 3, 6, 9)
+
+# Tables that must never be read with a full scan on a hot path.
+WATCHED_TABLES = {
+    "posts", "post_tombstones", "comments", "likes", "experiences", "qualifications", "school_education",
+}
+
+
+def _content(n: int) -> str:
+    return json.dumps({"blocks": [
+        {"type": "header", "data": {"text": f"Benchmark post {n}", "level": 2}},
+        {"type": "paragraph", "data": {"text": "Lorem ipsum dolor sit amet " * 20}},
+    ]})
+
+
+async def _insert_batched(session: AsyncSession, model, rows: list[dict]) -> None:
+    for i in range(0, len(rows), BATCH_SIZE):
+        await session.execute(insert(model), rows[i:i + BATCH_SIZE])
+
+
+async def seed_dataset(
+    session: AsyncSession,
+    *,
+    users: int = 200,
+    posts: int = 20000,
+    comments_per_post: int = 5,
+    likes_per_post: int = 10,
+) -> dict:
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    user_ids = [uuid.uuid4() for _ in range(users)]
+    await _insert_batched(session, User, [
+        {
+            "id": uid,
+            "email": f"bench-{uid.hex[:12]}@example.com",
+            "hashed_password": "!",
+            "is_active": True,
+            "is_superuser": False,
+            "is_verified": True,
+            "role": "author",
+        }
+        for uid in user_ids
+    ])
+    for model, extra in ((Experience, {}), (Qualification, {}), (SchoolEducation, {"grade": "12"})):
+        await _insert_batched(session, model, [{"user_id": uid, **extra} for uid in user_ids])
+
+    post_rows = []
+    like_rows = []
+    comment_rows = []
+    for n in range(posts):
+        pid = uuid.uuid4()
+        created = now - timedelta(minutes=n)
+        likers = rng.sample(user_ids, min(likes_per_post, users))
+        post_rows.append({
+            "id": pid,
+            "owner_id": rng.choice(user_ids),
+            "title": f"Benchmark post {n}",
+            "content": _content(n),
+            "published": bool(n % 10),
+            "created_date": created,
+            "like_count": len(likers),
+            "comment_count": comments_per_post,
+            "excerpt": "Lorem ipsum dolor sit amet",
+            "word_count": 100,
+            "reading_time": 1,
+        })
+        like_rows.extend({"post_id": pid, "user_id": uid} for uid in likers)
+        comment_rows.extend(
+            {
+                "id": uuid.uuid4(),
+                "post_id": pid,
+                "author_id": rng.choice(user_ids),
+                "body": "Benchmark comment",
+                "created_at": created + timedelta(seconds=c),
+            }
+            for c in range(comments_per_post)
+        )
+    await _insert_batched(session, Post, post_rows)
+    await _insert_batched(session, Like, like_rows)
+    await _insert_batched(session, Comment, comment_rows)
+    await session.commit()
+    await session.execute(text("ANALYZE"))
+    await session.commit()
+    return {"users": users, "posts": posts, "likes": len(like_rows), "comments": len(comment_rows)}
+
+
+def _hot_queries(post_id, user_id) -> dict:
+    """The statement shapes issued by app/services on every page view."""
+    return {
+        "feed page": (
+            select(Post.id).where(Post.published == True)
+            .order_by(Post.created_date.desc(), Post.id.desc()).limit(21)
+        ),
+        "admin article page": (
+            select(Post.id).order_by(Post.created_date.desc(), Post.id.desc()).limit(21)
+        ),
+        "author article page": (
+            select(Post.id).where(Post.owner_id == user_id)
+            .order_by(Post.created_date.desc(), Post.id.desc()).limit(21)
+        ),
+        "article by id": select(Post.id).where(Post.id == post_id),
+        "changes feed": (
+            select(Post.id).where(Post.updated_at > datetime.utcnow() - timedelta(hours=1))
+            .order_by(Post.updated_at, Post.id).limit(501)
+        ),
+        "changes feed tombstones": (
+            select(PostTombstone.post_id)
+            .where(PostTombstone.deleted_at > datetime.utcnow() - timedelta(hours=1))
+            .order_by(PostTombstone.deleted_at, PostTombstone.post_id).limit(501)
+        ),
+        "comments for article": (
+            select(Comment.id).where(Comment.post_id == post_id)
+            .order_by(Comment.created_at.asc(), Comment.id.asc()).limit(51)
+        ),
+        "comments on author's posts": (
+            select(Comment.id).join(Post, Comment.post_id == Post.id)
+            .where(Post.owner_id == user_id).order_by(Comment.created_at.desc()).limit(50)
+        ),
+        "comments by author": select(Comment.id).where(Comment.author_id == user_id),
+        "like status": select(Like.id).where(Like.post_id == post_id, Like.user_id == user_id),
+        "likes by user": select(Like.post_id).where(Like.user_id == user_id),
+        "profile experiences": select(Experience.id).where(Experience.user_id == user_id),
+        "profile qualifications": select(Qualification.id).where(Qualification.user_id == user_id),
+        "profile schools": select(SchoolEducation.id).where(SchoolEducation.user_id == user_id),
+    }
+
+
+def _pg_seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in WATCHED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(_pg_seq_scans(child))
+    return found
+
+
+_SQLITE_SCAN_RE = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+async def check_plans(session: AsyncSession) -> list[str]:
+    """EXPLAIN every hot query; returns a description of each sequential scan found."""
+    post_id = (await session.execute(select(Post.id).order_by(func.random()).limit(1))).scalar()
+    user_id = (await session.execute(select(Post.owner_id).where(Post.id == post_id))).scalar()
+    if post_id is None:
+        raise RuntimeError("No posts found; run `python -m app.cli seed-benchmark` first.")
+
+    dialect = session.get_bind().dialect
+    failures = []
+    for name, stmt in _hot_queries(post_id, user_id).items():
+        sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+        if dialect.name == "postgresql":
+            plan = (await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            scans = _pg_seq_scans(plan[0]["Plan"])
+        else:
+            rows = (await session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))).all()
+            scans = [
+                m.group(1) for m in (_SQLITE_SCAN_RE.match(row[-1]) for row in rows)
+                if m and m.group(1) in WATCHED_TABLES
+            ]
+        failures.extend(f"{name}: sequential scan on {table}" for table in scans)
+    return failures
+
+
+async def hammer_likes(
+    session_maker: async_sessionmaker,
+    *,
+    tasks: int = 50,
+    toggles: int = 20,
+) -> dict:
+    """Toggle likes on one post from `tasks` concurrent tasks, `toggles` times each.
+
+    With more tasks than users, several tasks share a user and race on the
+    same (post, user) row. Raises if any toggle fails; the returned counts
+    must match for the denormalised like_count to be trusted. With the
+    write-behind buffer enabled (LIKE_FLUSH_MS) it is flushed throughout and
+    drained before counting.
+    """
+    from app.services.articles import toggle_like
+    from app.services.like_buffer import like_buffer
+
+    async with session_maker() as session:
+        post_id = (await session.execute(select(Post.id).order_by(func.random()).limit(1))).scalar()
+        user_ids = (await session.execute(select(User.id).limit(tasks))).scalars().all()
+    if post_id is None or not user_ids:
+        raise RuntimeError("No posts found; run `python -m app.cli seed-benchmark` first.")
+
+    async def worker(user_id) -> None:
+        for _ in range(toggles):
+            async with session_maker() as session:
+                await toggle_like(session, str(post_id), user_id)
+
+    like_buffer.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(user_ids[n % len(user_ids)]) for n in range(tasks)))
+    await like_buffer.stop()
+    elapsed = time.perf_counter() - started
+
+    async with session_maker() as session:
+        like_count = (await session.execute(select(Post.like_count).where(Post.id == post_id))).scalar()
+        actual = (await session.execute(
+            select(func.count()).select_from(Like).where(Like.post_id == post_id)
+        )).scalar()
+    return {
+        "toggles": tasks * toggles,
+        "seconds": round(elapsed, 2),
+        "like_count": like_count,
+        "actual": actual,
+    }
+
+
+async def compression_report(
+    session: AsyncSession,
+    *,
+    levels: tuple[int, ...] = COMPRESSION_LEVELS,
+    limit: int | None = None,
+) -> dict:
+    """Recompress the stored article bodies at each zlib level and time both directions.
+
+    Runs over the real corpus (or its first `limit` posts by id), read in
+    batches as stored. Sizes are summed over every body; throughput is
+    uncompressed megabytes per second of CPU on this machine.
+    """
+    stored_col = type_coerce(Post.content, LargeBinary)
+    totals = {level: {"bytes": 0, "compress_s": 0.0, "decompress_s": 0.0} for level in levels}
+    docs = raw_bytes = stored_bytes = 0
+    last_id = None
+    while limit is None or docs < limit:
+        q = select(Post.id, stored_col).order_by(Post.id).limit(
+            BATCH_SIZE if limit is None else min(BATCH_SIZE, limit - docs)
+        )
+        if last_id is not None:
+            q = q.where(Post.id > last_id)
+        rows = (await session.execute(q)).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        stored = [row[1] for row in rows]
+        texts = [decompress(value) for value in stored]
+        docs += len(rows)
+        stored_bytes += sum(len(value) for value in stored)
+        raw_bytes += sum(len(t.encode("utf-8")) for t in texts)
+        for level in levels:
+            started = time.process_time()
+            compressed = [compress(t, level) for t in texts]
+            between = time.process_time()
+            for value in compressed:
+                decompress(value)
+            totals[level]["compress_s"] += between - started
+            totals[level]["decompress_s"] += time.process_time() - between
+            totals[level]["bytes"] += sum(len(value) for value in compressed)
+
+    def rate(seconds: float) -> float | None:
+        return round(raw_bytes / seconds / 1e6, 1) if seconds else None
+
+    return {
+        "posts": docs,
+        "raw_bytes": raw_bytes,
+        "stored_bytes": stored_bytes,
+        "configured_level": CONTENT_COMPRESSION_LEVEL,
+        "levels": [
+            {
+                "level": level,
+                "bytes": t["bytes"],
+                "ratio": round(raw_bytes / t["bytes"], 2) if t["bytes"] else None,
+                "compress_mb_s": rate(t["compress_s"]),
+                "decompress_mb_s": rate(t["decompress_s"]),
+            }
+            for level, t in totals.items()
+        ],
+    }
+
+
+async def check_query_budgets(session_maker: async_sessionmaker) -> list[str]:
+    """Call every route that declares a query_budget once, with strict budgets.
+
+    Runs in-process against the seeded benchmark data. Throwaway users (and
+    the post, comment, theme and profile rows the calls create) are removed
+    afterwards, and the previously active theme is restored. Returns one line
+    per overrun, per failed request and per budgeted route with no request
+    below, so adding a budget means adding its call here too.
+    """
+    import httpx
+    from fastapi.routing import APIRoute
+
+    from app.api.v1 import admin as admin_api, articles as articles_api
+    from app.api.v1 import author as author_api, profile as profile_api
+    from app.app import app
+    from app.core import query_budget as budgets
+    from app.core.users import get_jwt_strategy
+    from app.services.admin import delete_user_and_content
+    from app.services.theme import delete_theme, get_active_theme, set_active_theme
+
+    async with session_maker() as session:
+        post_id = (await session.execute(
+            select(Post.id).where(Post.published == True).order_by(Post.created_date.desc()).limit(1)
+        )).scalar()
+        if post_id is None:
+            raise RuntimeError("No posts found; run `python -m app.cli seed-benchmark` first.")
+        active_theme = await get_active_theme(session)
+        active_theme_id = active_theme.id if active_theme else None
+        tag = uuid.uuid4().hex[:8]
+        users = {
+            name: User(
+                id=uuid.uuid4(),
+                email=f"budget-{name}-{tag}@example.com",
+                hashed_password="!",
+                is_active=True,
+                is_superuser=name == "admin",
+                is_verified=True,
+                role=role,
+            )
+            for name, role in (("admin", "admin"), ("author", "author"), ("reader", "guest"), ("target", "guest"))
+        }
+        session.add_all(users.values())
+        await session.commit()
+
+    strategy = get_jwt_strategy()
+    auth = {name: {"Authorization": f"Bearer {await strategy.write_token(user)}"} for name, user in users.items()}
+    state = {"post": str(post_id), "user": str(users["target"].id)}
+    doc = _content(0)
+    article = {"title": "Budget check", "content": doc, "published": True, "created_date": "2025-01-01 10:00:00"}
+
+    def keep(key: str, *path: str):
+        def save(body) -> None:
+            for part in path:
+                body = body[part]
+            state[key] = str(body)
+        return save
+
+    # (method, route path, caller, path params -> state keys, request kwargs, save)
+    steps = [
+        ("POST", "/api/v1/create-article", "author", {}, {"json": article}, keep("new", "blog", "id")),
+        ("GET", "/api/v1/get-articles", None, {}, {}, None),
+        ("GET", "/api/v1/get-articles", None, {}, {"params": {"q": "budget check"}}, None),
+        # A stale If-None-Match: the version check runs, then the full read.
+        ("GET", "/api/v1/get-article/{id}", None, {"id": "new"}, {"headers": {"If-None-Match": 'W/"0"'}}, None),
+        ("GET", "/api/v1/articles/{id}/toc", None, {"id": "new"}, {}, None),
+        ("GET", "/api/v1/articles/{id}/content", None, {"id": "new"}, {}, None),
+        ("PUT", "/api/v1/update-article/{id}", "author", {"id": "new"}, {"json": article}, None),
+        ("GET", "/api/v1/articles/changes", None, {}, {}, None),
+        ("POST", "/api/v1/articles/{id}/like", "reader", {"id": "post"}, {}, None),
+        ("GET", "/api/v1/articles/likes", "reader", {}, {"params": {"ids": [state["post"]]}}, None),
+        ("GET", "/api/v1/articles/{id}/likes", "reader", {"id": "post"}, {}, None),
+        ("GET", "/api/v1/articles/{id}/comments", None, {"id": "post"}, {}, None),
+        ("POST", "/api/v1/articles/{id}/comments", "reader", {"id": "post"}, {"json": {"body": "Budget"}},
+         keep("comment", "id")),
+        ("DELETE", "/api/v1/articles/{id}/comments/{comment_id}", "reader",
+         {"id": "post", "comment_id": "comment"}, {}, None),
+        ("POST", "/api/v1/articles/{id}/like", "reader", {"id": "post"}, {}, None),
+        ("DELETE", "/api/v1/delete-article/{id}", "author", {"id": "new"}, {}, None),
+        ("PUT", "/api/v1/profile/me", "author", {}, {"json": {"first_name": "Budget"}}, None),
+        ("POST", "/api/v1/profile/experience", "author", {},
+         {"json": {"company_name": "Co", "designation": "Dev"}}, keep("experience", "id")),
+        ("PUT", "/api/v1/profile/experience/{exp_id}", "author", {"exp_id": "experience"},
+         {"json": {"company_name": "Co", "designation": "Lead"}}, None),
+        ("POST", "/api/v1/profile/qualification", "author", {},
+         {"json": {"institution": "Uni", "degree": "BSc"}}, keep("qualification", "id")),
+        ("PUT", "/api/v1/profile/qualification/{qual_id}", "author", {"qual_id": "qualification"},
+         {"json": {"institution": "Uni", "degree": "MSc"}}, None),
+        ("POST", "/api/v1/profile/school", "author", {}, {"json": {"grade": "12th"}}, None),
+        ("PATCH", "/api/v1/admin/users/{user_id}/deactivate", "admin", {"user_id": "user"}, {}, None),
+        ("PATCH", "/api/v1/admin/users/{user_id}/activate", "admin", {"user_id": "user"}, {}, None),
+        ("PATCH", "/api/v1/admin/users/{user_id}/role", "admin", {"user_id": "user"}, {"json": {"role": "author"}}, None),
+        ("DELETE", "/api/v1/admin/users/{user_id}", "admin", {"user_id": "user"}, {}, None),
+        ("POST", "/api/v1/admin/themes", "admin", {}, {"json": {"name": f"budget-{tag}", "url": "https://x"}},
+         keep("theme", "id")),
+        ("PUT", "/api/v1/admin/themes/{theme_id}/activate", "admin", {"theme_id": "theme"}, {}, None),
+        # The default name: takes the upsert path without changing the site.
+        ("PUT", "/api/v1/admin/settings", "admin", {}, {"json": {"site_name": "My Blog"}}, None),
+    ]
+
+    # The routers app.py mounts under /api/v1: every budgeted route lives there.
+    budgeted = {
+        (method, "/api/v1" + route.path)
+        for router in (admin_api.router, articles_api.router, author_api.router, profile_api.router)
+        for route in router.routes
+        if isinstance(route, APIRoute) and budgets.budget_of(route) is not None
+        for method in route.methods
+    }
+    failures = [
+        f"{method} {path}: has a query budget but no request in check_query_budgets"
+        for method, path in sorted(budgeted - {(method, path) for method, path, *_ in steps})
+    ]
+
+    strict = budgets.QUERY_BUDGET_STRICT
+    budgets.QUERY_BUDGET_STRICT = True
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://budget") as client:
+            for method, path, caller, params, kwargs, save in steps:
+                try:
+                    url = path.format(**{name: state[key] for name, key in params.items()})
+                except KeyError as e:
+                    failures.append(f"{method} {path}: skipped, an earlier request did not provide {e}")
+                    continue
+                headers = {**auth.get(caller, {}), **kwargs.get("headers", {})}
+                request = {k: v for k, v in kwargs.items() if k != "headers"}
+                response = await client.request(method, url, headers=headers, **request)
+                if response.status_code >= 400:
+                    failures.append(f"{method} {path}: {response.status_code} {response.text[:300]}")
+                elif save:
+                    save(response.json())
+    finally:
+        budgets.QUERY_BUDGET_STRICT = strict
+        async with session_maker() as session:
+            admin = users["admin"]
+            for name in ("author", "reader", "target"):
+                try:
+                    await delete_user_and_content(session, str(users[name].id), acting_user=admin)
+                except Exception:
+                    # The target is normally gone already (DELETE /users ran).
+                    await session.rollback()
+            await session.execute(delete(User).where(User.id == admin.id))
+            await session.commit()
+            if "theme" in state:
+                if active_theme_id is not None:
+                    await set_active_theme(session, active_theme_id)
+                await delete_theme(session, int(state["theme"]))
+    return failures
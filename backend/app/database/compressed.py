@@ -0,0 +1,51 @@
+"""Compressed storage for large text columns (Post.content).
+
+Editor.js documents repeat the same block types and keys over and over, so
+they deflate to a fraction of their size. CompressedText stores a str column
+as DEFLATE bytes and hands the ORM plain text back, so no query or service
+code changes.
+
+The bytes use the gzip container (zlib with wbits=31) rather than the bare
+zlib one: a stored value is then a complete `Content-Encoding: gzip` body and
+can be sent to clients that accept gzip without being decompressed or
+recompressed (see is_gzip). decompress() also accepts zlib-framed bytes and
+plain str, so rows written any other way still read back.
+"""
+import os
+import zlib
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+CONTENT_COMPRESSION_LEVEL = int(os.getenv("CONTENT_COMPRESSION_LEVEL", "6"))
+
+_GZIP_MAGIC = b"\x1f\x8b"
+# wbits for zlib.decompress: 32 + 15 auto-detects a gzip or zlib header.
+_AUTO_WBITS = 47
+
+
+def compress(text: str, level: int = CONTENT_COMPRESSION_LEVEL) -> bytes:
+    return zlib.compress(text.encode("utf-8"), level, wbits=31)
+
+
+def decompress(value: bytes | str) -> str:
+    if isinstance(value, str):
+        return value
+    return zlib.decompress(value, _AUTO_WBITS).decode("utf-8")
+
+
+def is_gzip(value: bytes | str) -> bool:
+    return isinstance(value, bytes) and value[:2] == _GZIP_MAGIC
+
+
+class CompressedText(TypeDecorator):
+    """A str column stored gzip-compressed; select with type_coerce(col, LargeBinary) for the raw bytes."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else compress(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else decompress(bytes(value) if isinstance(value, memoryview) else value)
@@ -5,12 +5,14 @@ from collections.abc import AsyncGenerator
 from datetime import datetime
 
 from fastapi import Depends
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import JSON, Boolean, Column, DateTime, Index, Integer, String, ForeignKey, UniqueConstraint, func, true
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, relationship
 from fastapi_users.db import SQLAlchemyUserDatabase, SQLAlchemyBaseUserTableUUID
 from fastapi_users_db_sqlalchemy.generics import GUID
 
+from app.database.compressed import CompressedText
+
 def _async_db_url(url: str) -> str:
     """Normalise scheme for SQLAlchemy async engine. SSL is handled via connect_args."""
     from urllib.parse import urlparse, urlencode, parse_qs, urlunparse
@@ -54,21 +56,66 @@ class User(Base, SQLAlchemyBaseUserTableUUID):
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_owner_id_created_date", "owner_id", "created_date", "id"),
+        Index("ix_posts_created_date", "created_date", "id"),
+        # Covers the conditional-GET check: a post's ETag is answered from
+        # the index without reading the row (or its content).
+        Index("ix_posts_version", "id", "updated_at", "like_count", "comment_count"),
+        # Walked in order by the /articles/changes delta feed.
+        Index("ix_posts_updated_at", "updated_at", "id"),
+    )
 
     id = Column(GUID, primary_key=True, default=uuid.uuid4)
     owner_id = Column(GUID, ForeignKey("users.id"))
     title = Column(String, nullable=False, default="")
-    content = Column(String, nullable=False)
-    published = Column(String, default="true")
+    # Editor.js JSON, stored gzip-compressed (see database/compressed.py).
+    content = Column(CompressedText, nullable=False)
+    published = Column(Boolean, nullable=False, default=True, server_default=true())
     created_date = Column(DateTime(timezone=True), default=datetime.utcnow)
+    # When the row was inserted; created_date is the author-chosen publish date.
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, default=datetime.utcnow, server_default=func.now()
+    )
+    # Bumped by every write to the post's own fields (not by likes or
+    # comments, which move the counters instead); part of the post's ETag.
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, default=datetime.utcnow, server_default=func.now()
+    )
+    # Denormalised counters, maintained in the same transaction as the Like /
+    # Comment rows they summarise so listings never have to load the children.
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Listing projection derived from `content` on write (see services/editorjs.py)
+    # so list endpoints never have to load or parse the Editor.js document.
+    excerpt = Column(String, nullable=False, default="", server_default="")
+    cover_image = Column(String, nullable=True)
+    word_count = Column(Integer, nullable=False, default=0, server_default="0")
+    reading_time = Column(Integer, nullable=False, default=1, server_default="1")
+    # Heading outline ([{level, text, id}]) for the table of contents, also
+    # derived on write so the article page never parses content to build it.
+    toc = Column(JSON, nullable=False, default=list, server_default="[]")
 
     owner = relationship("User", back_populates="posts")
     likes = relationship("Like", back_populates="post", cascade="all, delete-orphan")
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
 
+# The public feed only ever reads published posts newest-first.
+Index(
+    "ix_posts_published_feed",
+    Post.created_date.desc(),
+    Post.id.desc(),
+    postgresql_where=Post.published,
+    sqlite_where=Post.published == True,
+)
+
 class Like(Base):
     __tablename__ = "likes"
-    __table_args__ = (UniqueConstraint("post_id", "user_id", name="uq_like_post_user"),)
+    # uq_like_post_user also serves post_id lookups; user_id needs its own index.
+    __table_args__ = (
+        UniqueConstraint("post_id", "user_id", name="uq_like_post_user"),
+        Index("ix_likes_user_id", "user_id"),
+    )
 
     id      = Column(Integer, primary_key=True, autoincrement=True)
     post_id = Column(GUID, ForeignKey("posts.id"), nullable=False)
@@ -78,6 +125,10 @@ class Like(Base):
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_post_id_created_at", "post_id", "created_at", "id"),
+        Index("ix_comments_author_id", "author_id"),
+    )
 
     id         = Column(GUID, primary_key=True, default=uuid.uuid4)
     post_id    = Column(GUID, ForeignKey("posts.id"), nullable=False)
@@ -88,6 +139,14 @@ class Comment(Base):
     post   = relationship("Post", back_populates="comments")
     author = relationship("User")
 
+class PostTombstone(Base):
+    """A deleted post, kept so the changes feed can report the deletion."""
+    __tablename__ = "post_tombstones"
+    __table_args__ = (Index("ix_post_tombstones_deleted_at", "deleted_at", "post_id"),)
+
+    post_id    = Column(GUID, primary_key=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+
 class UserProfile(Base):
     __tablename__ = "user_profiles"
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -101,6 +160,7 @@ class UserProfile(Base):
 
 class Experience(Base):
     __tablename__ = "experiences"
+    __table_args__ = (Index("ix_experiences_user_id", "user_id"),)
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(GUID, ForeignKey("users.id"), nullable=False)
     company_name = Column(String, nullable=False, default="")
@@ -111,6 +171,7 @@ class Experience(Base):
 
 class Qualification(Base):
     __tablename__ = "qualifications"
+    __table_args__ = (Index("ix_qualifications_user_id", "user_id"),)
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(GUID, ForeignKey("users.id"), nullable=False)
     institution = Column(String, nullable=False, default="")
@@ -121,6 +182,7 @@ class Qualification(Base):
 
 class SchoolEducation(Base):
     __tablename__ = "school_education"
+    __table_args__ = (Index("ix_school_education_user_id", "user_id"),)
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(GUID, ForeignKey("users.id"), nullable=False)
     grade = Column(String, nullable=False)
@@ -1,10 +1,23 @@
 import uuid
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import delete, select, func, update
 from sqlalchemy.orm import selectinload
 
-from app.database.db import User, Comment, Post
+from app.database.db import (
+    Comment,
+    Experience,
+    Like,
+    Post,
+    Qualification,
+    SchoolEducation,
+    User,
+    UserProfile,
+)
+from app.services.articles import delete_posts
+from app.services.counting import count_total
+from app.services.like_buffer import like_buffer
+from app.services import response_cache
 
 
 async def list_users(
@@ -12,6 +25,8 @@ async def list_users(
     skip: int = 0,
     limit: int = 20,
     search: str = "",
+    include_total: bool = True,
+    estimate_total: bool = False,
 ):
     count_q = select(func.count(User.id))
     rows_q = select(User)
@@ -20,12 +35,22 @@ async def list_users(
         count_q = count_q.where(User.email.ilike(pattern))
         rows_q = rows_q.where(User.email.ilike(pattern))
 
-    total = (await session.execute(count_q)).scalar() or 0
+    total = await count_total(
+        session, count_q, include_total=include_total, estimate=estimate_total,
+        filtered=bool(search), cache_key="users:all", table="users",
+    )
     result = await session.execute(rows_q.order_by(User.email).offset(skip).limit(limit))
     return result.scalars().all(), total
 
 
-async def list_all_comments(session: AsyncSession, skip: int = 0, limit: int = 50, search: str = ""):
+async def list_all_comments(
+    session: AsyncSession,
+    skip: int = 0,
+    limit: int = 50,
+    search: str = "",
+    include_total: bool = True,
+    estimate_total: bool = False,
+):
     count_q = select(func.count()).select_from(Comment).join(Post, Comment.post_id == Post.id)
     rows_q = (
         select(Comment)
@@ -37,7 +62,10 @@ async def list_all_comments(session: AsyncSession, skip: int = 0, limit: int = 5
         filt = (Comment.body.ilike(pattern)) | (Post.title.ilike(pattern))
         count_q = count_q.where(filt)
         rows_q = rows_q.where(filt)
-    total = (await session.execute(count_q)).scalar() or 0
+    total = await count_total(
+        session, count_q, include_total=include_total, estimate=estimate_total,
+        filtered=bool(search), cache_key="comments:all", table="comments",
+    )
     comments = (await session.execute(
         rows_q.order_by(Comment.created_at.desc()).offset(skip).limit(limit)
     )).scalars().all()
@@ -59,14 +87,12 @@ async def set_user_active(session: AsyncSession, user_id: str, active: bool) ->
         uid = uuid.UUID(user_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid user ID")
-    result = await session.execute(select(User).where(User.id == uid))
-    user = result.scalars().first()
+    user = await session.scalar(
+        update(User).where(User.id == uid).values(is_active=active).returning(User)
+    )
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    user.is_active = active
-    session.add(user)
     await session.commit()
-    await session.refresh(user)
     return user
 
 
@@ -83,16 +109,75 @@ async def set_user_role(
         raise HTTPException(status_code=400, detail="Invalid user ID")
     if acting_user.id == uid:
         raise HTTPException(status_code=400, detail="Cannot change your own role.")
-    target = await session.get(User, uid)
+    target = await session.scalar(
+        update(User)
+        .where(User.id == uid, User.is_superuser == False)
+        .values(role=new_role)
+        .returning(User)
+    )
     if not target:
-        raise HTTPException(status_code=404, detail="User not found")
-    if target.is_superuser:
+        if await session.scalar(select(User.id).where(User.id == uid)) is None:
+            raise HTTPException(status_code=404, detail="User not found")
         raise HTTPException(
             status_code=400,
             detail="Cannot change role of a superuser via this endpoint.",
         )
-    target.role = new_role
-    session.add(target)
     await session.commit()
-    await session.refresh(target)
     return target
+
+
+async def delete_user_and_content(session: AsyncSession, user_id: str, *, acting_user: User) -> dict:
+    """Delete a user, their posts (with those posts' likes and comments), the
+    likes and comments they left elsewhere, and their profile rows.
+
+    Everything is a set-based statement in one transaction; nothing is loaded.
+    Counters on other authors' posts are decremented before the rows go.
+    """
+    try:
+        uid = uuid.UUID(user_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid user ID")
+    if acting_user.id == uid:
+        raise HTTPException(status_code=400, detail="Cannot delete your own account.")
+    target = (await session.execute(select(User.id, User.is_superuser).where(User.id == uid))).first()
+    if not target:
+        raise HTTPException(status_code=404, detail="User not found")
+    if target.is_superuser:
+        raise HTTPException(status_code=400, detail="Cannot delete a superuser via this endpoint.")
+
+    like_buffer.forget_user(uid)
+    bulk = {"synchronize_session": False}
+    deleted = await delete_posts(session, select(Post.id).where(Post.owner_id == uid))
+
+    # A user likes a post at most once, so each liked post loses exactly one.
+    await session.execute(
+        update(Post)
+        .where(Post.id.in_(select(Like.post_id).where(Like.user_id == uid)))
+        .values(like_count=Post.like_count - 1),
+        execution_options=bulk,
+    )
+    their_comments = (
+        select(func.count()).select_from(Comment)
+        .where(Comment.post_id == Post.id, Comment.author_id == uid)
+        .scalar_subquery()
+    )
+    await session.execute(
+        update(Post)
+        .where(Post.id.in_(select(Comment.post_id).where(Comment.author_id == uid)))
+        .values(comment_count=Post.comment_count - their_comments),
+        execution_options=bulk,
+    )
+    likes = await session.execute(delete(Like).where(Like.user_id == uid), execution_options=bulk)
+    comments = await session.execute(delete(Comment).where(Comment.author_id == uid), execution_options=bulk)
+
+    for model in (UserProfile, Experience, Qualification, SchoolEducation):
+        await session.execute(delete(model).where(model.user_id == uid), execution_options=bulk)
+    await session.execute(delete(User).where(User.id == uid), execution_options=bulk)
+    await session.commit()
+    # Their posts, comments and likes may sit in any cached page.
+    response_cache.purge_all()
+    return {
+        "posts": deleted["posts"],
+        "comments": deleted["comments"] + comments.rowcount,
+        "likes": deleted["likes"] + likes.rowcount,
+    }
@@ -1,41 +1,154 @@
+import asyncio
+import json
+import os
+import time
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
 
 from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
-
-from app.database.db import Post, Like, Comment, User
-
-
-def _post_to_dict(post: Post) -> dict:
+from sqlalchemy import LargeBinary, bindparam, delete, exists, insert, literal, select, func, text, type_coerce, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import defer, selectinload
+
+from app.database.db import Post, PostTombstone, Like, Comment, User, async_session_maker
+from app.core.http_cache import weak_etag
+from app.services.counting import Total, count_total
+from app.services.editorjs import RENDER_VERSION, summarize, table_of_contents
+from app.services.event_bus import RESET, bus
+from app.services.events import Subscription, article_topic, broker
+from app.services.like_buffer import like_buffer
+from app.services import response_cache
+from app.services.rendered import render_article
+from app.services.pagination import (
+    decode_cursor,
+    decode_offset_cursor,
+    encode_cursor,
+    encode_offset_cursor,
+    next_cursor,
+    seek_after,
+    seek_before,
+)
+from app.services import search as fts
+from app.services.single_flight import SingleFlight
+
+MAX_LIKE_STATUS_BATCH = 100
+# Concurrent get_article_by_id calls for one post share a query; with a
+# non-zero window, a post read in the last ARTICLE_READ_SWR_SECONDS is served
+# as-is while one background read refreshes it.
+ARTICLE_READ_SWR_SECONDS = float(os.getenv("ARTICLE_READ_SWR_SECONDS", "0"))
+# Live article streams: at most one update per subscriber per SSE_COALESCE_MS,
+# and a comment line every SSE_HEARTBEAT_SECONDS so proxies keep idle streams open.
+SSE_COALESCE_MS = int(os.getenv("SSE_COALESCE_MS", "1000"))
+SSE_HEARTBEAT_SECONDS = 15
+# The changes feed only reports writes at least SYNC_LAG_SECONDS old, so a
+# transaction that stamped updated_at but hadn't committed yet can't be
+# skipped. Tombstones older than TOMBSTONE_RETENTION_DAYS may be pruned; a
+# token older than that gets a reset instead of a partial answer.
+SYNC_LAG_SECONDS = float(os.getenv("SYNC_LAG_SECONDS", "5"))
+TOMBSTONE_RETENTION_DAYS = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+_MAX_UUID = uuid.UUID(int=(1 << 128) - 1)
+
+article_reads = SingleFlight(ARTICLE_READ_SWR_SECONDS)
+
+
+def _post_summary_dict(post: Post) -> dict:
+    """Listing shape: everything but the Editor.js body."""
     owner = post.owner
-    if owner:
-        parts = [owner.first_name, owner.last_name]
-        author_name = " ".join(p for p in parts if p) or owner.email
-    else:
-        author_name = None
     return {
         "id": str(post.id),
         "owner_id": str(post.owner_id),
         "title": post.title,
-        "content": post.content,
-        "published": post.published,
+        "excerpt": post.excerpt,
+        "cover_image": post.cover_image,
+        "word_count": post.word_count,
+        "reading_time": post.reading_time,
+        "published": _published_str(post),
         "created_date": post.created_date,
+        "updated_at": post.updated_at,
         "author_email": owner.email if owner else None,
-        "author_name": author_name,
-        "like_count": len(post.likes),
-        "comment_count": len(post.comments),
+        "author_name": fts.author_name(owner),
+        "like_count": post.like_count,
+        "comment_count": post.comment_count,
     }
 
 
+def _post_to_dict(post: Post) -> dict:
+    return {**_post_summary_dict(post), "toc": post.toc, "content": post.content}
+
+
+def _post_row_dict(values) -> dict:
+    """Column values of a freshly written post, as the write endpoints return them.
+
+    Accepts a Post or a `RETURNING *` row mapping.
+    """
+    if isinstance(values, Post):
+        values = {c.key: getattr(values, c.key) for c in Post.__table__.columns}
+    row = dict(values)
+    row["published"] = "true" if row["published"] else "false"
+    return row
+
+
+def _published_str(post: Post) -> str:
+    # The API has always exposed `published` as "true"/"false".
+    return "true" if post.published else "false"
+
+
 def _post_opts():
-    return (
-        selectinload(Post.owner),
-        selectinload(Post.likes),
-        selectinload(Post.comments),
+    return (selectinload(Post.owner),)
+
+
+def _list_opts():
+    return (selectinload(Post.owner), defer(Post.content), defer(Post.toc))
+
+
+async def _fetch_post_page(session: AsyncSession, rows_q, skip: int, limit: int, cursor: str | None):
+    """Newest-first page of posts. A cursor seeks past the previous page; `skip` is the legacy offset."""
+    rows_q = rows_q.order_by(Post.created_date.desc(), Post.id.desc())
+    if cursor:
+        rows_q = rows_q.where(seek_before(Post.created_date, Post.id, cursor))
+    elif skip:
+        rows_q = rows_q.offset(skip)
+    result = await session.execute(rows_q.limit(limit + 1))
+    posts, cursor_out = next_cursor(list(result.scalars().all()), limit, "created_date")
+    return [_post_summary_dict(p) for p in posts], cursor_out
+
+
+async def _search_post_page(
+    session: AsyncSession,
+    search: str,
+    where,
+    skip: int,
+    limit: int,
+    cursor: str | None,
+    include_total: bool = True,
+):
+    """Relevance-ranked page of posts matching `search`, each with a highlighted `snippet`.
+
+    Rank order has no stable seek key, so the cursor here wraps an offset.
+    """
+    offset = decode_offset_cursor(cursor) if cursor else skip
+    hits, count = await fts.search_post_ids(
+        session, search, where=where, limit=limit + 1, offset=offset, with_total=include_total
+    )
+    total = Total(count)
+    cursor_out = encode_offset_cursor(offset + limit) if len(hits) > limit else None
+    hits = hits[:limit]
+    if not hits:
+        return [], total, cursor_out
+    result = await session.execute(
+        select(Post).options(*_list_opts()).where(Post.id.in_([post_id for post_id, _ in hits]))
     )
+    by_id = {p.id: p for p in result.scalars().all()}
+    articles = [
+        {**_post_summary_dict(by_id[post_id]), "snippet": snippet}
+        for post_id, snippet in hits
+        if post_id in by_id
+    ]
+    return articles, total, cursor_out
 
 
 async def create_article(session: AsyncSession, user, post):
@@ -45,73 +158,183 @@ async def create_article(session: AsyncSession, user, post):
             owner_id=user.id,
             title=post.title,
             content=post.content,
-            published=str(post.published).lower(),
+            published=post.published,
             created_date=datetime_object,
+            toc=table_of_contents(post.content),
+            **summarize(post.content),
         )
         session.add(new_post)
+        await session.flush()
+        await fts.index_post(
+            session, new_post.id, new_post.title, new_post.content, fts.author_name(user), new=True
+        )
         await session.commit()
-        await session.refresh(new_post)
-        return new_post
+        if new_post.published:
+            response_cache.purge(response_cache.FEED)
+        # expire_on_commit=False: the flushed object already holds every column.
+        return _post_row_dict(new_post)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-async def list_articles(session: AsyncSession, skip: int = 0, limit: int = 10, search: str = ""):
+async def list_articles(
+    session: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    search: str = "",
+    cursor: str | None = None,
+    include_total: bool = True,
+    estimate_total: bool = False,
+):
     """Public endpoint — only published articles."""
-    count_q = select(func.count()).select_from(Post).where(Post.published == "true")
-    rows_q = select(Post).options(*_post_opts()).where(Post.published == "true")
     if search:
-        pattern = f"%{search}%"
-        author_ids = select(User.id).where(
-            User.first_name.ilike(pattern) | User.last_name.ilike(pattern)
+        return await _search_post_page(
+            session, search, Post.published == True, skip, limit, cursor, include_total
         )
-        filt = Post.title.ilike(pattern) | Post.owner_id.in_(author_ids)
-        count_q = count_q.where(filt)
-        rows_q = rows_q.where(filt)
-    total = (await session.execute(count_q)).scalar() or 0
-    result = await session.execute(
-        rows_q.order_by(Post.created_date.desc()).offset(skip).limit(limit)
+    count_q = select(func.count()).select_from(Post).where(Post.published == True)
+    rows_q = select(Post).options(*_list_opts()).where(Post.published == True)
+    total = await count_total(
+        session, count_q, include_total=include_total, estimate=estimate_total, cache_key="posts:published"
     )
-    return [_post_to_dict(p) for p in result.scalars().all()], total
-
-
-async def list_all_articles(session: AsyncSession, skip: int = 0, limit: int = 20, search: str = ""):
+    articles, cursor_out = await _fetch_post_page(session, rows_q, skip, limit, cursor)
+    return articles, total, cursor_out
+
+
+async def list_all_articles(
+    session: AsyncSession,
+    skip: int = 0,
+    limit: int = 20,
+    search: str = "",
+    cursor: str | None = None,
+    include_total: bool = True,
+    estimate_total: bool = False,
+):
     """Admin endpoint — all articles regardless of published status."""
-    count_q = select(func.count()).select_from(Post)
-    rows_q = select(Post).options(*_post_opts())
     if search:
-        pattern = f"%{search}%"
-        author_ids = select(User.id).where(
-            User.first_name.ilike(pattern) | User.last_name.ilike(pattern)
-        )
-        filt = Post.title.ilike(pattern) | Post.owner_id.in_(author_ids)
-        count_q = count_q.where(filt)
-        rows_q = rows_q.where(filt)
-    total = (await session.execute(count_q)).scalar() or 0
-    result = await session.execute(
-        rows_q.order_by(Post.created_date.desc()).offset(skip).limit(limit)
+        return await _search_post_page(session, search, None, skip, limit, cursor, include_total)
+    count_q = select(func.count()).select_from(Post)
+    rows_q = select(Post).options(*_list_opts())
+    total = await count_total(
+        session, count_q, include_total=include_total, estimate=estimate_total,
+        cache_key="posts:all", table="posts",
+    )
+    articles, cursor_out = await _fetch_post_page(session, rows_q, skip, limit, cursor)
+    return articles, total, cursor_out
+
+
+async def search_articles(
+    session: AsyncSession,
+    title: str,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: str | None = None,
+    include_total: bool = True,
+):
+    """Public full-text search over title, body and author, best match first."""
+    return await _search_post_page(
+        session, title, Post.published == True, skip, limit, cursor, include_total
     )
-    return [_post_to_dict(p) for p in result.scalars().all()], total
 
 
-async def search_articles(session: AsyncSession, title: str):
-    result = await session.execute(
-        select(Post)
-        .options(*_post_opts())
-        .where(Post.title.ilike(f"%{title}%"))
+async def get_article_by_id(id_str: str):
+    """One post with its content. Concurrent reads of the same post share a query."""
+    try:
+        article_id = uuid.UUID(id_str)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await article_reads.do(article_id, lambda: _load_article(article_id))
+
+
+def article_etag(post, variant: str = "json") -> str:
+    """A post's ETag: its id, last write and counters (a Post row or post dict).
+
+    `variant` tells representations of the same version apart (json, html);
+    the html one also changes with the renderer (editorjs.RENDER_VERSION).
+    """
+    if variant == "html":
+        variant = f"html-r{RENDER_VERSION}"
+    if isinstance(post, dict):
+        parts = (post["id"], post["updated_at"], post["like_count"], post["comment_count"])
+    else:
+        parts = (post.id, post.updated_at, post.like_count, post.comment_count)
+    return weak_etag(*parts, variant)
+
+
+def listing_etag(payload: dict) -> str:
+    """ETag of a list response: its total, cursor and every listed post's version."""
+    return weak_etag(
+        payload.get("total"),
+        payload.get("next_cursor"),
+        *(article_etag(article) for article in payload["articles"]),
     )
-    return [_post_to_dict(p) for p in result.scalars().all()]
 
 
-async def get_article_by_id(session: AsyncSession, id_str: str):
+async def get_article_etag(session: AsyncSession, id_str: str, variant: str = "json") -> str | None:
+    """The current ETag of a post, from ix_posts_version alone; None if there is no such post."""
     try:
         article_id = uuid.UUID(id_str)
-        result = await session.execute(
-            select(Post)
-            .options(*_post_opts())
-            .where(Post.id == article_id)
-        )
-        post = result.scalars().first()
+    except ValueError:
+        return None
+    columns = (Post.id, Post.updated_at, Post.like_count, Post.comment_count)
+    if session.get_bind().dialect.name == "sqlite":
+        # SQLite's planner prefers the primary key's index and then reads the
+        # row, overflow pages of `content` included; pin the covering index.
+        stmt = text(
+            "SELECT id, updated_at, like_count, comment_count "
+            "FROM posts INDEXED BY ix_posts_version WHERE id = :id"
+        ).bindparams(bindparam("id", article_id, type_=Post.id.type)).columns(*columns)
+    else:
+        stmt = select(*columns).where(Post.id == article_id)
+    row = (await session.execute(stmt)).first()
+    return article_etag(row, variant) if row else None
+
+
+async def get_article_html(id_str: str) -> list[dict]:
+    """get_article_by_id with the body rendered to HTML (`html`) in place of `content`."""
+    article = (await get_article_by_id(id_str))[0]
+    body = await render_article(article["id"], article["updated_at"], article["content"])
+    return [{**{k: v for k, v in article.items() if k != "content"}, "html": body}]
+
+
+async def get_article_toc(session: AsyncSession, id_str: str) -> dict:
+    """A post's heading outline, read from Post.toc without loading the content."""
+    try:
+        article_id = uuid.UUID(id_str)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    row = (await session.execute(
+        select(Post.id, Post.updated_at, Post.toc).where(Post.id == article_id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return {"id": str(row.id), "updated_at": row.updated_at, "toc": row.toc}
+
+
+async def get_article_content(session: AsyncSession, id_str: str) -> dict:
+    """A post's stored Editor.js body as it sits on disk (compressed), with its version."""
+    try:
+        article_id = uuid.UUID(id_str)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    row = (await session.execute(
+        select(Post.id, Post.updated_at, type_coerce(Post.content, LargeBinary).label("stored"))
+        .where(Post.id == article_id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return {"id": str(row.id), "updated_at": row.updated_at, "stored": row.stored}
+
+
+async def _load_article(article_id: uuid.UUID) -> list[dict]:
+    # Its own session: the result is shared by every caller waiting on it.
+    try:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(Post)
+                .options(*_post_opts())
+                .where(Post.id == article_id)
+            )
+            post = result.scalars().first()
         if not post:
             raise HTTPException(status_code=404, detail="Article not found")
         return [_post_to_dict(post)]
@@ -121,17 +344,59 @@ async def get_article_by_id(session: AsyncSession, id_str: str):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _forget_article_reads(topic: str, event: dict) -> None:
+    """Writes purge post:<id> after committing; drop that post's shared read too."""
+    tags = event.get("tags", ())
+    if event.get("all") or any(tag.startswith("author:") for tag in tags) or event == RESET:
+        article_reads.forget()
+        return
+    for tag in tags:
+        if tag.startswith("post:"):
+            article_reads.forget(uuid.UUID(tag.removeprefix("post:")))
+
+
+bus.on(response_cache.TOPIC, _forget_article_reads)
+
+
+async def delete_posts(session: AsyncSession, post_ids) -> dict:
+    """Delete posts and everything hanging off them with one DELETE per table.
+
+    `post_ids` is a list of ids or a SELECT of them. Nothing is loaded into
+    the session, so the ORM's delete-orphan cascades (which would load and
+    delete every like and comment one by one) never run. Each post leaves a
+    tombstone for the changes feed. The caller commits.
+    """
+    bulk = {"synchronize_session": False}
+    deleted_at = literal(datetime.utcnow(), PostTombstone.deleted_at.type)
+    await session.execute(
+        insert(PostTombstone).from_select(
+            ["post_id", "deleted_at"], select(Post.id, deleted_at).where(Post.id.in_(post_ids))
+        )
+    )
+    likes = await session.execute(delete(Like).where(Like.post_id.in_(post_ids)), execution_options=bulk)
+    comments = await session.execute(
+        delete(Comment).where(Comment.post_id.in_(post_ids)), execution_options=bulk
+    )
+    await fts.remove_posts(session, post_ids)
+    posts = await session.execute(delete(Post).where(Post.id.in_(post_ids)), execution_options=bulk)
+    return {"posts": posts.rowcount, "comments": comments.rowcount, "likes": likes.rowcount}
+
+
 async def delete_article(session: AsyncSession, user, id_str: str):
     try:
         article_id = uuid.UUID(id_str)
-        result = await session.execute(select(Post).where(Post.id == article_id))
-        article = result.scalars().first()
+        article = (await session.execute(
+            select(Post.id, Post.owner_id).where(Post.id == article_id)
+        )).first()
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
         if not user.is_superuser and article.owner_id != user.id:
             raise HTTPException(status_code=403, detail="Not authorized to delete this article")
-        await session.delete(article)
+        await delete_posts(session, [article_id])
         await session.commit()
+        response_cache.purge(
+            response_cache.FEED, response_cache.post_tag(article_id), response_cache.comments_tag(article_id)
+        )
         return {"success": True, "message": "Article deleted successfully"}
     except HTTPException:
         raise
@@ -142,21 +407,36 @@ async def delete_article(session: AsyncSession, user, id_str: str):
 async def update_article(session: AsyncSession, user, id_str: str, post):
     try:
         article_id = uuid.UUID(id_str)
-        result = await session.execute(select(Post).where(Post.id == article_id))
-        article = result.scalars().first()
-        if not article:
-            raise HTTPException(status_code=404, detail="Article not found")
-        if not user.is_superuser and article.owner_id != user.id:
-            raise HTTPException(status_code=403, detail="Not authorized to update this article")
         datetime_object = datetime.strptime(post.created_date, "%Y-%m-%d %H:%M:%S")
-        article.title = post.title
-        article.content = post.content
-        article.published = str(post.published).lower()
-        article.created_date = datetime_object
-        session.add(article)
+        # Ownership is part of the WHERE clause, so the happy path is one
+        # UPDATE ... RETURNING; only a miss pays for telling 404 from 403.
+        stmt = (
+            update(Post)
+            .where(Post.id == article_id)
+            .values(
+                title=post.title,
+                content=post.content,
+                published=post.published,
+                created_date=datetime_object,
+                updated_at=datetime.utcnow(),
+                toc=table_of_contents(post.content),
+                **summarize(post.content),
+            )
+            .returning(*Post.__table__.columns)
+            .execution_options(synchronize_session=False)
+        )
+        if not user.is_superuser:
+            stmt = stmt.where(Post.owner_id == user.id)
+        row = (await session.execute(stmt)).mappings().first()
+        if row is None:
+            if await session.scalar(select(Post.id).where(Post.id == article_id)) is None:
+                raise HTTPException(status_code=404, detail="Article not found")
+            raise HTTPException(status_code=403, detail="Not authorized to update this article")
+        await fts.update_post_text(session, article_id, post.title, post.content)
         await session.commit()
-        await session.refresh(article)
-        return article
+        # created_date and published can move the post within or out of the feed.
+        response_cache.purge(response_cache.FEED, response_cache.post_tag(article_id))
+        return _post_row_dict(row)
     except HTTPException:
         raise
     except Exception as e:
@@ -165,54 +445,174 @@ async def update_article(session: AsyncSession, user, id_str: str, post):
 
 # ── Likes ──────────────────────────────────────────────────────────────────────
 
+def _toggle_like_pg(post_id, user_id):
+    """One statement: delete the like if present, otherwise insert it, and move the counter.
+
+    Data-modifying CTEs share a snapshot, so `inserted` only runs when
+    `deleted` removed nothing; ON CONFLICT absorbs a concurrent insert of the
+    same like instead of failing on uq_like_post_user.
+    """
+    pid, uid = literal(post_id, Like.post_id.type), literal(user_id, Like.user_id.type)
+    deleted = (
+        delete(Like).where(Like.post_id == post_id, Like.user_id == user_id)
+        .returning(Like.id).cte("deleted")
+    )
+    inserted = (
+        pg_insert(Like)
+        .from_select(["post_id", "user_id"], select(pid, uid).where(~exists(select(deleted.c.id))))
+        .on_conflict_do_nothing(index_elements=["post_id", "user_id"])
+        .returning(Like.id)
+        .cte("inserted")
+    )
+    delta = (
+        select(func.count()).select_from(inserted).scalar_subquery()
+        - select(func.count()).select_from(deleted).scalar_subquery()
+    )
+    counted = (
+        update(Post).where(Post.id == post_id)
+        .values(like_count=Post.like_count + delta)
+        .returning(Post.like_count)
+        .cte("counted")
+    )
+    return select(counted.c.like_count, exists(select(inserted.c.id)))
+
+
 async def toggle_like(session: AsyncSession, post_id_str: str, user_id) -> dict:
     post_id = uuid.UUID(post_id_str)
-    result = await session.execute(
-        select(Like).where(Like.post_id == post_id, Like.user_id == user_id)
-    )
-    existing = result.scalars().first()
-    if existing:
-        await session.delete(existing)
-        liked = False
+    if like_buffer.enabled:
+        status = await like_buffer.toggle(session, post_id, user_id)
+        bus.publish(article_topic(post_id), {"type": "likes", "like_count": status["count"]})
+        return status
+    if session.get_bind().dialect.name == "postgresql":
+        row = (await session.execute(_toggle_like_pg(post_id, user_id))).first()
+        count, liked = row if row else (0, False)
     else:
-        session.add(Like(post_id=post_id, user_id=user_id))
-        liked = True
+        # SQLite can't run DML inside a CTE; it serialises writers, so an
+        # insert-or-nothing followed by a conditional delete in one
+        # transaction is just as race-free.
+        liked = (await session.execute(
+            sqlite_insert(Like).values(post_id=post_id, user_id=user_id)
+            .on_conflict_do_nothing(index_elements=["post_id", "user_id"])
+            .returning(Like.id)
+        )).first() is not None
+        if not liked:
+            await session.execute(
+                delete(Like).where(Like.post_id == post_id, Like.user_id == user_id)
+            )
+        count = (await session.execute(
+            update(Post)
+            .where(Post.id == post_id)
+            .values(like_count=Post.like_count + (1 if liked else -1))
+            .returning(Post.like_count)
+        )).scalar()
     await session.commit()
-    count = (await session.execute(
-        select(func.count()).select_from(Like).where(Like.post_id == post_id)
-    )).scalar()
-    return {"count": count, "user_liked": liked}
+    response_cache.purge(response_cache.post_tag(post_id))
+    bus.publish(article_topic(post_id), {"type": "likes", "like_count": count or 0})
+    return {"count": count or 0, "user_liked": liked}
 
 
 async def get_like_status(session: AsyncSession, post_id_str: str, user_id=None) -> dict:
     post_id = uuid.UUID(post_id_str)
     count = (await session.execute(
-        select(func.count()).select_from(Like).where(Like.post_id == post_id)
+        select(Post.like_count).where(Post.id == post_id)
     )).scalar()
     user_liked = False
     if user_id:
-        row = (await session.execute(
-            select(Like).where(Like.post_id == post_id, Like.user_id == user_id)
-        )).scalars().first()
-        user_liked = row is not None
-    return {"count": count, "user_liked": user_liked}
+        # Pending write-behind toggles are this user's most recent intent.
+        user_liked = like_buffer.user_state(post_id, user_id)
+        if user_liked is None:
+            row = (await session.execute(
+                select(Like).where(Like.post_id == post_id, Like.user_id == user_id)
+            )).scalars().first()
+            user_liked = row is not None
+    return {"count": (count or 0) + like_buffer.count_delta(post_id), "user_liked": user_liked}
+
+
+async def get_like_statuses(session: AsyncSession, post_ids: list[uuid.UUID], user_id=None) -> dict:
+    """Like counts and the caller's liked flags for many posts in two queries.
+
+    Keyed by post id; ids that don't exist are left out.
+    """
+    post_ids = list(dict.fromkeys(post_ids))
+    if len(post_ids) > MAX_LIKE_STATUS_BATCH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_LIKE_STATUS_BATCH} article ids per request",
+        )
+    if not post_ids:
+        return {}
+    counts = (await session.execute(
+        select(Post.id, Post.like_count).where(Post.id.in_(post_ids))
+    )).all()
+    liked = set()
+    if user_id:
+        liked = set((await session.execute(
+            select(Like.post_id).where(Like.user_id == user_id, Like.post_id.in_(post_ids))
+        )).scalars())
+    statuses = {}
+    for post_id, count in counts:
+        user_liked = like_buffer.user_state(post_id, user_id) if user_id else None
+        if user_liked is None:
+            user_liked = post_id in liked
+        statuses[str(post_id)] = {
+            "count": (count or 0) + like_buffer.count_delta(post_id),
+            "user_liked": user_liked,
+        }
+    return statuses
+
+
+async def reconcile_counters(session: AsyncSession) -> int:
+    """Recompute like_count / comment_count from the child tables; returns rows corrected."""
+    true_likes = (
+        select(func.count()).select_from(Like).where(Like.post_id == Post.id).scalar_subquery()
+    )
+    true_comments = (
+        select(func.count()).select_from(Comment).where(Comment.post_id == Post.id).scalar_subquery()
+    )
+    result = await session.execute(
+        update(Post)
+        .where((Post.like_count != true_likes) | (Post.comment_count != true_comments))
+        .values(like_count=true_likes, comment_count=true_comments)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return result.rowcount or 0
 
 
 # ── Author-scoped queries ──────────────────────────────────────────────────────
 
-async def list_author_articles(session: AsyncSession, owner_id, skip: int = 0, limit: int = 20, search: str = ""):
+async def list_author_articles(
+    session: AsyncSession,
+    owner_id,
+    skip: int = 0,
+    limit: int = 20,
+    search: str = "",
+    cursor: str | None = None,
+    include_total: bool = True,
+    estimate_total: bool = False,
+):
     count_q = select(func.count()).select_from(Post).where(Post.owner_id == owner_id)
-    rows_q = select(Post).options(*_post_opts()).where(Post.owner_id == owner_id)
+    rows_q = select(Post).options(*_list_opts()).where(Post.owner_id == owner_id)
     if search:
         pattern = f"%{search}%"
         count_q = count_q.where(Post.title.ilike(pattern))
         rows_q = rows_q.where(Post.title.ilike(pattern))
-    total = (await session.execute(count_q)).scalar() or 0
-    result = await session.execute(rows_q.order_by(Post.created_date.desc()).offset(skip).limit(limit))
-    return [_post_to_dict(p) for p in result.scalars().all()], total
-
-
-async def list_comments_for_author(session: AsyncSession, owner_id, skip: int = 0, limit: int = 50):
+    total = await count_total(
+        session, count_q, include_total=include_total, estimate=estimate_total,
+        filtered=bool(search), cache_key=f"posts:author:{owner_id}",
+    )
+    articles, cursor_out = await _fetch_post_page(session, rows_q, skip, limit, cursor)
+    return articles, total, cursor_out
+
+
+async def list_comments_for_author(
+    session: AsyncSession,
+    owner_id,
+    skip: int = 0,
+    limit: int = 50,
+    include_total: bool = True,
+    estimate_total: bool = False,
+):
     count_q = (
         select(func.count())
         .select_from(Comment)
@@ -227,7 +627,10 @@ async def list_comments_for_author(session: AsyncSession, owner_id, skip: int =
         .order_by(Comment.created_at.desc())
         .offset(skip).limit(limit)
     )
-    total = (await session.execute(count_q)).scalar() or 0
+    total = await count_total(
+        session, count_q, include_total=include_total, estimate=estimate_total,
+        cache_key=f"comments:author:{owner_id}",
+    )
     comments = (await session.execute(rows_q)).scalars().all()
     return [
         {
@@ -244,42 +647,90 @@ async def list_comments_for_author(session: AsyncSession, owner_id, skip: int =
 
 # ── Comments ───────────────────────────────────────────────────────────────────
 
-async def list_comments(session: AsyncSession, post_id_str: str) -> list:
+async def list_comments(
+    session: AsyncSession,
+    post_id_str: str,
+    limit: int = 50,
+    cursor: str | None = None,
+    before: str | None = None,
+) -> dict:
+    """One page of a post's comments, oldest first, keyset-paginated on (created_at, id).
+
+    `cursor` pages forward (newer comments), `before` pages backward; each
+    page hands back `next_cursor` / `prev_cursor` for its neighbours. The
+    total is the post's maintained comment_count, not a COUNT(*).
+    """
+    if cursor and before:
+        raise HTTPException(status_code=400, detail="Pass either cursor or before, not both")
     post_id = uuid.UUID(post_id_str)
-    result = await session.execute(
-        select(Comment)
-        .options(selectinload(Comment.author))
+    total = (await session.execute(
+        select(Post.comment_count).where(Post.id == post_id)
+    )).scalar()
+
+    # Plain columns rather than Comment entities: nothing here needs the ORM.
+    rows_q = (
+        select(Comment.id, Comment.body, Comment.created_at, User.email.label("author_email"))
+        .outerjoin(User, Comment.author_id == User.id)
         .where(Comment.post_id == post_id)
-        .order_by(Comment.created_at.asc())
+        .limit(limit + 1)
     )
-    comments = result.scalars().all()
-    return [
-        {
-            "id": str(c.id),
-            "author_email": c.author.email if c.author else "unknown",
-            "body": c.body,
-            "created_at": c.created_at,
-        }
-        for c in comments
-    ]
+    if before:
+        rows_q = rows_q.where(seek_before(Comment.created_at, Comment.id, before))
+        rows_q = rows_q.order_by(Comment.created_at.desc(), Comment.id.desc())
+    else:
+        if cursor:
+            rows_q = rows_q.where(seek_after(Comment.created_at, Comment.id, cursor))
+        rows_q = rows_q.order_by(Comment.created_at.asc(), Comment.id.asc())
+    rows = (await session.execute(rows_q)).all()
+
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if before:
+        rows.reverse()
+    first, last = (rows[0], rows[-1]) if rows else (None, None)
+    # Paging backward always leaves the `before` row after this page, and
+    # paging forward from a cursor always leaves that row before it.
+    has_next = more if not before else last is not None
+    has_prev = more if before else bool(cursor) and first is not None
+    return {
+        "comments": [
+            {
+                "id": str(c.id),
+                "author_email": c.author_email or "unknown",
+                "body": c.body,
+                "created_at": c.created_at,
+            }
+            for c in rows
+        ],
+        "total": total or 0,
+        "next_cursor": encode_cursor(last.created_at, last.id) if has_next else None,
+        "prev_cursor": encode_cursor(first.created_at, first.id) if has_prev else None,
+    }
 
 
-async def add_comment(session: AsyncSession, post_id_str: str, author_id, body: str) -> dict:
+async def add_comment(session: AsyncSession, post_id_str: str, author: User, body: str) -> dict:
     post_id = uuid.UUID(post_id_str)
-    comment = Comment(post_id=post_id, author_id=author_id, body=body)
+    comment = Comment(post_id=post_id, author_id=author.id, body=body)
     session.add(comment)
+    comment_count = (await session.execute(
+        update(Post).where(Post.id == post_id)
+        .values(comment_count=Post.comment_count + 1)
+        .returning(Post.comment_count)
+    )).scalar()
     await session.commit()
-    await session.refresh(comment)
-    result = await session.execute(
-        select(Comment).options(selectinload(Comment.author)).where(Comment.id == comment.id)
-    )
-    c = result.scalars().first()
-    return {
-        "id": str(c.id),
-        "author_email": c.author.email if c.author else "unknown",
-        "body": c.body,
-        "created_at": c.created_at,
+    response_cache.purge(response_cache.post_tag(post_id), response_cache.comments_tag(post_id))
+    # id and created_at are client-side defaults and the author is in hand.
+    added = {
+        "id": str(comment.id),
+        "author_email": author.email,
+        "body": comment.body,
+        "created_at": comment.created_at,
     }
+    bus.publish(
+        article_topic(post_id),
+        {"type": "comment_added", "comment": added, "comment_count": comment_count or 0},
+    )
+    return added
 
 
 async def delete_comment(session: AsyncSession, comment_id_str: str, user) -> dict:
@@ -291,29 +742,182 @@ async def delete_comment(session: AsyncSession, comment_id_str: str, user) -> di
     if not user.is_superuser and comment.author_id != user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
     await session.delete(comment)
+    comment_count = (await session.execute(
+        update(Post).where(Post.id == comment.post_id)
+        .values(comment_count=Post.comment_count - 1)
+        .returning(Post.comment_count)
+    )).scalar()
     await session.commit()
+    response_cache.purge(
+        response_cache.post_tag(comment.post_id), response_cache.comments_tag(comment.post_id)
+    )
+    bus.publish(
+        article_topic(comment.post_id),
+        {"type": "comment_deleted", "comment_id": str(comment_id), "comment_count": comment_count or 0},
+    )
     return {"success": True}
 
 
+# ── Live updates (SSE) ─────────────────────────────────────────────────────────
+
+async def open_article_stream(post_id_str: str) -> AsyncIterator[str]:
+    """Subscribe to a post's live updates; returns the SSE body iterator.
+
+    404s before anything is streamed. The database is only touched for the
+    opening snapshot, so an open stream holds no connection.
+    """
+    post_id = uuid.UUID(post_id_str)
+    # Subscribe first so nothing published between the snapshot and the
+    # subscription is missed; a duplicate count update is harmless.
+    sub = broker.subscribe(article_topic(post_id))
+    try:
+        async with async_session_maker() as session:
+            row = (await session.execute(
+                select(Post.like_count, Post.comment_count).where(Post.id == post_id)
+            )).first()
+    except BaseException:
+        broker.unsubscribe(sub)
+        raise
+    if row is None:
+        broker.unsubscribe(sub)
+        raise HTTPException(status_code=404, detail="Article not found")
+    snapshot = {
+        "like_count": row.like_count + like_buffer.count_delta(post_id),
+        "comment_count": row.comment_count,
+    }
+    return _article_stream(sub, snapshot)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data), separators=(',', ':'))}\n\n"
+
+
+async def _article_stream(sub: Subscription, snapshot: dict) -> AsyncIterator[str]:
+    interval = SSE_COALESCE_MS / 1000
+    last_sent = 0.0
+    try:
+        yield _sse("snapshot", snapshot)
+        while not sub.dropped:
+            try:
+                await asyncio.wait_for(sub.wake.wait(), SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            # At most one update per interval: the subscription keeps folding
+            # events in while this waits out the rest of the interval.
+            wait = last_sent + interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            if sub.dropped:
+                break
+            update = sub.take()
+            if update is None:
+                continue
+            yield _sse("update", update)
+            last_sent = time.monotonic()
+        # Stalled or reset: the client should refetch and reconnect.
+        yield _sse("reset", {})
+    finally:
+        broker.unsubscribe(sub)
+
+
+# ── Changes feed ───────────────────────────────────────────────────────────────
+
+def _sync_reset(token: str) -> dict:
+    return {"reset": True, "created": [], "updated": [], "deleted": [], "token": token, "has_more": False}
+
+
+async def list_changes(session: AsyncSession, since: str | None, limit: int = 500) -> dict:
+    """Public articles created, updated or removed after the sync token `since`.
+
+    Posts are walked on ix_posts_updated_at and tombstones on their
+    deleted_at index, both keyset-ordered by (timestamp, id); the token is the
+    position reached. Unpublishing counts as removal. Likes and comments move
+    counters, not updated_at, so they don't show up here.
+
+    With no token, or one older than the tombstone retention, the caller
+    gets `reset: true` and must refetch everything before syncing from the
+    returned token.
+    """
+    now = datetime.utcnow()
+    horizon = now - timedelta(seconds=SYNC_LAG_SECONDS)
+    caught_up = encode_cursor(horizon, _MAX_UUID)
+    if since is None:
+        return _sync_reset(caught_up)
+    since_at = _utc_naive(decode_cursor(since)[0])
+    if since_at < now - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+        return _sync_reset(caught_up)
+
+    posts = (await session.execute(
+        select(Post.id, Post.updated_at, Post.created_at, Post.published)
+        .where(seek_after(Post.updated_at, Post.id, since), Post.updated_at <= horizon)
+        .order_by(Post.updated_at, Post.id)
+        .limit(limit + 1)
+    )).all()
+    tombstones = (await session.execute(
+        select(PostTombstone.post_id, PostTombstone.deleted_at)
+        .where(
+            seek_after(PostTombstone.deleted_at, PostTombstone.post_id, since),
+            PostTombstone.deleted_at <= horizon,
+        )
+        .order_by(PostTombstone.deleted_at, PostTombstone.post_id)
+        .limit(limit + 1)
+    )).all()
+
+    changes = [(row.updated_at, row.id, row) for row in posts]
+    changes += [(row.deleted_at, row.post_id, None) for row in tombstones]
+    changes.sort(key=lambda change: change[:2])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    result = {"reset": False, "created": [], "updated": [], "deleted": [], "has_more": has_more}
+    for _, post_id, row in changes:
+        if row is None or not row.published:
+            result["deleted"].append(str(post_id))
+        elif _utc_naive(row.created_at) > since_at:
+            result["created"].append(str(post_id))
+        else:
+            result["updated"].append(str(post_id))
+    if has_more:
+        result["token"] = encode_cursor(*changes[-1][:2])
+    else:
+        # Never move a token backwards, e.g. when this worker's clock is behind.
+        result["token"] = caught_up if since_at <= horizon else since
+    return result
+
+
+async def prune_tombstones(session: AsyncSession) -> int:
+    """Delete tombstones past TOMBSTONE_RETENTION_DAYS; returns rows removed."""
+    cutoff = datetime.utcnow() - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+    result = await session.execute(delete(PostTombstone).where(PostTombstone.deleted_at < cutoff))
+    await session.commit()
+    return result.rowcount
+
+
 # ── Sitemap (lightweight projection for SEO crawl-wall) ────────────────────────
 
-def _iso_utc(dt: datetime) -> str:
+def _utc_naive(dt: datetime) -> datetime:
+    """Naive UTC, the form the app writes; Postgres hands timestamptz back aware."""
     if dt.tzinfo is not None:
         dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
-    return dt.replace(microsecond=0).isoformat() + "Z"
+    return dt
+
+
+def _iso_utc(dt: datetime) -> str:
+    return _utc_naive(dt).replace(microsecond=0).isoformat() + "Z"
 
 
 async def list_sitemap_entries(
     session: AsyncSession, page: int, per_page: int
 ) -> tuple[list[dict], int]:
-    base_filter = Post.published == "true"
+    base_filter = Post.published == True
 
     count_q = select(func.count()).select_from(Post).where(base_filter)
     total = (await session.execute(count_q)).scalar() or 0
 
     offset = (page - 1) * per_page
     rows_q = (
-        select(Post.id, Post.created_date)
+        select(Post.id, Post.updated_at)
         .where(base_filter)
         .order_by(Post.created_date.desc())
         .offset(offset)
@@ -322,18 +926,18 @@ async def list_sitemap_entries(
     rows = (await session.execute(rows_q)).all()
 
     items = [
-        {"id": str(row_id), "lastmod": _iso_utc(row_created)}
-        for row_id, row_created in rows
+        {"id": str(row_id), "lastmod": _iso_utc(row_updated)}
+        for row_id, row_updated in rows
     ]
     return items, total
 
 
 async def get_sitemap_meta(session: AsyncSession) -> dict:
     PER_PAGE = 5000
-    base_filter = Post.published == "true"
+    base_filter = Post.published == True
 
     row = (await session.execute(
-        select(func.count(Post.id), func.max(Post.created_date)).where(base_filter)
+        select(func.count(Post.id), func.max(Post.updated_at)).where(base_filter)
     )).one()
     total, max_dt = row[0] or 0, row[1]
 
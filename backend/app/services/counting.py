@@ -0,0 +1,68 @@
+import os
+import time
+from typing import NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# How long an exact count may be reused as the "estimated" total of an
+# unfiltered list. Estimates are allowed to lag; exact counts never are.
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "60"))
+
+_count_cache: dict[str, tuple[float, int]] = {}
+
+
+class Total(NamedTuple):
+    value: int | None
+    estimated: bool = False
+
+
+def total_fields(total: Total) -> dict:
+    return {"total": total.value, "total_estimated": total.estimated}
+
+
+async def _planner_estimate(session: AsyncSession, table: str) -> int | None:
+    """Row count from Postgres planner statistics; None when unavailable."""
+    if session.get_bind().dialect.name != "postgresql":
+        return None
+    estimate = (await session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"),
+        {"t": table},
+    )).scalar()
+    # reltuples is -1 until the table has been vacuumed / analysed once.
+    return estimate if estimate is not None and estimate >= 0 else None
+
+
+async def count_total(
+    session: AsyncSession,
+    count_q,
+    *,
+    include_total: bool = True,
+    estimate: bool = False,
+    filtered: bool = False,
+    cache_key: str | None = None,
+    table: str | None = None,
+) -> Total:
+    """Total for a list endpoint.
+
+    - include_total=False skips counting altogether.
+    - estimate=True on an unfiltered list uses planner statistics for `table`
+      (whole-table lists on Postgres) or a recently cached exact count under
+      `cache_key`. Filtered lists can't be estimated, so they fall back to an
+      exact count.
+    """
+    if not include_total:
+        return Total(None)
+    if estimate and not filtered:
+        if table:
+            value = await _planner_estimate(session, table)
+            if value is not None:
+                return Total(value, estimated=True)
+        if cache_key:
+            hit = _count_cache.get(cache_key)
+            if hit and time.monotonic() - hit[0] < COUNT_CACHE_TTL:
+                return Total(hit[1], estimated=True)
+    value = (await session.execute(count_q)).scalar() or 0
+    if cache_key and not filtered:
+        _count_cache[cache_key] = (time.monotonic(), value)
+    return Total(value)
@@ -0,0 +1,286 @@
+"""Helpers for the Editor.js JSON stored in Post.content.
+
+Everything the listings need (excerpt, cover image, reading time) and the
+article's heading outline are derived here once, on write, so reads can leave
+the full document deferred.
+render_document() produces the body markup the article page displays, falling
+back to the raw text in a <pre> for bodies that aren't JSON.
+"""
+import html
+import json
+import math
+import re
+
+EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _blocks_of(doc) -> list[dict]:
+    blocks = doc.get("blocks") if isinstance(doc, dict) else None
+    return [b for b in blocks or [] if isinstance(b, dict)]
+
+
+def parse_blocks(content: str | None) -> list[dict]:
+    try:
+        return _blocks_of(json.loads(content or ""))
+    except ValueError:
+        return []
+
+
+def strip_tags(text: str | None) -> str:
+    return html.unescape(_TAG_RE.sub("", text or ""))
+
+
+def _list_item_texts(items) -> list[str]:
+    # Editor.js List v2 nests {content, items}; v1 stores plain strings.
+    out = []
+    for item in items or []:
+        if isinstance(item, str):
+            out.append(item)
+        elif isinstance(item, dict):
+            out.append(item.get("content") or "")
+            out.extend(_list_item_texts(item.get("items")))
+    return out
+
+
+def block_text(block: dict) -> str:
+    """Plain text of one block, tags stripped; empty for non-textual blocks."""
+    data = block.get("data") or {}
+    kind = block.get("type")
+    if kind in ("paragraph", "header"):
+        parts = [data.get("text")]
+    elif kind == "list":
+        parts = _list_item_texts(data.get("items"))
+    elif kind == "checklist":
+        parts = [i.get("text") for i in data.get("items") or [] if isinstance(i, dict)]
+    elif kind == "quote":
+        parts = [data.get("text"), data.get("caption")]
+    elif kind == "warning":
+        parts = [data.get("title"), data.get("message")]
+    elif kind == "alert":
+        parts = [data.get("message")]
+    elif kind == "table":
+        parts = [cell for row in data.get("content") or [] for cell in row or []]
+    else:
+        return ""
+    return " ".join(strip_tags(p).strip() for p in parts if p)
+
+
+def plain_text(blocks: list[dict]) -> str:
+    return "\n".join(t for t in (block_text(b) for b in blocks) if t)
+
+
+def summarize(content: str | None) -> dict:
+    """Listing projection for a document: excerpt, cover_image, word_count, reading_time."""
+    blocks = parse_blocks(content)
+    first_para = next((b for b in blocks if b.get("type") == "paragraph"), None)
+    excerpt = block_text(first_para).strip() if first_para else ""
+    if len(excerpt) > EXCERPT_LENGTH:
+        excerpt = excerpt[:EXCERPT_LENGTH].rsplit(" ", 1)[0] + "…"
+    cover = next((b for b in blocks if b.get("type") == "simpleImage"), None)
+    # Reading time counts the same block types the frontend always has.
+    word_count = sum(
+        len(block_text(b).split())
+        for b in blocks
+        if b.get("type") in ("paragraph", "header", "list")
+    )
+    return {
+        "excerpt": excerpt,
+        "cover_image": (cover.get("data") or {}).get("url") if cover else None,
+        "word_count": word_count,
+        "reading_time": max(1, math.ceil(word_count / WORDS_PER_MINUTE)),
+    }
+
+
+def table_of_contents(content: str | None) -> list[dict]:
+    """Heading outline of a document: level, plain text and anchor id per header block."""
+    return [
+        {
+            "level": (b.get("data") or {}).get("level"),
+            "text": block_text(b).strip(),
+            "id": heading_id((b.get("data") or {}).get("text"), i),
+        }
+        for i, b in enumerate(parse_blocks(content))
+        if b.get("type") == "header"
+    ]
+
+
+# ── HTML rendering ─────────────────────────────────────────────────────────────
+# The article page (frontend/app/(blog)/article/[articleId]/page.js) shows
+# this markup as-is; its CSS targets these classes, and the header ids are
+# the anchors listed in Post.toc. Inline text fields are Editor.js inline
+# HTML and pass through as the editor wrote them; plain-text fields (code,
+# captions, URLs) are escaped.
+#
+# Bump RENDER_VERSION whenever the markup changes: it is part of the rendered
+# cache key and the HTML ETag, so older renders are not served again.
+
+RENDER_VERSION = 2
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _attr(value) -> str:
+    return html.escape(str(value if value is not None else ""), quote=True)
+
+
+def _text(value) -> str:
+    return html.escape(str(value if value is not None else ""), quote=False)
+
+
+def _inline(value) -> str:
+    return value if isinstance(value, str) else ""
+
+
+def heading_id(text: str | None, index: int) -> str:
+    """Anchor id of the header block at `index` (as the frontend's slugify builds it)."""
+    slug = _SLUG_RE.sub("-", _TAG_RE.sub("", text or "").lower()).strip("-")
+    return f"h-{slug}-{index}"
+
+
+def _render_list_items(items, tag: str) -> str:
+    # Nested lists share the style of the list block they belong to.
+    out = []
+    for item in items or []:
+        if isinstance(item, str):
+            out.append(f"<li>{item}</li>")
+        elif isinstance(item, dict):
+            nested = item.get("items")
+            inner = f"<{tag}>{_render_list_items(nested, tag)}</{tag}>" if nested else ""
+            out.append(f"<li>{_inline(item.get('content'))}{inner}</li>")
+    return "".join(out)
+
+
+def _header(data: dict, index: int) -> str:
+    level = data.get("level")
+    level = level if level in (1, 2, 3, 4, 5, 6) else 2
+    text = _inline(data.get("text"))
+    return f'<h{level} id="{_attr(heading_id(text, index))}" class="formatting-header">{text}</h{level}>'
+
+
+def _paragraph(data: dict, index: int) -> str:
+    return f'<p class="formatting-paragraph">{_inline(data.get("text"))}</p>'
+
+
+def _list(data: dict, index: int) -> str:
+    if data.get("style") == "ordered":
+        tag, cls = "ol", "formatting-list-ordered"
+    else:
+        tag, cls = "ul", "formatting-list-unordered"
+    return f'<{tag} class="{cls}">{_render_list_items(data.get("items"), tag)}</{tag}>'
+
+
+def _checklist(data: dict, index: int) -> str:
+    items = []
+    for item in data.get("items") or []:
+        if not isinstance(item, dict):
+            continue
+        checked = bool(item.get("checked"))
+        items.append(
+            f'<li class="formatting-checklist-item{" checked" if checked else ""}">'
+            f'<input type="checkbox"{" checked" if checked else ""} disabled />'
+            f"<span>{_inline(item.get('text'))}</span></li>"
+        )
+    return f'<ul class="formatting-checklist">{"".join(items)}</ul>'
+
+
+def _quote(data: dict, index: int) -> str:
+    caption = data.get("caption")
+    cite = f"<cite>{_text(caption)}</cite>" if caption else ""
+    return f'<blockquote class="formatting-quote"><p>{_inline(data.get("text"))}</p>{cite}</blockquote>'
+
+
+def _code(data: dict, index: int) -> str:
+    return f'<pre class="formatting-code"><code>{_text(data.get("code"))}</code></pre>'
+
+
+def _delimiter(data: dict, index: int) -> str:
+    return '<hr class="formatting-delimiter" />'
+
+
+def _warning(data: dict, index: int) -> str:
+    title = data.get("title")
+    strong = f"<strong>{_inline(title)}</strong>" if title else ""
+    return f'<div role="alert" class="formatting-warning">{strong}<p>{_inline(data.get("message"))}</p></div>'
+
+
+def _alert(data: dict, index: int) -> str:
+    kind = _attr(data.get("type") or "info")
+    align = _attr(data.get("align") or "left")
+    return (
+        f'<div role="alert" class="formatting-alert formatting-alert--{kind}" '
+        f'style="text-align: {align}">{_inline(data.get("message"))}</div>'
+    )
+
+
+def _table(data: dict, index: int) -> str:
+    rows = [row for row in data.get("content") or [] if isinstance(row, list)]
+    head = ""
+    if data.get("withHeadings") and rows:
+        head = "<thead><tr>" + "".join(f"<th>{_inline(c)}</th>" for c in rows[0]) + "</tr></thead>"
+        rows = rows[1:]
+    body = "".join("<tr>" + "".join(f"<td>{_inline(c)}</td>" for c in row) + "</tr>" for row in rows)
+    return f'<table class="formatting-table">{head}<tbody>{body}</tbody></table>'
+
+
+def _embed(data: dict, index: int) -> str:
+    caption = data.get("caption")
+    figcaption = f"<figcaption>{_text(caption)}</figcaption>" if caption else ""
+    size = "".join(f' {k}="{_attr(data[k])}"' for k in ("width", "height") if data.get(k) is not None)
+    return (
+        f'<figure class="embed-block"><iframe src="{_attr(data.get("embed"))}"{size} allowfullscreen '
+        f'title="{_attr(caption or "Embedded content")}"></iframe>{figcaption}</figure>'
+    )
+
+
+def _simple_image(data: dict, index: int) -> str:
+    caption = data.get("caption")
+    figcaption = f"<figcaption>{_text(caption)}</figcaption>" if caption else ""
+    return (
+        f'<figure class="image-block"><img src="{_attr(data.get("url"))}" alt="{_attr(caption)}" />'
+        f"{figcaption}</figure>"
+    )
+
+
+def _raw(data: dict, index: int) -> str:
+    return f'<div class="formatting-raw">{_inline(data.get("html"))}</div>'
+
+
+_RENDERERS = {
+    "header": _header,
+    "paragraph": _paragraph,
+    "list": _list,
+    "checklist": _checklist,
+    "quote": _quote,
+    "code": _code,
+    "delimiter": _delimiter,
+    "warning": _warning,
+    "alert": _alert,
+    "table": _table,
+    "embed": _embed,
+    "simpleImage": _simple_image,
+    "raw": _raw,
+}
+
+
+def render_html(blocks: list[dict]) -> str:
+    """HTML for a parsed document; unknown block types render nothing, as on the page."""
+    out = []
+    for index, block in enumerate(blocks):
+        render = _RENDERERS.get(block.get("type"))
+        data = block.get("data")
+        if render and isinstance(data, dict):
+            out.append(render(data, index))
+    return "\n".join(out)
+
+
+def render_document(content: str | None) -> str:
+    """render_html for a stored body; content that isn't JSON is shown verbatim in a <pre>."""
+    if not content:
+        return ""
+    try:
+        doc = json.loads(content)
+    except ValueError:
+        return f"<pre>{_text(content)}</pre>"
+    return render_html(_blocks_of(doc))
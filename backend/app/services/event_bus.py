@@ -0,0 +1,276 @@
+"""Cross-worker event bus.
+
+With more than one uvicorn worker, anything a worker keeps in memory (the
+public config cache, SSE subscriptions) only hears about writes made by that
+same worker. Writers therefore publish through `bus` instead: the event is
+delivered to this worker's handlers immediately and, if a transport is
+configured, forwarded to every other worker, whose handlers get the same
+(topic, event) pair.
+
+EVENT_BUS picks the transport:
+
+- "postgres": LISTEN/NOTIFY on one long-lived pooled connection.
+- "sqlite": an append-only `bus_events` table that each worker polls every
+  EVENT_POLL_MS. Meant for multi-worker dev runs against a SQLite file.
+- "local": no transport; correct only with a single worker.
+- "auto" (default): postgres on Postgres; on SQLite, polling when
+  WEB_CONCURRENCY > 1 and local otherwise.
+
+Delivery is best-effort. Events are sent after the write has committed, by a
+background task, so publishing never blocks a request or counts against its
+query budget. When a worker may have missed events (the listener connection
+dropped, or an event was too large to forward), each handler receives
+RESET for the prefix it registered and must treat everything under it as
+stale.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+
+from app.database.db import engine
+
+EVENT_BUS = os.getenv("EVENT_BUS", "auto").lower()
+EVENT_POLL_MS = int(os.getenv("EVENT_POLL_MS", "250"))
+EVENT_RETENTION_SECONDS = 60
+OUTBOX_SIZE = 1000
+
+PG_CHANNEL = "blog_events"
+# NOTIFY payloads are capped at 8000 bytes by Postgres.
+NOTIFY_MAX_BYTES = 7900
+
+RESET = {"type": "reset"}
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, dict], None]
+
+
+def _transport_name(dialect: str) -> str:
+    if EVENT_BUS != "auto":
+        return EVENT_BUS
+    if dialect == "postgresql":
+        return "postgres"
+    return "sqlite" if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 else "local"
+
+
+class EventBus:
+    def __init__(self) -> None:
+        self.origin = uuid.uuid4().hex
+        self._handlers: list[tuple[str, Handler]] = []
+        self._outbox: asyncio.Queue[tuple[str, dict]] = asyncio.Queue(OUTBOX_SIZE)
+        self._transport: _PostgresTransport | _SQLiteTransport | None = None
+        self._sender: asyncio.Task | None = None
+
+    def on(self, prefix: str, handler: Handler) -> None:
+        """Call `handler(topic, event)` for every event whose topic starts with `prefix`."""
+        self._handlers.append((prefix, handler))
+
+    def publish(self, topic: str, event: dict) -> None:
+        """Deliver to this worker now and queue for the others; never blocks."""
+        self._deliver(topic, event)
+        if self._transport is None:
+            return
+        try:
+            self._outbox.put_nowait((topic, event))
+        except asyncio.QueueFull:
+            logger.warning("Event bus outbox full; dropping event for %s", topic)
+
+    def _deliver(self, topic: str, event: dict) -> None:
+        for prefix, handler in self._handlers:
+            if topic.startswith(prefix):
+                try:
+                    handler(topic, event)
+                except Exception:
+                    logger.exception("Event handler for %s failed", topic)
+
+    def _receive(self, payload: str) -> None:
+        message = json.loads(payload)
+        if message["o"] != self.origin:
+            self._deliver(message["t"], message["e"])
+
+    def _gap(self) -> None:
+        """Events may have been missed: tell every handler its prefix is stale."""
+        for prefix, handler in self._handlers:
+            try:
+                handler(prefix, RESET)
+            except Exception:
+                logger.exception("Event handler for %s failed", prefix)
+
+    def _encode(self, topic: str, event: dict) -> str:
+        return json.dumps(
+            {"o": self.origin, "t": topic, "e": jsonable_encoder(event)}, separators=(",", ":")
+        )
+
+    # ── Lifecycle ──────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        name = _transport_name(engine.dialect.name)
+        if name == "local" or self._transport is not None:
+            return
+        if name == "postgres":
+            self._transport = _PostgresTransport(self._receive, self._gap)
+        elif name == "sqlite":
+            self._transport = _SQLiteTransport(self._receive)
+        else:
+            raise ValueError(f"Unknown EVENT_BUS transport: {name!r}")
+        await self._transport.start()
+        self._sender = asyncio.create_task(self._send_loop())
+
+    async def stop(self) -> None:
+        if self._transport is None:
+            return
+        self._sender.cancel()
+        try:
+            await self._sender
+        except asyncio.CancelledError:
+            pass
+        await self._send([])
+        await self._transport.stop()
+        self._transport = self._sender = None
+
+    async def _send_loop(self) -> None:
+        while True:
+            await self._send([await self._outbox.get()])
+
+    async def _send(self, batch: list[tuple[str, dict]]) -> None:
+        """Forward `batch` plus everything queued behind it in one round trip."""
+        while not self._outbox.empty():
+            batch.append(self._outbox.get_nowait())
+        if not batch:
+            return
+        try:
+            await self._transport.send([self._encode(topic, event) for topic, event in batch])
+        except Exception:
+            logger.exception("Event bus send failed; %d event(s) not forwarded", len(batch))
+
+
+class _PostgresTransport:
+    def __init__(self, receive: Callable[[str], None], gap: Callable[[], None]) -> None:
+        self._receive = receive
+        self._gap = gap
+        self._conn = None
+        self._watchdog: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        await self._listen()
+        self._watchdog = asyncio.create_task(self._watch())
+
+    async def _listen(self) -> None:
+        # A pooled connection, so it gets the engine's SSL and timeout settings.
+        self._conn = await engine.connect()
+        raw = (await self._conn.get_raw_connection()).driver_connection
+        await raw.add_listener(PG_CHANNEL, self._on_notify)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self._receive(payload)
+
+    async def _watch(self) -> None:
+        # Reconnect a dropped listener; anything sent meanwhile is lost.
+        while True:
+            await asyncio.sleep(5)
+            if await self._alive():
+                continue
+            logger.warning("Event bus listener connection lost; reconnecting")
+            try:
+                await self._conn.invalidate()
+                await self._conn.close()
+                await self._listen()
+            except Exception:
+                logger.exception("Event bus reconnect failed")
+                continue
+            self._gap()
+
+    async def _alive(self) -> bool:
+        try:
+            raw = (await self._conn.get_raw_connection()).driver_connection
+        except Exception:
+            return False
+        return not raw.is_closed()
+
+    async def send(self, payloads: list[str]) -> None:
+        raw = (await self._conn.get_raw_connection()).driver_connection
+        rows = []
+        for payload in payloads:
+            if len(payload.encode()) > NOTIFY_MAX_BYTES:
+                message = json.loads(payload)
+                message["e"] = RESET
+                payload = json.dumps(message, separators=(",", ":"))
+            rows.append((PG_CHANNEL, payload))
+        await raw.executemany("SELECT pg_notify($1, $2)", rows)
+
+    async def stop(self) -> None:
+        self._watchdog.cancel()
+        try:
+            await self._watchdog
+        except asyncio.CancelledError:
+            pass
+        await self._conn.close()
+
+
+class _SQLiteTransport:
+    DDL = (
+        "CREATE TABLE IF NOT EXISTS bus_events ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, created_at REAL NOT NULL, payload TEXT NOT NULL)"
+    )
+
+    def __init__(self, receive: Callable[[str], None]) -> None:
+        self._receive = receive
+        self._last_id = 0
+        self._poller: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        async with engine.begin() as conn:
+            await conn.execute(text(self.DDL))
+            self._last_id = (await conn.execute(
+                text("SELECT coalesce(max(id), 0) FROM bus_events")
+            )).scalar()
+        self._poller = asyncio.create_task(self._poll_loop())
+
+    async def _poll_loop(self) -> None:
+        last_prune = time.time()
+        while True:
+            await asyncio.sleep(EVENT_POLL_MS / 1000)
+            try:
+                async with engine.connect() as conn:
+                    rows = (await conn.execute(
+                        text("SELECT id, payload FROM bus_events WHERE id > :last ORDER BY id"),
+                        {"last": self._last_id},
+                    )).all()
+                    if time.time() - last_prune > EVENT_RETENTION_SECONDS:
+                        await conn.execute(
+                            text("DELETE FROM bus_events WHERE created_at < :cutoff"),
+                            {"cutoff": time.time() - EVENT_RETENTION_SECONDS},
+                        )
+                        await conn.commit()
+                        last_prune = time.time()
+            except Exception:
+                logger.exception("Event bus poll failed")
+                continue
+            for row in rows:
+                self._last_id = row.id
+                self._receive(row.payload)
+
+    async def send(self, payloads: list[str]) -> None:
+        now = time.time()
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("INSERT INTO bus_events (created_at, payload) VALUES (:created_at, :payload)"),
+                [{"created_at": now, "payload": p} for p in payloads],
+            )
+
+    async def stop(self) -> None:
+        self._poller.cancel()
+        try:
+            await self._poller
+        except asyncio.CancelledError:
+            pass
+
+
+bus = EventBus()
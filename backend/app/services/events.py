@@ -0,0 +1,129 @@
+"""In-process pub/sub for live article updates.
+
+Writers publish small dicts to a topic (one per article) on the event bus
+after they commit, which hands them to the broker of every worker. Each SSE
+connection holds a Subscription that folds events into one pending update as
+they arrive: the latest counters plus the net comments added and deleted.
+Publishing sets the subscription's `wake` event, and the stream takes the
+folded update at most once per interval, so a burst of events on a busy post
+costs each subscriber one message, not a queue entry per event.
+
+Only a stalled subscriber is dropped: one whose pending update has gone
+untaken for EVENT_STALL_SECONDS (its stream is stuck writing to a slow
+client) or has grown past EVENT_MAX_PENDING comment changes. It is marked
+`dropped`, removed from the topic, and its stream tells the client to
+refetch and reconnect.
+"""
+import asyncio
+import os
+import time
+
+from app.services.event_bus import RESET, bus
+
+EVENT_STALL_SECONDS = float(os.getenv("EVENT_STALL_SECONDS", "30"))
+EVENT_MAX_PENDING = int(os.getenv("EVENT_MAX_PENDING", "1000"))
+
+_COUNTERS = ("like_count", "comment_count")
+
+
+def article_topic(post_id) -> str:
+    return f"article:{post_id}"
+
+
+class Subscription:
+    def __init__(self, topic: str) -> None:
+        self.topic = topic
+        self.wake = asyncio.Event()
+        self.dropped = False
+        self._counters: dict[str, int] = {}
+        self._added: dict[str, dict] = {}
+        self._deleted: list[str] = []
+        self._pending_since: float | None = None
+
+    def push(self, event: dict) -> None:
+        """Fold `event` into the pending update: latest counts, net comment changes."""
+        for counter in _COUNTERS:
+            if counter in event:
+                self._counters[counter] = event[counter]
+        if event["type"] == "comment_added":
+            self._added[event["comment"]["id"]] = event["comment"]
+        elif event["type"] == "comment_deleted":
+            # A comment added and deleted within one interval never shows up.
+            if self._added.pop(event["comment_id"], None) is None:
+                self._deleted.append(event["comment_id"])
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+        self.wake.set()
+
+    def stalled(self, now: float) -> bool:
+        if self._pending_since is None:
+            return False
+        return (
+            now - self._pending_since > EVENT_STALL_SECONDS
+            or len(self._added) + len(self._deleted) > EVENT_MAX_PENDING
+        )
+
+    def take(self) -> dict | None:
+        """The folded update since the last take, or None if nothing happened."""
+        self.wake.clear()
+        if self._pending_since is None:
+            return None
+        update = {
+            **self._counters,
+            "comments_added": list(self._added.values()),
+            "comments_deleted": self._deleted,
+        }
+        self._counters, self._added, self._deleted = {}, {}, []
+        self._pending_since = None
+        return update
+
+
+class Broker:
+    def __init__(self) -> None:
+        self._topics: dict[str, set[Subscription]] = {}
+
+    def subscribe(self, topic: str) -> Subscription:
+        sub = Subscription(topic)
+        self._topics.setdefault(topic, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        subs = self._topics.get(sub.topic)
+        if subs is None:
+            return
+        subs.discard(sub)
+        if not subs:
+            del self._topics[sub.topic]
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._topics.get(topic, ()))
+
+    def publish(self, topic: str, event: dict) -> None:
+        """Fold `event` into this process's subscribers; never blocks."""
+        now = time.monotonic()
+        for sub in list(self._topics.get(topic, ())):
+            sub.push(event)
+            if sub.stalled(now):
+                self._drop(sub)
+
+    def reset(self, prefix: str) -> None:
+        """Drop every subscriber under `prefix`; their streams ask clients to refetch."""
+        for topic in [t for t in self._topics if t.startswith(prefix)]:
+            for sub in list(self._topics[topic]):
+                self._drop(sub)
+
+    def _drop(self, sub: Subscription) -> None:
+        sub.dropped = True
+        self.unsubscribe(sub)
+        sub.wake.set()
+
+    def receive(self, topic: str, event: dict) -> None:
+        """Event bus handler for article topics."""
+        if event == RESET:
+            self.reset(topic)
+        else:
+            self.publish(topic, event)
+
+
+broker = Broker()
+bus.on("article:", broker.receive)
@@ -0,0 +1,252 @@
+"""Write-behind buffer for like toggles.
+
+Enabled by LIKE_FLUSH_MS > 0. toggle_like then records the caller's intent
+in memory instead of writing `likes` and the posts row per click; a
+background task flushes every LIKE_FLUSH_MS milliseconds, coalescing all
+toggles of the same (post, user) into at most one INSERT or DELETE and each
+post's counter into one UPDATE, in a single transaction per batch.
+
+Intents are kept as (baseline, desired) per (post_id, user_id): baseline is
+what the database held when the intent was first recorded. An even number of
+toggles cancels out and never reaches the database. get_like_status merges
+pending and in-flight intents over the stored rows, so a user sees their own
+like immediately on this worker; other workers see it after the flush.
+
+The buffer is process-local and drained by the FastAPI lifespan on shutdown.
+A hard crash loses at most one interval of likes; `python -m app.cli
+reconcile-counters` repairs like_count from the likes table either way.
+
+Because intents live in one process, the buffer only works with a single
+worker: with WEB_CONCURRENCY > 1 a toggle routed to another worker would read
+the stored state instead of the pending one and record the opposite intent.
+LIKE_FLUSH_MS is therefore ignored (likes are written directly) whenever more
+than one worker is configured.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from collections import Counter, defaultdict
+
+from fastapi import HTTPException
+from sqlalchemy import bindparam, delete, exists, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.db import Like, Post, User, async_session_maker
+from app.services import response_cache
+
+LIKE_FLUSH_MS = int(os.getenv("LIKE_FLUSH_MS", "0"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+FLUSH_CHUNK_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+Key = tuple[uuid.UUID, uuid.UUID]
+
+
+def _delta(baseline: bool, desired: bool) -> int:
+    return int(desired) - int(baseline)
+
+
+class _Batch:
+    """Coalesced intents plus a running per-post counter delta."""
+
+    def __init__(self) -> None:
+        self.intents: dict[Key, tuple[bool, bool]] = {}
+        self.deltas: defaultdict[uuid.UUID, int] = defaultdict(int)
+
+    def __bool__(self) -> bool:
+        return bool(self.intents)
+
+    def state(self, key: Key) -> bool | None:
+        intent = self.intents.get(key)
+        return intent[1] if intent else None
+
+    def baseline(self, key: Key) -> bool | None:
+        intent = self.intents.get(key)
+        return intent[0] if intent else None
+
+    def put(self, key: Key, baseline: bool, desired: bool) -> None:
+        old = self.intents.pop(key, None)
+        if old:
+            self.deltas[key[0]] -= _delta(*old)
+        if desired != baseline:
+            self.intents[key] = (baseline, desired)
+            self.deltas[key[0]] += _delta(baseline, desired)
+
+
+class LikeBuffer:
+    def __init__(self, interval_ms: int) -> None:
+        self.interval = interval_ms / 1000
+        self._pending = _Batch()
+        self._inflight = _Batch()
+        # Users deleted while a flush held their intents; _requeue drops them.
+        self._forgotten: set = set()
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    # ── Reads ──────────────────────────────────────────────────────────────────
+
+    def user_state(self, post_id: uuid.UUID, user_id) -> bool | None:
+        """The user's buffered like state, or None if the database is authoritative."""
+        key = (post_id, user_id)
+        state = self._pending.state(key)
+        return state if state is not None else self._inflight.state(key)
+
+    def count_delta(self, post_id: uuid.UUID) -> int:
+        return self._pending.deltas.get(post_id, 0) + self._inflight.deltas.get(post_id, 0)
+
+    # ── Writes ─────────────────────────────────────────────────────────────────
+
+    async def toggle(self, session: AsyncSession, post_id: uuid.UUID, user_id) -> dict:
+        row = (await session.execute(
+            select(
+                Post.like_count,
+                exists().where(Like.post_id == post_id, Like.user_id == user_id),
+            ).where(Post.id == post_id)
+        )).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Article not found")
+        stored_count, stored_liked = row
+
+        # Re-read the buffer after the await: another toggle may have landed.
+        key = (post_id, user_id)
+        current = self.user_state(post_id, user_id)
+        if current is None:
+            current = stored_liked
+        baseline = self._pending.baseline(key)
+        if baseline is None:
+            inflight = self._inflight.state(key)
+            baseline = inflight if inflight is not None else stored_liked
+        self._pending.put(key, baseline, not current)
+        return {"count": stored_count + self.count_delta(post_id), "user_liked": not current}
+
+    async def flush(self) -> int:
+        """Write every pending intent in one transaction; returns intents flushed."""
+        if not self._pending or self._inflight:
+            return 0
+        batch, self._pending = self._pending, _Batch()
+        self._inflight = batch
+        try:
+            async with async_session_maker() as session:
+                changed = await _apply(session, batch.intents)
+                await session.commit()
+        except Exception:
+            logger.exception("Like buffer flush failed; %d intent(s) re-queued", len(batch.intents))
+            self._requeue(batch)
+            return 0
+        finally:
+            self._inflight = _Batch()
+            self._forgotten.clear()
+        # Cached responses show the stored counter, which only moves here.
+        response_cache.purge(*(response_cache.post_tag(post_id) for post_id in changed))
+        return len(batch.intents)
+
+    def forget_user(self, user_id) -> None:
+        """Drop the pending intents of a user who is being deleted.
+
+        Intents already in flight can't be withdrawn; if that flush fails they
+        are discarded instead of re-queued.
+        """
+        for key in [key for key in self._pending.intents if key[1] == user_id]:
+            baseline = self._pending.baseline(key)
+            self._pending.put(key, baseline, baseline)
+        if any(key[1] == user_id for key in self._inflight.intents):
+            self._forgotten.add(user_id)
+
+    def _requeue(self, failed: _Batch) -> None:
+        # Newer intents win, but their baseline was the failed batch's target
+        # state, which never reached the database.
+        for key, (baseline, desired) in failed.intents.items():
+            if key[1] in self._forgotten:
+                continue
+            newer = self._pending.state(key)
+            self._pending.put(key, baseline, desired if newer is None else newer)
+
+    # ── Lifecycle ──────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self.enabled and WEB_CONCURRENCY > 1:
+            logger.warning(
+                "LIKE_FLUSH_MS=%d ignored: the like buffer is per process and "
+                "WEB_CONCURRENCY=%d; writing likes directly",
+                int(self.interval * 1000), WEB_CONCURRENCY,
+            )
+            self.interval = 0
+        if self.enabled and self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and drain whatever is still buffered."""
+        if self._task is not None:
+            # Signalled rather than cancelled, so a flush already in progress
+            # commits instead of being torn down halfway.
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+
+async def _apply(session: AsyncSession, intents: dict[Key, tuple[bool, bool]]) -> list[uuid.UUID]:
+    """Write `intents`; returns the ids of posts whose like_count changed.
+
+    Intents for posts or users deleted since they were recorded are skipped,
+    so one stale key can't fail (and endlessly re-queue) the whole batch.
+    """
+    post_ids = list({post_id for post_id, _ in intents})
+    user_ids = list({user_id for _, user_id in intents})
+    live_posts = set((await session.execute(select(Post.id).where(Post.id.in_(post_ids)))).scalars())
+    live_users = set((await session.execute(select(User.id).where(User.id.in_(user_ids)))).scalars())
+    live = {key: desired for key, (_, desired) in intents.items() if key[0] in live_posts and key[1] in live_users}
+    likes = [key for key, desired in live.items() if desired]
+    unlikes = [key for key, desired in live.items() if not desired]
+
+    # Count what actually changed rather than trusting the intents: rows may
+    # have been written meanwhile by another worker or the unbuffered path.
+    changed: Counter[uuid.UUID] = Counter()
+    insert = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    for i in range(0, len(likes), FLUSH_CHUNK_SIZE):
+        chunk = likes[i:i + FLUSH_CHUNK_SIZE]
+        inserted = await session.execute(
+            insert(Like)
+            .values([{"post_id": p, "user_id": u} for p, u in chunk])
+            .on_conflict_do_nothing(index_elements=["post_id", "user_id"])
+            .returning(Like.post_id)
+        )
+        changed.update(inserted.scalars())
+    for i in range(0, len(unlikes), FLUSH_CHUNK_SIZE):
+        chunk = unlikes[i:i + FLUSH_CHUNK_SIZE]
+        deleted = await session.execute(
+            delete(Like).where(tuple_(Like.post_id, Like.user_id).in_(chunk)).returning(Like.post_id)
+        )
+        changed.subtract(deleted.scalars())
+
+    counters = [{"pid": pid, "delta": n} for pid, n in sorted(changed.items()) if n]
+    if counters:
+        # Sorted, so concurrent flushes from several workers lock posts in the same order.
+        posts = Post.__table__
+        await session.execute(
+            update(posts)
+            .where(posts.c.id == bindparam("pid"))
+            .values(like_count=posts.c.like_count + bindparam("delta")),
+            counters,
+        )
+    return [counter["pid"] for counter in counters]
+
+
+like_buffer = LikeBuffer(LIKE_FLUSH_MS)
@@ -0,0 +1,64 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import literal, tuple_
+
+
+# ── Keyset (cursor) pagination ─────────────────────────────────────────────────
+# Cursors are opaque to clients: a URL-safe base64 blob wrapping the sort key
+# of the last row on the previous page. Seeking with `(sort_col, id) < (d, id)`
+# lets the database walk the index straight to the next page instead of
+# counting past `skip` rows, so page 500 costs the same as page 1.
+
+def encode_cursor(sort_value: datetime, row_id) -> str:
+    payload = json.dumps({"d": sort_value.isoformat(), "id": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["d"]), uuid.UUID(payload["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Cursor for orderings with no stable seek key (e.g. ranked search results)."""
+    return base64.urlsafe_b64encode(json.dumps({"o": offset}, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = int(json.loads(base64.urlsafe_b64decode(padded.encode()))["o"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return offset
+
+
+def seek_before(sort_col, id_col, cursor: str):
+    """WHERE clause for the page after `cursor` in `ORDER BY sort_col DESC, id DESC`."""
+    sort_value, row_id = decode_cursor(cursor)
+    return tuple_(sort_col, id_col) < tuple_(literal(sort_value, sort_col.type), literal(row_id, id_col.type))
+
+
+def seek_after(sort_col, id_col, cursor: str):
+    """WHERE clause for the page after `cursor` in `ORDER BY sort_col ASC, id ASC`."""
+    sort_value, row_id = decode_cursor(cursor)
+    return tuple_(sort_col, id_col) > tuple_(literal(sort_value, sort_col.type), literal(row_id, id_col.type))
+
+
+def next_cursor(rows: list, limit: int, sort_attr: str) -> tuple[list, str | None]:
+    """Trim a `limit + 1` fetch back to `limit` rows and build the cursor for the next page."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_attr), last.id)
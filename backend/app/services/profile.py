@@ -1,7 +1,11 @@
+from datetime import datetime
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from app.database.db import UserProfile, Experience, Qualification, SchoolEducation, User
+from app.database.db import Post, UserProfile, Experience, Qualification, SchoolEducation, User
+from app.services import response_cache
+from app.services.search import reindex_author
 
 
 async def get_or_create_profile(session: AsyncSession, user_id) -> UserProfile:
@@ -13,31 +17,54 @@ async def get_or_create_profile(session: AsyncSession, user_id) -> UserProfile:
         profile = UserProfile(user_id=user_id)
         session.add(profile)
         await session.commit()
-        await session.refresh(profile)
     return profile
 
 
 async def update_basic_info(session: AsyncSession, user: User, data: dict) -> UserProfile:
     # Update user-level fields
-    if "first_name" in data:
-        user.first_name = data["first_name"]
-    if "last_name" in data:
-        user.last_name = data["last_name"]
+    names_changed = False
+    for field in ("first_name", "last_name"):
+        if field in data and data[field] != getattr(user, field):
+            setattr(user, field, data[field])
+            names_changed = True
     session.add(user)
 
-    # Update profile-level fields
-    profile = await get_or_create_profile(session, user.id)
+    # Update profile-level fields. A missing profile is created with them in
+    # the same transaction rather than committed empty first.
+    result = await session.execute(select(UserProfile).where(UserProfile.user_id == user.id))
+    profile = result.scalar_one_or_none()
+    if profile is None:
+        profile = UserProfile(user_id=user.id)
+        session.add(profile)
     profile_fields = ("bio", "contact", "location", "gender", "headline")
     for field in profile_fields:
         if field in data:
             setattr(profile, field, data[field])
-    session.add(profile)
+    if names_changed:
+        await reindex_author(session, user)
+        # Their posts show the name, so their ETags must change with it.
+        await session.execute(
+            update(Post).where(Post.owner_id == user.id).values(updated_at=datetime.utcnow()),
+            execution_options={"synchronize_session": False},
+        )
 
     await session.commit()
-    await session.refresh(profile)
+    if names_changed:
+        response_cache.purge(response_cache.author_tag(user.id))
     return profile
 
 
+async def _update_owned(session: AsyncSession, model, row_id: int, user_id, data: dict, fields: tuple):
+    """UPDATE ... RETURNING on a row the user owns; None if they own no such row."""
+    where = (model.id == row_id, model.user_id == user_id)
+    values = {field: data[field] for field in fields if field in data}
+    if not values:
+        return (await session.execute(select(model).where(*where))).scalar_one_or_none()
+    row = await session.scalar(update(model).where(*where).values(**values).returning(model))
+    await session.commit()
+    return row
+
+
 async def add_experience(session: AsyncSession, user_id, data: dict) -> Experience:
     exp = Experience(
         user_id=user_id,
@@ -48,24 +75,13 @@ async def add_experience(session: AsyncSession, user_id, data: dict) -> Experien
     )
     session.add(exp)
     await session.commit()
-    await session.refresh(exp)
     return exp
 
 
 async def update_experience(session: AsyncSession, user_id, exp_id: int, data: dict) -> Experience:
-    result = await session.execute(
-        select(Experience).where(Experience.id == exp_id, Experience.user_id == user_id)
+    return await _update_owned(
+        session, Experience, exp_id, user_id, data, ("company_name", "designation", "years", "months")
     )
-    exp = result.scalar_one_or_none()
-    if exp is None:
-        return None
-    for field in ("company_name", "designation", "years", "months"):
-        if field in data:
-            setattr(exp, field, data[field])
-    session.add(exp)
-    await session.commit()
-    await session.refresh(exp)
-    return exp
 
 
 async def delete_experience(session: AsyncSession, user_id, exp_id: int):
@@ -88,24 +104,13 @@ async def add_qualification(session: AsyncSession, user_id, data: dict) -> Quali
     )
     session.add(qual)
     await session.commit()
-    await session.refresh(qual)
     return qual
 
 
 async def update_qualification(session: AsyncSession, user_id, qual_id: int, data: dict) -> Qualification:
-    result = await session.execute(
-        select(Qualification).where(Qualification.id == qual_id, Qualification.user_id == user_id)
+    return await _update_owned(
+        session, Qualification, qual_id, user_id, data, ("institution", "degree", "field_of_study", "year")
     )
-    qual = result.scalar_one_or_none()
-    if qual is None:
-        return None
-    for field in ("institution", "degree", "field_of_study", "year"):
-        if field in data:
-            setattr(qual, field, data[field])
-    session.add(qual)
-    await session.commit()
-    await session.refresh(qual)
-    return qual
 
 
 async def delete_qualification(session: AsyncSession, user_id, qual_id: int):
@@ -135,7 +140,6 @@ async def upsert_school(session: AsyncSession, user_id, grade: str, data: dict)
             setattr(school, field, data[field])
 
     await session.commit()
-    await session.refresh(school)
     return school
 
 
@@ -152,8 +156,9 @@ async def delete_school(session: AsyncSession, user_id, school_id: int):
         await session.commit()
 
 
-async def get_full_profile(session: AsyncSession, user: User) -> dict:
-    profile = await get_or_create_profile(session, user.id)
+async def get_full_profile(session: AsyncSession, user: User, profile: UserProfile | None = None) -> dict:
+    if profile is None:
+        profile = await get_or_create_profile(session, user.id)
 
     exp_result = await session.execute(
         select(Experience).where(Experience.user_id == user.id)
@@ -0,0 +1,56 @@
+"""Process-local cache for the public site settings and active theme.
+
+Both are read on every page render and change only from the admin panel, so
+they are served from memory for up to PUBLIC_CONFIG_TTL seconds. Writers
+call invalidate() after committing, which clears this worker's cache
+immediately and every other worker's as soon as the event bus delivers it;
+the TTL only bounds staleness if that message is lost.
+
+invalidate() also bumps a version stamp. A load that started before an
+invalidation is returned to its caller but not stored, so a slow read can
+never re-populate the cache with the value an admin just replaced.
+"""
+import os
+import time
+from typing import Awaitable, Callable, NamedTuple
+
+from app.core.http_cache import compute_etag
+from app.services.event_bus import bus
+
+PUBLIC_CONFIG_TTL = float(os.getenv("PUBLIC_CONFIG_TTL", "30"))
+TOPIC = "public_config"
+
+
+class CachedConfig(NamedTuple):
+    value: dict
+    etag: str
+    version: int
+
+
+_entries: dict[str, tuple[float, CachedConfig]] = {}
+_version = 0
+
+
+def invalidate() -> None:
+    bus.publish(TOPIC, {})
+
+
+def _on_invalidate(topic: str, event: dict) -> None:
+    global _version
+    _version += 1
+    _entries.clear()
+
+
+bus.on(TOPIC, _on_invalidate)
+
+
+async def cached(key: str, loader: Callable[[], Awaitable[dict]]) -> CachedConfig:
+    hit = _entries.get(key)
+    if hit and time.monotonic() - hit[0] < PUBLIC_CONFIG_TTL:
+        return hit[1]
+    started_at = _version
+    value = await loader()
+    entry = CachedConfig(value, compute_etag(value), started_at)
+    if started_at == _version:
+        _entries[key] = (time.monotonic(), entry)
+    return entry
@@ -0,0 +1,115 @@
+"""Rendered-HTML cache for article bodies.
+
+render_article() returns editorjs.render_document() output for one version of
+a post, keyed by (post_id, updated_at, editorjs.RENDER_VERSION): any edit
+bumps updated_at and any renderer change bumps RENDER_VERSION, so stale
+renders are never looked up again and need no invalidation.
+
+Lookups go through a per-worker LRU of RENDER_CACHE_SIZE entries, then a
+directory shared by every worker (RENDER_CACHE_DIR; empty disables it) that
+survives restarts. Each post has one file there, overwritten when a newer
+version is rendered. Concurrent misses on the same version share one render.
+Documents over RENDER_INLINE_MAX_BYTES are parsed and rendered on a worker
+thread so a long post doesn't stall the event loop; disk reads and writes
+always run there.
+"""
+import asyncio
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from datetime import datetime
+
+from app.services.editorjs import RENDER_VERSION, render_document
+from app.services.single_flight import SingleFlight
+
+RENDER_CACHE_SIZE = int(os.getenv("RENDER_CACHE_SIZE", "256"))
+RENDER_CACHE_DIR = os.getenv(
+    "RENDER_CACHE_DIR", os.path.join(os.path.dirname(__file__), "..", "..", ".cache", "rendered")
+)
+RENDER_INLINE_MAX_BYTES = int(os.getenv("RENDER_INLINE_MAX_BYTES", str(32 * 1024)))
+
+logger = logging.getLogger(__name__)
+
+Key = tuple[str, str]
+
+_lru: OrderedDict[Key, str] = OrderedDict()
+_renders = SingleFlight()
+stats = {"memory_hits": 0, "disk_hits": 0, "renders": 0}
+
+
+def _version(updated_at: datetime | str) -> str:
+    stamp = updated_at.isoformat() if isinstance(updated_at, datetime) else str(updated_at)
+    return f"{stamp}/r{RENDER_VERSION}"
+
+
+def _path(post_id: str) -> str:
+    return os.path.join(RENDER_CACHE_DIR, f"{post_id}.html")
+
+
+def _read_disk(key: Key) -> str | None:
+    post_id, version = key
+    try:
+        with open(_path(post_id), encoding="utf-8") as f:
+            # First line: the version the rest of the file was rendered from.
+            if f.readline().rstrip("\n") != version:
+                return None
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _write_disk(key: Key, rendered: str) -> None:
+    post_id, version = key
+    os.makedirs(RENDER_CACHE_DIR, exist_ok=True)
+    # Write-then-rename, so another worker never reads a half-written file.
+    fd, tmp = tempfile.mkstemp(dir=RENDER_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(version + "\n" + rendered)
+        os.replace(tmp, _path(post_id))
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _remember(key: Key, rendered: str) -> None:
+    _lru[key] = rendered
+    _lru.move_to_end(key)
+    while len(_lru) > RENDER_CACHE_SIZE:
+        _lru.popitem(last=False)
+
+
+async def render_article(post_id, updated_at: datetime | str, content: str) -> str:
+    key = (str(post_id), _version(updated_at))
+    if key in _lru:
+        _lru.move_to_end(key)
+        stats["memory_hits"] += 1
+        return _lru[key]
+    return await _renders.do(key, lambda: _load(key, content))
+
+
+async def _load(key: Key, content: str) -> str:
+    if RENDER_CACHE_DIR:
+        try:
+            rendered = await asyncio.to_thread(_read_disk, key)
+        except OSError:
+            logger.exception("Reading rendered article %s failed", key[0])
+            rendered = None
+        if rendered is not None:
+            stats["disk_hits"] += 1
+            _remember(key, rendered)
+            return rendered
+
+    stats["renders"] += 1
+    if len(content) > RENDER_INLINE_MAX_BYTES:
+        rendered = await asyncio.to_thread(render_document, content)
+    else:
+        rendered = render_document(content)
+    _remember(key, rendered)
+    if RENDER_CACHE_DIR:
+        try:
+            await asyncio.to_thread(_write_disk, key, rendered)
+        except OSError:
+            logger.exception("Writing rendered article %s failed", key[0])
+    return rendered
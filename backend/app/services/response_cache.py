@@ -0,0 +1,219 @@
+"""Shared response cache for anonymous reads of public article endpoints.
+
+Anonymous visitors all get the same bytes for a given article, feed page or
+comment page, so the serialised body is kept in memory under the route's
+normalised parameters and served without touching the database. Requests
+carrying an Authorization header always bypass it.
+
+Every entry is tagged with surrogate keys naming the data it was built from:
+
+- FEED         any page of the public feed (membership or order may change)
+- post:<id>    anything showing that post's row, counters included
+- author:<id>  anything showing that user's name next to a post
+- comments:<id>  pages of that post's comments
+
+Writers call purge(...) with the keys they touched after committing; the
+purge goes out on the event bus, so every worker drops exactly the entries
+carrying those keys. It is published even with the cache disabled: other
+per-post caches (the shared article reads) listen for it too. Memory is bounded by RESPONSE_CACHE_MAX_BYTES with LRU
+eviction (0 disables the cache), and RESPONSE_CACHE_TTL caps the age of any
+entry in case a change slips past the tags.
+
+A response built while one of its keys was purged is returned but not
+stored, so a slow read can't re-cache what a write just replaced.
+
+Routes that pass `etag` get ETag/Cache-Control headers on every response,
+cached or not, and a bodiless 304 when If-None-Match already matches.
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable, Iterable, NamedTuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.http_cache import REVALIDATE, etag_matches
+from app.services.event_bus import RESET, bus
+
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+TOPIC = "response_cache"
+FEED = "feed"
+
+Loader = Callable[[], Awaitable[tuple[dict, set[str]]]]
+
+
+def post_tag(post_id) -> str:
+    return f"post:{post_id}"
+
+
+def author_tag(user_id) -> str:
+    return f"author:{user_id}"
+
+
+def comments_tag(post_id) -> str:
+    return f"comments:{post_id}"
+
+
+def article_tags(articles: Iterable[dict]) -> set[str]:
+    """Keys for a response listing `articles` (post dicts with id and owner_id)."""
+    tags = set()
+    for article in articles:
+        tags.add(post_tag(article["id"]))
+        tags.add(author_tag(article["owner_id"]))
+    return tags
+
+
+class _Entry(NamedTuple):
+    body: bytes
+    etag: str | None
+    tags: frozenset[str]
+    stored_at: float
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._by_tag: dict[str, set[Hashable]] = {}
+        self._bytes = 0
+        # Purge sequence numbers, kept only while some load is in flight.
+        self._seq = 0
+        self._purged_at: dict[str, int] = {}
+        self._cleared_at = 0
+        self._loading = 0
+        self.hits = self.misses = self.bypasses = self.evictions = self.purged = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "bypasses": self.bypasses,
+            "evictions": self.evictions,
+            "purged": self.purged,
+        }
+
+    async def serve(
+        self,
+        request: Request,
+        key: Hashable,
+        loader: Loader,
+        *,
+        etag: Callable[[dict], str] | None = None,
+    ) -> Response:
+        """The cached body for `key`, or `loader()`'s payload (cached when anonymous)."""
+        if not self.enabled or "authorization" in request.headers:
+            self.bypasses += 1
+            payload, _ = await loader()
+            return _respond(request, _encode(payload), etag and etag(payload), {})
+
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry.stored_at < self.ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _respond(request, entry.body, entry.etag, {"X-Cache": "HIT"})
+        if entry:
+            self._remove(key)
+
+        self.misses += 1
+        started_at = self._seq
+        self._loading += 1
+        try:
+            payload, tags = await loader()
+        finally:
+            self._loading -= 1
+        body, version = _encode(payload), etag and etag(payload)
+        if self._cleared_at <= started_at and not any(
+            self._purged_at.get(tag, 0) > started_at for tag in tags
+        ):
+            self._store(key, body, version, tags)
+        if not self._loading:
+            self._purged_at.clear()
+        return _respond(request, body, version, {"X-Cache": "MISS"})
+
+    def _store(self, key: Hashable, body: bytes, etag: str | None, tags: set[str]) -> None:
+        # One oversized article shouldn't flush a whole feed's worth of entries.
+        if len(body) > self.max_bytes // 8:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(body, etag, frozenset(tags), time.monotonic())
+        self._bytes += len(body)
+        for tag in tags:
+            self._by_tag.setdefault(tag, set()).add(key)
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.body)
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def _purge_local(self, tags: Iterable[str]) -> None:
+        self._seq += 1
+        for tag in tags:
+            if self._loading:
+                self._purged_at[tag] = self._seq
+            for key in list(self._by_tag.get(tag, ())):
+                self._remove(key)
+                self.purged += 1
+
+    def _clear_local(self) -> None:
+        self.purged += len(self._entries)
+        self._entries.clear()
+        self._by_tag.clear()
+        self._bytes = 0
+        self._seq += 1
+        self._cleared_at = self._seq
+
+    def on_event(self, topic: str, event: dict) -> None:
+        """Event bus handler: purges from any worker."""
+        if event == RESET or event.get("all"):
+            self._clear_local()
+        else:
+            self._purge_local(event["tags"])
+
+
+def _encode(payload: dict) -> bytes:
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def _respond(request: Request, body: bytes, etag: str | None, headers: dict[str, str]) -> Response:
+    """200 with `body`, or a bodiless 304 when the client already holds `etag`."""
+    if etag:
+        headers = {**headers, "ETag": etag, "Cache-Control": REVALIDATE}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def purge(*tags: str) -> None:
+    """Drop cached responses carrying any of `tags`, on every worker."""
+    if tags:
+        bus.publish(TOPIC, {"tags": sorted(set(tags))})
+
+
+def purge_all() -> None:
+    bus.publish(TOPIC, {"all": True})
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL)
+bus.on(TOPIC, response_cache.on_event)
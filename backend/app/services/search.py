@@ -0,0 +1,236 @@
+"""Full-text search over articles.
+
+One logical index, `post_search`, holding title, plain body text (extracted
+from the Editor.js blocks) and author name per post:
+
+- SQLite (dev): an FTS5 virtual table, ranked with bm25().
+- Postgres: a side table with a weighted, generated tsvector column behind a
+  GIN index, ranked with ts_rank_cd().
+
+The table lives outside Base.metadata because neither shape is portable; the
+Alembic migration and ensure_search_schema() create it. Rows are written in
+the same transaction as the post they describe.
+"""
+import re
+import uuid
+
+from sqlalchemy import column, delete, func, insert, literal_column, select, table, text, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+from fastapi_users_db_sqlalchemy.generics import GUID
+
+from app.database.db import Post, User
+from app.services.editorjs import parse_blocks, plain_text
+
+MAX_TERMS = 8
+SNIPPET_OPEN, SNIPPET_CLOSE = "<mark>", "</mark>"
+REINDEX_BATCH_SIZE = 500
+
+post_search = table(
+    "post_search",
+    column("post_id", GUID),
+    column("title"),
+    column("body"),
+    column("author"),
+)
+
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS post_search USING fts5("
+    "post_id UNINDEXED, title, body, author, tokenize='porter unicode61')",
+)
+
+POSTGRES_DDL = (
+    "CREATE TABLE IF NOT EXISTS post_search ("
+    " post_id uuid PRIMARY KEY REFERENCES posts(id) ON DELETE CASCADE,"
+    " title text NOT NULL DEFAULT '',"
+    " body text NOT NULL DEFAULT '',"
+    " author text NOT NULL DEFAULT '',"
+    " document tsvector GENERATED ALWAYS AS ("
+    "  setweight(to_tsvector('english', title), 'A') ||"
+    "  setweight(to_tsvector('english', author), 'B') ||"
+    "  setweight(to_tsvector('english', body), 'C')"
+    " ) STORED)",
+    "CREATE INDEX IF NOT EXISTS ix_post_search_document ON post_search USING GIN (document)",
+)
+
+
+def _is_postgres(session: AsyncSession) -> bool:
+    return session.get_bind().dialect.name == "postgresql"
+
+
+async def ensure_search_schema(conn: AsyncConnection) -> None:
+    """Create the search index if missing (dev databases built by create_all)."""
+    ddl = POSTGRES_DDL if conn.dialect.name == "postgresql" else SQLITE_DDL
+    for stmt in ddl:
+        await conn.execute(text(stmt))
+
+
+def author_name(user: User | None) -> str | None:
+    if user is None:
+        return None
+    parts = [user.first_name, user.last_name]
+    return " ".join(p for p in parts if p) or user.email
+
+
+def _terms(query: str) -> list[str]:
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+def _pg_tsquery(terms: list[str]) -> ColumnElement:
+    """AND of the terms: whole words via plainto_tsquery, the last one as a prefix.
+
+    Nothing user-supplied reaches to_tsquery's operator syntax: the prefix
+    term is a quoted lexeme, and \\w+ tokens contain no quote to escape.
+    """
+    *whole, last = terms
+    prefix = func.to_tsquery("english", f"'{last}':*")
+    if not whole:
+        return prefix
+    return func.plainto_tsquery("english", " ".join(whole)).op("&&")(prefix)
+
+
+# ── Index maintenance ──────────────────────────────────────────────────────────
+
+async def index_post(
+    session: AsyncSession, post_id, title: str, content: str, author: str | None, *, new: bool = False
+) -> None:
+    """Write the index row for a post; `new=True` skips clearing a previous row."""
+    if not new:
+        await session.execute(delete(post_search).where(post_search.c.post_id == post_id))
+    await session.execute(
+        insert(post_search).values(
+            post_id=post_id,
+            title=title or "",
+            body=plain_text(parse_blocks(content)),
+            author=author or "",
+        )
+    )
+
+
+async def update_post_text(session: AsyncSession, post_id, title: str, content: str) -> None:
+    """Refresh title and body after an edit; the author column is unchanged."""
+    await session.execute(
+        update(post_search)
+        .where(post_search.c.post_id == post_id)
+        .values(title=title or "", body=plain_text(parse_blocks(content)))
+    )
+
+
+async def remove_posts(session: AsyncSession, post_ids) -> None:
+    """Drop index rows for a list (or SELECT) of post ids."""
+    await session.execute(delete(post_search).where(post_search.c.post_id.in_(post_ids)))
+
+
+async def reindex_author(session: AsyncSession, user: User) -> None:
+    """Refresh the author column after a display-name change."""
+    await session.execute(
+        update(post_search)
+        .where(post_search.c.post_id.in_(select(Post.id).where(Post.owner_id == user.id)))
+        .values(author=author_name(user) or "")
+    )
+
+
+async def rebuild_index(session: AsyncSession) -> int:
+    """Drop and rebuild every row of the index from posts; returns posts indexed."""
+    await session.execute(delete(post_search))
+    indexed = 0
+    last_id = None
+    while True:
+        q = (
+            select(Post.id, Post.title, Post.content, User)
+            .outerjoin(User, Post.owner_id == User.id)
+            .order_by(Post.id)
+            .limit(REINDEX_BATCH_SIZE)
+        )
+        if last_id is not None:
+            q = q.where(Post.id > last_id)
+        rows = (await session.execute(q)).all()
+        if not rows:
+            break
+        await session.execute(
+            insert(post_search),
+            [
+                {
+                    "post_id": row_id,
+                    "title": title or "",
+                    "body": plain_text(parse_blocks(content)),
+                    "author": author_name(owner) or "",
+                }
+                for row_id, title, content, owner in rows
+            ],
+        )
+        indexed += len(rows)
+        last_id = rows[-1][0]
+    await session.commit()
+    return indexed
+
+
+# ── Querying ───────────────────────────────────────────────────────────────────
+
+async def search_post_ids(
+    session: AsyncSession,
+    query: str,
+    *,
+    where: ColumnElement | None = None,
+    limit: int,
+    offset: int = 0,
+    with_total: bool = True,
+) -> tuple[list[tuple[uuid.UUID, str]], int | None]:
+    """Ranked `(post_id, highlighted snippet)` pairs for `query`, plus the match count.
+
+    All terms must match; the last one is prefix-matched so results follow
+    the user's typing. `where` is an extra filter on Post (e.g. published only).
+    """
+    terms = _terms(query)
+    if not terms:
+        return [], 0
+
+    if _is_postgres(session):
+        tsq = _pg_tsquery(terms)
+        # Stop words are dropped by the parser; a query made only of them
+        # has no lexemes left and can't match anything.
+        if not await session.scalar(select(func.numnode(tsq))):
+            return [], 0
+        document = literal_column("post_search.document")
+        match = document.op("@@")(tsq)
+        rank = func.ts_rank_cd(document, tsq)
+    else:
+        *whole, last = terms
+        match = text("post_search MATCH :fts_query").bindparams(
+            fts_query=" ".join([*(f'"{t}"' for t in whole), f'"{last}"*'])
+        )
+        # Column weights: post_id, title, body, author.
+        rank = func.bm25(literal_column("post_search"), 0.0, 10.0, 1.0, 5.0)
+
+    base = select(post_search.c.post_id).join(Post, Post.id == post_search.c.post_id).where(match)
+    if where is not None:
+        base = base.where(where)
+
+    total = None
+    if with_total:
+        total = (await session.execute(
+            select(func.count()).select_from(base.subquery())
+        )).scalar() or 0
+
+    if _is_postgres(session):
+        # Rank and page first; ts_headline is only worth paying for on the page.
+        page = (
+            base.add_columns(post_search.c.body, rank.label("rank"))
+            .order_by(rank.desc(), post_search.c.post_id)
+            .limit(limit)
+            .offset(offset)
+            .subquery()
+        )
+        snippet = func.ts_headline(
+            "english", page.c.body, tsq,
+            f"StartSel={SNIPPET_OPEN}, StopSel={SNIPPET_CLOSE}, MaxWords=30, MinWords=12",
+        )
+        rows = (await session.execute(
+            select(page.c.post_id, snippet).order_by(page.c.rank.desc(), page.c.post_id)
+        )).all()
+    else:
+        snippet = func.snippet(literal_column("post_search"), -1, SNIPPET_OPEN, SNIPPET_CLOSE, "…", 16)
+        rows = (await session.execute(
+            base.add_columns(snippet).order_by(rank, post_search.c.post_id).limit(limit).offset(offset)
+        )).all()
+    return [(row_id, snip) for row_id, snip in rows], total
@@ -0,0 +1,93 @@
+"""Single-flight coalescing for hot reads.
+
+`do(key, load)` runs at most one `load()` per key at a time: callers that
+arrive while one is in flight await the same task and share its result or
+exception. The load runs as its own task, so a caller that disconnects
+doesn't cancel it for everyone else.
+
+With `stale_seconds > 0`, a completed result is also kept for that long and
+returned immediately (stale-while-revalidate), while a single background
+load refreshes it. A burst on one key then costs one query at a time, and
+every caller sees a result at most one refresh old.
+
+forget(key) is for writers: it drops the kept result and detaches any
+in-flight load, so the next caller reads what was just committed and the
+detached load's result is never kept.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+MAX_KEPT = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    def __init__(self, stale_seconds: float = 0) -> None:
+        self.stale_seconds = stale_seconds
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._kept: dict[Hashable, tuple[float, Any]] = {}
+        self._generation = 0
+        self.loads = self.coalesced = self.stale_served = 0
+
+    def stats(self) -> dict:
+        return {
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+            "stale_served": self.stale_served,
+            "in_flight": len(self._inflight),
+            "kept": len(self._kept),
+            "stale_seconds": self.stale_seconds,
+        }
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        kept = self._kept.get(key)
+        if kept and time.monotonic() - kept[0] < self.stale_seconds:
+            self.stale_served += 1
+            if key not in self._inflight:
+                self._start(key, load)
+            return kept[1]
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start(key, load)
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable | None = None) -> None:
+        """Drop what is kept and in flight for `key`, or for every key."""
+        self._generation += 1
+        if key is None:
+            self._kept.clear()
+            self._inflight.clear()
+        else:
+            self._kept.pop(key, None)
+            self._inflight.pop(key, None)
+
+    def _start(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        self.loads += 1
+        generation = self._generation
+        task = asyncio.create_task(load())
+        self._inflight[key] = task
+
+        def done(task: asyncio.Task) -> None:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+            if task.cancelled() or task.exception() is not None:
+                # Retrieved here, so a refresh nobody awaited doesn't log twice.
+                return
+            if self.stale_seconds > 0 and generation == self._generation:
+                self._keep(key, task.result())
+
+        task.add_done_callback(done)
+        return task
+
+    def _keep(self, key: Hashable, value: Any) -> None:
+        self._kept.pop(key, None)
+        self._kept[key] = (time.monotonic(), value)
+        if len(self._kept) > MAX_KEPT:
+            # Oldest first: dicts keep insertion order and _keep re-inserts.
+            for old in list(self._kept)[: len(self._kept) - MAX_KEPT]:
+                del self._kept[old]
@@ -1,7 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
-from app.database.db import SiteConfig
+from app.database.db import SiteConfig, async_session_maker
+from app.services import public_config
 
 
 async def get_site_config(session: AsyncSession) -> SiteConfig:
@@ -11,10 +14,37 @@ async def get_site_config(session: AsyncSession) -> SiteConfig:
         config = SiteConfig(id=1, site_name="My Blog", logo_url=None, allow_registration=True)
         session.add(config)
         await session.commit()
-        await session.refresh(config)
     return config
 
 
+def public_settings_dict(config: SiteConfig) -> dict:
+    return {
+        "site_name": config.site_name,
+        "site_description": config.site_description,
+        "site_url": config.site_url,
+        "logo_url": config.logo_url,
+        "allow_registration": config.allow_registration,
+        "og_title": config.og_title,
+        "og_description": config.og_description,
+        "og_image_url": config.og_image_url,
+    }
+
+
+async def _load_public_settings() -> dict:
+    # Read-only: a missing row is reported as the defaults rather than created
+    # here, so the public path never writes. The admin panel creates it.
+    async with async_session_maker() as session:
+        result = await session.execute(select(SiteConfig).where(SiteConfig.id == 1))
+        config = result.scalars().first()
+    if not config:
+        config = SiteConfig(id=1, site_name="My Blog", logo_url=None, allow_registration=True)
+    return public_settings_dict(config)
+
+
+async def get_public_settings() -> public_config.CachedConfig:
+    return await public_config.cached("settings", _load_public_settings)
+
+
 async def update_site_config(
     session: AsyncSession,
     site_name: str | None = None,
@@ -26,24 +56,33 @@ async def update_site_config(
     og_description: str | None = None,
     og_image_url: str | None = None,
 ) -> SiteConfig:
-    config = await get_site_config(session)
+    changes = {}
     if site_name is not None:
-        config.site_name = site_name
+        changes["site_name"] = site_name
     if logo_url is not None:
-        config.logo_url = logo_url
+        changes["logo_url"] = logo_url
     if allow_registration is not None:
-        config.allow_registration = allow_registration
+        changes["allow_registration"] = allow_registration
     if site_description is not None:
-        config.site_description = site_description
+        changes["site_description"] = site_description
     if site_url is not None:
-        config.site_url = site_url
+        changes["site_url"] = site_url
     if og_title is not None:
-        config.og_title = og_title if og_title else None
+        changes["og_title"] = og_title if og_title else None
     if og_description is not None:
-        config.og_description = og_description if og_description else None
+        changes["og_description"] = og_description if og_description else None
     if og_image_url is not None:
-        config.og_image_url = og_image_url if og_image_url else None
-    session.add(config)
+        changes["og_image_url"] = og_image_url if og_image_url else None
+    if not changes:
+        return await get_site_config(session)
+    # Upsert, so the first save on a fresh install is still one statement.
+    insert = pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    config = await session.scalar(
+        insert(SiteConfig)
+        .values(**{"id": 1, "site_name": "My Blog", "allow_registration": True, **changes})
+        .on_conflict_do_update(index_elements=["id"], set_=changes)
+        .returning(SiteConfig)
+    )
     await session.commit()
-    await session.refresh(config)
+    public_config.invalidate()
     return config
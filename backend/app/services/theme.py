@@ -2,8 +2,9 @@ from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 
-from app.database.db import ThemeConfig
+from app.database.db import ThemeConfig, async_session_maker
 from app.models.theme import ThemeBase
+from app.services import public_config
 
 
 async def list_themes(session: AsyncSession):
@@ -15,21 +16,24 @@ async def create_theme(session: AsyncSession, data: ThemeBase) -> ThemeConfig:
     theme = ThemeConfig(name=data.name, url=data.url, is_active=False)
     session.add(theme)
     await session.commit()
-    await session.refresh(theme)
     return theme
 
 
 async def set_active_theme(session: AsyncSession, theme_id: int) -> ThemeConfig:
-    # Check target exists
-    result = await session.execute(select(ThemeConfig).where(ThemeConfig.id == theme_id))
-    theme = result.scalars().first()
+    # Activate the target and deactivate every other theme in one statement.
+    # If the target doesn't exist nothing comes back for it and the
+    # transaction is rolled back, leaving the current theme active.
+    themes = (await session.scalars(
+        update(ThemeConfig)
+        .values(is_active=ThemeConfig.id == theme_id)
+        .returning(ThemeConfig)
+    )).all()
+    theme = next((t for t in themes if t.id == theme_id), None)
     if not theme:
+        await session.rollback()
         raise HTTPException(status_code=404, detail="Theme not found")
-    # Deactivate all, then activate the target — two statements, both in the same transaction
-    await session.execute(update(ThemeConfig).values(is_active=False))
-    await session.execute(update(ThemeConfig).where(ThemeConfig.id == theme_id).values(is_active=True))
     await session.commit()
-    await session.refresh(theme)
+    public_config.invalidate()
     return theme
 
 
@@ -38,6 +42,16 @@ async def get_active_theme(session: AsyncSession) -> ThemeConfig | None:
     return result.scalars().first()
 
 
+async def _load_active_theme() -> dict:
+    async with async_session_maker() as session:
+        theme = await get_active_theme(session)
+    return {"url": theme.url if theme else None}
+
+
+async def get_public_active_theme() -> public_config.CachedConfig:
+    return await public_config.cached("theme", _load_active_theme)
+
+
 async def delete_theme(session: AsyncSession, theme_id: int):
     result = await session.execute(select(ThemeConfig).where(ThemeConfig.id == theme_id))
     theme = result.scalars().first()
@@ -45,4 +59,5 @@ async def delete_theme(session: AsyncSession, theme_id: int):
         raise HTTPException(status_code=404, detail="Theme not found")
     await session.delete(theme)
     await session.commit()
+    public_config.invalidate()
     return {"success": True}
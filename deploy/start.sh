@@ -13,6 +13,7 @@
 # Optional:
 #   - PORT             (default 8080, set by Dockerfile)
 #   - FIRST_ADMIN_EMAIL
+#   - WEB_CONCURRENCY  (uvicorn workers, default: one per available core)
 #   - FRONTEND_URL     (CORS allow-origin -- in single-image mode this is
 #                       the public URL of the container itself)
 
@@ -21,6 +22,13 @@ set -euo pipefail
 PORT="${PORT:-8080}"
 export PORT
 
+# One uvicorn worker per core the container may use; nproc honours CPU
+# affinity. Workers stay coherent through the backend's event bus. The like
+# write-behind buffer (LIKE_FLUSH_MS) is per process, so the backend turns it
+# off whenever more than one worker runs; set WEB_CONCURRENCY=1 to use it.
+WEB_CONCURRENCY="${WEB_CONCURRENCY:-$(nproc)}"
+export WEB_CONCURRENCY
+
 echo "[start.sh] Rendering nginx config (PORT=${PORT})..."
 # Restrict envsubst to $PORT only so nginx-native variables ($host, etc.)
 # are left intact in the final config.
@@ -2,7 +2,7 @@
 
 import { useEffect, useState, useMemo } from "react";
 import { useAuth } from "../../../context/AuthContext";
-import { getUsers, activateUser, deactivateUser, setUserRole, getAdminStats } from "../../../_lib/api_callout";
+import { getUsers, activateUser, deactivateUser, setUserRole, deleteUser, getAdminStats } from "../../../_lib/api_callout";
 
 const PAGE_SIZE = 20;
 
@@ -125,6 +125,15 @@ export default function UsersPage() {
     }));
   }
 
+  async function removeUser(user) {
+    if (!confirm(`Delete ${user.email} and all of their articles, comments and likes?`)) return;
+    setError(null);
+    const { success, detail } = await deleteUser(user.id, token);
+    if (!success) { setError(detail?.detail ?? "Failed to delete user."); return; }
+    setUsers((prev) => prev.filter((u) => u.id !== user.id));
+    setTotal((n) => Math.max(0, n - 1));
+  }
+
   const kpiTotal   = stats?.users?.total  ?? total;
   const kpiActive  = stats?.users?.active ?? "—";
   const kpiPending = stats?.users?.total != null ? stats.users.total - stats.users.active : "—";
@@ -255,6 +264,11 @@ export default function UsersPage() {
                             Make author
                           </button>
                         )}
+                        {!isSelf && !u.is_superuser && (
+                          <button className="btn btn-ghost btn-sm" onClick={() => removeUser(u)}>
+                            Delete
+                          </button>
+                        )}
                       </div>
                     </td>
                   </tr>
@@ -3,13 +3,14 @@ import TableOfContents from "../../components/TableOfContents";
 import ArticleInteractions from "../../components/ArticleInteractions";
 import BookmarkRailButton from "../../components/BookmarkRailButton";
 import ShareRailButton from "../../components/ShareRailButton";
+import { getSiteUrl, getLogoUrl } from "../../../_lib/theme";
 
 const _API = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 const _APP_URL = process.env.NEXT_PUBLIC_APP_URL || "http://localhost:3000";
 
 async function _fetchArticleForMeta(articleId) {
   try {
-    const res = await fetch(`${_API}/api/v1/get-article/${articleId}`, { next: { revalidate: 30 } });
+    const res = await fetch(`${_API}/api/v1/get-article/${articleId}?format=html`, { next: { revalidate: 30 } });
     const data = await res.json().catch(() => null);
     return res.ok ? (data?.article?.[0] ?? null) : null;
   } catch {
@@ -17,46 +18,27 @@ async function _fetchArticleForMeta(articleId) {
   }
 }
 
-async function _fetchSiteSettings() {
-  try {
-    const res = await fetch(`${_API}/api/v1/settings`, { next: { revalidate: 60 } });
-    return res.ok ? await res.json() : null;
-  } catch {
-    return null;
-  }
-}
-
-function _firstParagraphText(blocks) {
-  if (!blocks) return "";
-  const b = blocks.find((b) => b.type === "paragraph");
-  return (b?.data?.text ?? "").replace(/<[^>]+>/g, "").slice(0, 160);
-}
-
-function _firstImageUrl(blocks) {
-  if (!blocks) return null;
-  return blocks.find((b) => b.type === "simpleImage")?.data?.url ?? null;
+function _description(article) {
+  return (article.excerpt ?? "").slice(0, 160);
 }
 
 export async function generateMetadata({ params }) {
   const { articleId } = await params;
-  const [article, settings] = await Promise.all([
+  const [article, siteUrlSetting, logoUrl] = await Promise.all([
     _fetchArticleForMeta(articleId),
-    _fetchSiteSettings(),
+    getSiteUrl(),
+    getLogoUrl(),
   ]);
 
   if (!article) return { title: "Article Not Found" };
 
-  let blocks = null;
-  try { blocks = JSON.parse(article.content)?.blocks ?? []; } catch {}
-
   const title = article.title || "Untitled";
-  const description = _firstParagraphText(blocks);
-  const siteUrl = settings?.site_url || _APP_URL;
-  const logoUrl = settings?.logo_url ?? null;
+  const description = _description(article);
+  const siteUrl = siteUrlSetting || _APP_URL;
   const absoluteLogoUrl = logoUrl
     ? (logoUrl.startsWith("http") ? logoUrl : `${_API}${logoUrl}`)
     : null;
-  const ogImage = _firstImageUrl(blocks) ?? absoluteLogoUrl;
+  const ogImage = article.cover_image ?? absoluteLogoUrl;
   const canonicalUrl = `${siteUrl}/article/${articleId}`;
   const authorDisplay = article.author_name ?? article.author_email ?? null;
 
@@ -82,153 +64,6 @@ export async function generateMetadata({ params }) {
   };
 }
 
-/* ── Helpers ──────────────────────────────────────── */
-
-function slugify(text) {
-  return text
-    .replace(/<[^>]+>/g, "")
-    .toLowerCase()
-    .replace(/[^a-z0-9]+/g, "-")
-    .replace(/^-+|-+$/g, "");
-}
-
-function countWords(blocks) {
-  if (!blocks) return 0;
-  let n = 0;
-  for (const b of blocks) {
-    if (b.type === "paragraph" || b.type === "header")
-      n += (b.data?.text ?? "").replace(/<[^>]+>/g, "").trim().split(/\s+/).filter(Boolean).length;
-    if (b.type === "list")
-      for (const item of b.data?.items ?? []) {
-        const t = (typeof item === "string" ? item : item?.content ?? "").replace(/<[^>]+>/g, "");
-        n += t.trim().split(/\s+/).filter(Boolean).length;
-      }
-  }
-  return n;
-}
-
-function extractHeadings(blocks) {
-  if (!blocks) return [];
-  return blocks
-    .map((b, i) => ({ ...b, idx: i }))
-    .filter((b) => b.type === "header")
-    .map((b) => ({
-      id: `h-${slugify(b.data.text)}-${b.idx}`,
-      text: b.data.text.replace(/<[^>]+>/g, ""),
-      level: b.data.level,
-    }));
-}
-
-/* ── Block renderer ───────────────────────────────── */
-
-function renderBlock(block, i) {
-  const { type, data } = block;
-
-  if (type === "header") {
-    const Tag = `h${data.level}`;
-    const id = `h-${slugify(data.text)}-${i}`;
-    return <Tag key={i} id={id} className="formatting-header" dangerouslySetInnerHTML={{ __html: data.text }} />;
-  }
-
-  if (type === "paragraph")
-    return <p key={i} className="formatting-paragraph" dangerouslySetInnerHTML={{ __html: data.text }} />;
-
-  if (type === "list") {
-    const ordered = data.style === "ordered";
-    const Tag = ordered ? "ol" : "ul";
-    const cls = ordered ? "formatting-list-ordered" : "formatting-list-unordered";
-    const itemText = (item) => (typeof item === "string" ? item : item?.content ?? "");
-    return (
-      <Tag key={i} className={cls}>
-        {data.items.map((item, j) => (
-          <li key={j} dangerouslySetInnerHTML={{ __html: itemText(item) }} />
-        ))}
-      </Tag>
-    );
-  }
-
-  if (type === "checklist")
-    return (
-      <ul key={i} className="formatting-checklist">
-        {data.items.map((item, j) => (
-          <li key={j} className={`formatting-checklist-item${item.checked ? " checked" : ""}`}>
-            <input type="checkbox" checked={item.checked} readOnly />
-            <span dangerouslySetInnerHTML={{ __html: item.text }} />
-          </li>
-        ))}
-      </ul>
-    );
-
-  if (type === "quote")
-    return (
-      <blockquote key={i} className="formatting-quote">
-        <p dangerouslySetInnerHTML={{ __html: data.text }} />
-        {data.caption && <cite>{data.caption}</cite>}
-      </blockquote>
-    );
-
-  if (type === "code")
-    return <pre key={i} className="formatting-code"><code>{data.code}</code></pre>;
-
-  if (type === "delimiter")
-    return <hr key={i} className="formatting-delimiter" />;
-
-  if (type === "warning")
-    return (
-      <div key={i} role="alert" className="formatting-warning">
-        {data.title && <strong dangerouslySetInnerHTML={{ __html: data.title }} />}
-        <p dangerouslySetInnerHTML={{ __html: data.message }} />
-      </div>
-    );
-
-  if (type === "alert")
-    return (
-      <div key={i} role="alert"
-        className={`formatting-alert formatting-alert--${data.type ?? "info"}`}
-        style={{ textAlign: data.align ?? "left" }}
-        dangerouslySetInnerHTML={{ __html: data.message }} />
-    );
-
-  if (type === "table") {
-    const [head, ...rows] = data.withHeadings ? data.content : [null, ...data.content];
-    return (
-      <table key={i} className="formatting-table">
-        {head && (
-          <thead>
-            <tr>{head.map((cell, j) => <th key={j} dangerouslySetInnerHTML={{ __html: cell }} />)}</tr>
-          </thead>
-        )}
-        <tbody>
-          {rows.map((row, j) => (
-            <tr key={j}>{row.map((cell, k) => <td key={k} dangerouslySetInnerHTML={{ __html: cell }} />)}</tr>
-          ))}
-        </tbody>
-      </table>
-    );
-  }
-
-  if (type === "embed")
-    return (
-      <figure key={i} className="embed-block">
-        <iframe src={data.embed} width={data.width} height={data.height} allowFullScreen title={data.caption ?? "Embedded content"} />
-        {data.caption && <figcaption>{data.caption}</figcaption>}
-      </figure>
-    );
-
-  if (type === "simpleImage")
-    return (
-      <figure key={i} className="image-block">
-        <img src={data.url} alt={data.caption ?? ""} />
-        {data.caption && <figcaption>{data.caption}</figcaption>}
-      </figure>
-    );
-
-  if (type === "raw")
-    return <div key={i} className="formatting-raw" dangerouslySetInnerHTML={{ __html: data.html }} />;
-
-  return null;
-}
-
 /* ── Page ─────────────────────────────────────────── */
 
 export default async function ArticlePage({ params }) {
@@ -239,7 +74,7 @@ export default async function ArticlePage({ params }) {
   let fetchError = null;
 
   try {
-    const res = await fetch(`${apiUrl}/api/v1/get-article/${articleId}`, { next: { revalidate: 30 } });
+    const res = await fetch(`${apiUrl}/api/v1/get-article/${articleId}?format=html`, { next: { revalidate: 30 } });
     const data = await res.json().catch(() => null);
     if (!res.ok) fetchError = data?.detail ?? `Failed to fetch article (${res.status})`;
     else article = data?.article?.[0] ?? null;
@@ -250,33 +85,25 @@ export default async function ArticlePage({ params }) {
   if (fetchError) return <p role="alert" style={{ padding: "2rem" }}>Error: {fetchError}</p>;
   if (!article) return <p style={{ padding: "2rem" }}>Article not found.</p>;
 
-  let blocks = null;
-  let rawContent = null;
-  try {
-    blocks = JSON.parse(article.content)?.blocks ?? [];
-  } catch {
-    rawContent = article.content;
-  }
-
-  const headings = extractHeadings(blocks);
-  const wordCount = countWords(blocks);
-  const readTime = Math.max(1, Math.ceil(wordCount / 200));
+  // The API renders the body and stores the outline and counts, so nothing
+  // here parses the Editor.js document.
+  const headings = article.toc ?? [];
+  const wordCount = article.word_count ?? 0;
+  const readTime = article.reading_time ?? 1;
   const dateStr = article.created_date
     ? new Date(article.created_date).toLocaleDateString("en-US", { month: "short", day: "numeric", year: "numeric" })
     : "";
   const authorDisplay = article.author_name ?? article.author_email ?? "Unknown";
   const authorInitials = authorDisplay.split(" ").map((w) => w[0]).join("").slice(0, 2).toUpperCase() || "?";
 
-  const settings = await _fetchSiteSettings();
-  const siteUrl = settings?.site_url || _APP_URL;
+  const siteUrl = (await getSiteUrl()) || _APP_URL;
   const canonicalUrl = `${siteUrl}/article/${articleId}`;
-  const firstParaText = _firstParagraphText(blocks);
 
   const jsonLd = {
     "@context": "https://schema.org",
     "@type": "Article",
     headline: article.title || "Untitled",
-    description: firstParaText,
+    description: _description(article),
     author: { "@type": "Person", name: authorDisplay },
     datePublished: article.created_date ?? undefined,
     url: canonicalUrl,
@@ -318,14 +145,14 @@ export default async function ArticlePage({ params }) {
             </div>
           </div>
 
-          {/* Content blocks */}
-          {blocks ? blocks.map((block, i) => renderBlock(block, i)) : <pre>{rawContent}</pre>}
+          {/* Content blocks (a body that isn't Editor.js JSON arrives as a <pre>) */}
+          <div className="article-content" dangerouslySetInnerHTML={{ __html: article.html ?? "" }} />
 
           {/* Reactions + comments */}
           <ArticleInteractions
             articleId={articleId}
             authorEmail={article.author_email ?? null}
-            blocks={blocks}
+            readTime={readTime}
             createdDate={article.created_date ?? null}
             hideByline={true}
           />
@@ -7,42 +7,30 @@ import {
     getComments,
     addComment,
     deleteComment,
+    subscribeArticleEvents,
 } from "../../_lib/api_callout";
 
 function initials(email) {
     return email ? email[0].toUpperCase() : "?";
 }
 
-function countWords(blocks) {
-    if (!blocks) return 0;
-    let n = 0;
-    for (const b of blocks) {
-        if (b.type === "paragraph" || b.type === "header") {
-            n += (b.data?.text ?? "").replace(/<[^>]+>/g, "").trim().split(/\s+/).filter(Boolean).length;
-        }
-        if (b.type === "list") {
-            for (const item of b.data?.items ?? []) {
-                const t = (typeof item === "string" ? item : item?.content ?? "").replace(/<[^>]+>/g, "");
-                n += t.trim().split(/\s+/).filter(Boolean).length;
-            }
-        }
-    }
-    return n;
-}
-
-export default function ArticleInteractions({ articleId, authorEmail, blocks, createdDate, hideByline = false }) {
+export default function ArticleInteractions({ articleId, authorEmail, readTime = 1, createdDate, hideByline = false }) {
     const { user, token } = useAuth();
 
     const [likeCount, setLikeCount] = useState(0);
     const [userLiked, setUserLiked] = useState(false);
     const [comments, setComments] = useState([]);
+    const [commentTotal, setCommentTotal] = useState(0);
+    const [commentsCursor, setCommentsCursor] = useState(null);
     const [showComments, setShowComments] = useState(false);
     const [commentBody, setCommentBody] = useState("");
     const [submitting, setSubmitting] = useState(false);
     const [shareMsg, setShareMsg] = useState("");
     const commentsRef = useRef(null);
+    // Mirrors commentsCursor for the event handler, which outlives renders.
+    const cursorRef = useRef(null);
+    cursorRef.current = commentsCursor;
 
-    const readTime = Math.max(1, Math.ceil(countWords(blocks) / 200));
     const dateStr = createdDate
         ? new Date(createdDate).toLocaleDateString("en-US", { month: "short", day: "numeric", year: "numeric" })
         : "";
@@ -54,11 +42,43 @@ export default function ArticleInteractions({ articleId, authorEmail, blocks, cr
                 setUserLiked(res.detail.user_liked ?? false);
             }
         });
-        getComments(articleId).then((res) => {
-            if (res.success) setComments(res.detail ?? []);
-        });
+        loadComments();
     }, [articleId, token]);
 
+    // Live like/comment updates. Comments pushed by the server are only
+    // appended once every older page is loaded, matching the oldest-first order.
+    useEffect(() => subscribeArticleEvents(articleId, (type, data) => {
+        if (type === "reset") { loadComments(); return; }
+        if (data.like_count != null) setLikeCount(data.like_count);
+        if (data.comment_count != null) setCommentTotal(data.comment_count);
+        if (type !== "update") return;
+        setComments((prev) => {
+            const removed = new Set(data.comments_deleted ?? []);
+            const next = prev.filter((c) => !removed.has(c.id));
+            if (cursorRef.current) return next;
+            const seen = new Set(next.map((c) => c.id));
+            return [...next, ...(data.comments_added ?? []).filter((c) => !seen.has(c.id))];
+        });
+    }), [articleId]);
+
+    async function loadComments() {
+        const res = await getComments(articleId);
+        if (res.success) {
+            setComments(res.detail?.comments ?? []);
+            setCommentTotal(res.detail?.total ?? 0);
+            setCommentsCursor(res.detail?.next_cursor ?? null);
+        }
+    }
+
+    async function loadMoreComments() {
+        const res = await getComments(articleId, { cursor: commentsCursor });
+        if (res.success) {
+            setComments((prev) => [...prev, ...(res.detail?.comments ?? [])]);
+            setCommentTotal(res.detail?.total ?? 0);
+            setCommentsCursor(res.detail?.next_cursor ?? null);
+        }
+    }
+
     async function handleLike() {
         if (!token) { window.location.href = "/login"; return; }
         const res = await toggleLike(articleId, token);
@@ -91,7 +111,11 @@ export default function ArticleInteractions({ articleId, authorEmail, blocks, cr
         setSubmitting(true);
         const res = await addComment(articleId, commentBody.trim(), token);
         if (res.success) {
-            setComments((prev) => [...prev, res.detail]);
+            // Oldest first: a new comment belongs on the page only once the rest are loaded.
+            if (!commentsCursor) {
+                setComments((prev) => prev.some((c) => c.id === res.detail.id) ? prev : [...prev, res.detail]);
+            }
+            setCommentTotal((n) => n + 1);
             setCommentBody("");
         }
         setSubmitting(false);
@@ -99,7 +123,10 @@ export default function ArticleInteractions({ articleId, authorEmail, blocks, cr
 
     async function handleDeleteComment(cid) {
         const res = await deleteComment(articleId, cid, token);
-        if (res.success) setComments((prev) => prev.filter((c) => c.id !== cid));
+        if (res.success) {
+            setComments((prev) => prev.filter((c) => c.id !== cid));
+            setCommentTotal((n) => Math.max(0, n - 1));
+        }
     }
 
     return (
@@ -127,7 +154,7 @@ export default function ArticleInteractions({ articleId, authorEmail, blocks, cr
                 </button>
                 <button className="reaction-btn" onClick={handleCommentToggle} aria-label="Toggle comments">
                     <span role="img" aria-hidden="true">💬</span>
-                    <span className="reaction-btn__count">{comments.length}</span>
+                    <span className="reaction-btn__count">{commentTotal}</span>
                 </button>
                 <button className="reaction-btn" onClick={handleShare} aria-label="Share article">
                     <span role="img" aria-hidden="true">🔗</span>
@@ -163,6 +190,11 @@ export default function ArticleInteractions({ articleId, authorEmail, blocks, cr
                             </div>
                         </div>
                     ))}
+                    {commentsCursor && (
+                        <button type="button" className="comments-more" onClick={loadMoreComments}>
+                            Load more comments
+                        </button>
+                    )}
                     {user ? (
                         <form className="comment-form" onSubmit={handleSubmitComment}>
                             <textarea
@@ -1,6 +1,6 @@
 import Link from "next/link";
 import { redirect, notFound } from "next/navigation";
-import { getSiteSettings } from "../_lib/api_callout";
+import { getSiteName, getSiteUrl } from "../_lib/theme";
 
 const PAGE_SIZE = 20;
 const LATEST_ANCHOR_COUNT = 30;
@@ -82,15 +82,8 @@ export async function generateMetadata({ searchParams }) {
   const sp = await searchParams;
   const { page, kind } = parsePage(sp?.page);
 
-  let siteName = "Blog";
-  let baseUrl = APP_URL;
-  try {
-    const { success, detail } = await getSiteSettings();
-    if (success && detail) {
-      siteName = detail.site_name || siteName;
-      baseUrl = detail.site_url || APP_URL;
-    }
-  } catch {}
+  const [siteName, siteUrl] = await Promise.all([getSiteName(), getSiteUrl()]);
+  const baseUrl = siteUrl || APP_URL;
 
   if (kind === "default" || kind === "one") {
     return {
@@ -215,14 +208,14 @@ export default async function Home({ searchParams }) {
               <Link href={`/article/${featured.id}`}>{featured.title || "(Untitled)"}</Link>
             </h1>
             <p className="hero-deck">
-              {getFirstParagraph(featured.content).slice(0, 280) || " "}
+              {(featured.excerpt ?? getFirstParagraph(featured.content)).slice(0, 280) || " "}
             </p>
             <div className="hero-meta">
               <div className="avatar">{AuthorInitial(featured.author_name)}</div>
               <div>
                 <div className="byline-name">{featured.author_name ?? "Unknown"}</div>
                 <div className="byline-meta">
-                  <span>{getReadTime(featured.content)} min read</span>
+                  <span>{featured.reading_time ?? getReadTime(featured.content)} min read</span>
                   {featured.created_date && (
                     <>
                       <span className="dot-sep" />
@@ -246,7 +239,7 @@ export default async function Home({ searchParams }) {
                   )}
                   <h5><Link href={`/article/${a.id}`}>{a.title || "(Untitled)"}</Link></h5>
                   <span className="meta">
-                    By {a.author_name ?? "Unknown"} · {getReadTime(a.content)} min
+                    By {a.author_name ?? "Unknown"} · {a.reading_time ?? getReadTime(a.content)} min
                   </span>
                 </div>
               ))}
@@ -267,7 +260,7 @@ export default async function Home({ searchParams }) {
                     <Link href={`/article/${a.id}`}>{a.title || "(Untitled)"}</Link>
                   </h2>
                   <p className="list-deck">
-                    {getFirstParagraph(a.content).slice(0, 200)}
+                    {(a.excerpt ?? getFirstParagraph(a.content)).slice(0, 200)}
                   </p>
                   <div className="list-meta">
                     <div className="avatar sm">{AuthorInitial(a.author_name)}</div>
@@ -285,7 +278,7 @@ export default async function Home({ searchParams }) {
                   </div>
                 </div>
                 <div className="list-aside">
-                  <div>{getReadTime(a.content)} MIN</div>
+                  <div>{a.reading_time ?? getReadTime(a.content)} MIN</div>
                   {a.created_date && (
                     <div style={{ marginTop: 4 }}>
                       {fmt(a.created_date, { month: "short", day: "numeric" }).toUpperCase()}
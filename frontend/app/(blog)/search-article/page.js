@@ -58,7 +58,7 @@ export default async function SearchPage({ searchParams }) {
       )}
 
       {articles.map((a, i) => {
-        const excerpt = getFirstParagraph(a.content).slice(0, 220);
+        const excerpt = (a.excerpt ?? getFirstParagraph(a.content)).slice(0, 220);
         const date = fmt(a.created_date);
         return (
           <article key={a.id ?? i} className="search-result">
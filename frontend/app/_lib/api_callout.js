@@ -122,6 +122,16 @@ export async function setUserRole(userId, role, token) {
     return res.ok ? { success: true, detail: data } : { success: false, detail: data };
 }
 
+// Deletes the user together with their articles, comments and likes.
+export async function deleteUser(userId, token) {
+    const res = await fetch(`${API}/api/v1/admin/users/${userId}`, {
+        method: "DELETE",
+        headers: { Authorization: `Bearer ${token}` },
+    });
+    const data = await res.json().catch(() => null);
+    return res.ok ? { success: true, detail: data } : { success: false, detail: data };
+}
+
 // ── Admin — themes ─────────────────────────────────────────────────────────────
 
 export async function getThemes(token) {
@@ -210,8 +220,10 @@ export async function uploadLogo(file, token) {
 
 // ── Public site settings ───────────────────────────────────────────────────────
 
-export async function getSiteSettings() {
-    const res = await fetch(`${API}/api/v1/settings`);
+// Settings, active theme and the current user (null when anonymous) in one request.
+export async function getBootstrap(token = null) {
+    const headers = token ? { Authorization: `Bearer ${token}` } : {};
+    const res = await fetch(`${API}/api/v1/bootstrap`, { headers });
     const data = await res.json().catch(() => null);
     return res.ok ? { success: true, detail: data } : { success: false, detail: null };
 }
@@ -236,12 +248,26 @@ export async function toggleLike(articleId, token) {
 
 // ── Comments ───────────────────────────────────────────────────────────────────
 
-export async function getComments(articleId) {
-    const res = await fetch(`${API}/api/v1/articles/${articleId}/comments`);
+export async function getComments(articleId, { cursor = null, limit = 50 } = {}) {
+    const params = new URLSearchParams({ limit });
+    if (cursor) params.set("cursor", cursor);
+    const res = await fetch(`${API}/api/v1/articles/${articleId}/comments?${params}`);
     const data = await res.json().catch(() => null);
     return res.ok ? { success: true, detail: data } : { success: false, detail: data };
 }
 
+// Live updates for one article over Server-Sent Events. `onEvent(type, data)` gets
+// "snapshot", "update" and "reset" (refetch; the browser reconnects by itself).
+// Returns a function that closes the stream.
+export function subscribeArticleEvents(articleId, onEvent) {
+    if (typeof EventSource === "undefined") return () => {};
+    const source = new EventSource(`${API}/api/v1/articles/${articleId}/events`);
+    for (const type of ["snapshot", "update", "reset"]) {
+        source.addEventListener(type, (e) => onEvent(type, JSON.parse(e.data)));
+    }
+    return () => source.close();
+}
+
 export async function addComment(articleId, body, token) {
     const res = await fetch(`${API}/api/v1/articles/${articleId}/comments`, {
         method: "POST",
@@ -1,28 +1,27 @@
-export async function getActiveThemeUrl(): Promise<string | null> {
+// Every layout needs the public settings and the active theme; both come from
+// one /api/v1/bootstrap request. fetch() is memoized per render, so all the
+// getters below (and generateMetadata) share that single round trip.
+async function fetchBootstrap() {
   try {
     const apiUrl = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
-    const res = await fetch(`${apiUrl}/api/v1/theme/active`, {
+    const res = await fetch(`${apiUrl}/api/v1/bootstrap`, {
       next: { revalidate: 60 },
     });
     if (!res.ok) return null;
-    const data = await res.json();
-    return data?.url ?? null;
+    return await res.json();
   } catch {
     return null;
   }
 }
 
+export async function getActiveThemeUrl(): Promise<string | null> {
+  const data = await fetchBootstrap();
+  return data?.theme?.url ?? null;
+}
+
 async function fetchPublicSettings() {
-  try {
-    const apiUrl = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
-    const res = await fetch(`${apiUrl}/api/v1/settings`, {
-      next: { revalidate: 60 },
-    });
-    if (!res.ok) return null;
-    return await res.json();
-  } catch {
-    return null;
-  }
+  const data = await fetchBootstrap();
+  return data?.settings ?? null;
 }
 
 export async function getSiteName(): Promise<string> {
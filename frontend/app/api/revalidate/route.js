@@ -0,0 +1,56 @@
+import { revalidatePath } from "next/cache";
+
+// On-demand ISR driven by the backend's delta feed (/api/v1/articles/changes).
+// Hit this route on a schedule (e.g. `curl -fsS "$APP/api/revalidate?secret=..."`
+// every minute) and only the article pages that actually changed, plus the
+// home page and sitemap when anything did, are regenerated.
+//
+// The sync token lives in this server process; after a restart the first call
+// gets `reset` from the backend and revalidates everything once.
+
+const API = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
+const SECRET = process.env.REVALIDATE_SECRET || "";
+const MAX_PAGES = 20;
+
+let syncToken = null;
+
+export const dynamic = "force-dynamic";
+
+export async function GET(request) {
+  const secret = new URL(request.url).searchParams.get("secret");
+  if (!SECRET || secret !== SECRET) {
+    return Response.json({ detail: "Not found" }, { status: 404 });
+  }
+
+  const changed = new Set();
+  let reset = false;
+  let token = syncToken;
+  for (let page = 0; page < MAX_PAGES; page++) {
+    const params = new URLSearchParams({ limit: "1000" });
+    if (token) params.set("since", token);
+    const res = await fetch(`${API}/api/v1/articles/changes?${params}`, { cache: "no-store" });
+    if (!res.ok) {
+      return Response.json({ detail: "Changes feed unavailable" }, { status: 502 });
+    }
+    const data = await res.json();
+    token = data.token;
+    if (data.reset) {
+      reset = true;
+      break;
+    }
+    [...data.created, ...data.updated, ...data.deleted].forEach((id) => changed.add(id));
+    if (!data.has_more) break;
+  }
+
+  if (reset) {
+    revalidatePath("/", "layout");
+  } else {
+    changed.forEach((id) => revalidatePath(`/article/${id}`));
+    if (changed.size) {
+      revalidatePath("/");
+      revalidatePath("/sitemap.xml");
+    }
+  }
+  syncToken = token;
+  return Response.json({ reset, revalidated: changed.size });
+}
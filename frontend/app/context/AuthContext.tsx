@@ -1,7 +1,7 @@
 "use client";
 
 import { createContext, useContext, useEffect, useState } from "react";
-import { verifyToken } from "../_lib/api_callout";
+import { getBootstrap } from "../_lib/api_callout";
 
 interface User {
   id: string;
@@ -35,10 +35,11 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
       setLoading(false);
       return;
     }
-    verifyToken(stored).then(({ valid, detail }: { valid: boolean; detail: User }) => {
-      if (valid) {
+    // The bootstrap payload's user is null for an invalid or expired token.
+    getBootstrap(stored).then(({ success, detail }: { success: boolean; detail: { user: User | null } | null }) => {
+      if (success && detail?.user) {
         setToken(stored);
-        setUser(detail);
+        setUser(detail.user);
       } else {
         localStorage.removeItem("access_token");
       }